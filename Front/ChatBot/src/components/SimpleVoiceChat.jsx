@@ -84,8 +84,8 @@ const SimpleVoiceChat = () => {
   }, [isVADEnabled]);
   
   // 훅들
-  const conversationFlow = useConversationFlow();
   const audioPlayer = useAudioPlayer();
+  const conversationFlow = useConversationFlow(audioPlayer);
   const vadRecorder = useVADRecorder();
   
   // 🔥 startListening을 ref로 저장 (의존성 순환 방지)
@@ -107,8 +107,8 @@ const VoiceChat = () => {
   }, [progressState.startTime, progressState.stage]);
   
   // 훅들
-  const conversationFlow = useConversationFlow();
   const audioPlayer = useAudioPlayer();
+  const conversationFlow = useConversationFlow(audioPlayer);
   const pcmRecorder = usePCMRecorder();
   
   // 오디오 데이터 핸들러들
@@ -81,8 +81,8 @@ const VoiceVADChat = () => {
   }, []);
   
   // 훅들
-  const conversationFlow = useConversationFlow();
   const audioPlayer = useAudioPlayer();
+  const conversationFlow = useConversationFlow(audioPlayer);
   const vadRecorder = useVADRecorder(); // 🔥 VAD 레코더 사용
   
   // 🔥 VAD 이벤트 핸들러들
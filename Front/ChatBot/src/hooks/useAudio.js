@@ -4,6 +4,8 @@ export const useAudioPlayer = () => {
   const audioContextRef = useRef(null);
   const gainNodeRef = useRef(null);
   const currentSourceRef = useRef(null);
+  const scheduledSourcesRef = useRef(new Set()); // 🔥 이어 재생하도록 예약된 청크 소스들
+  const nextStartTimeRef = useRef(0); // 다음 청크가 시작할 AudioContext 시각
   const [isPlaying, setIsPlaying] = useState(false);
   const [volume, setVolume] = useState(1.0);
   const [debugInfo, setDebugInfo] = useState('');
@@ -45,8 +47,17 @@ export const useAudioPlayer = () => {
     }
   }, [volume]);
   
-  // 🔥 현재 오디오 중단 함수 (개선됨)
+  // 🔥 현재 오디오 중단 함수 (개선됨) - 예약된 청크까지 모두 중단
   const stopCurrentAudio = useCallback(() => {
+    scheduledSourcesRef.current.forEach((source) => {
+      try {
+        source.stop();
+      } catch (e) {
+        // 이미 끝난 소스는 무시
+      }
+    });
+    scheduledSourcesRef.current.clear();
+    nextStartTimeRef.current = 0;
     if (currentSourceRef.current) {
       try {
         currentSourceRef.current.stop();
@@ -60,7 +71,8 @@ export const useAudioPlayer = () => {
     setIsPlaying(false);
   }, []);
   
-  // 🔥 완전히 새롭게 작성된 PCM 재생 함수 - 디버깅 강화
+  // 🔥 PCM 청크 재생 - 이전 청크가 끝나는 시각에 이어 붙여 예약 (끊기 없이 연속 재생)
+  // 이전 응답을 끊는 것은 startNewAudio/stop에서만 함
   const playPCMChunk = useCallback(async (arrayBuffer, inputSampleRate = 24000) => {
     console.log('🎵 PCM 재생 시작:', {
       bufferSize: arrayBuffer.byteLength,
@@ -89,9 +101,6 @@ export const useAudioPlayer = () => {
     }
     
     try {
-      // 🔥 이전 오디오 즉시 중단
-      stopCurrentAudio();
-      
       // 🔥 디버깅: ArrayBuffer 내용 검사
       const uint8View = new Uint8Array(arrayBuffer.slice(0, 20));
       console.log('🔍 ArrayBuffer 처음 20바이트:', Array.from(uint8View).map(b => b.toString(16).padStart(2, '0')).join(' '));
@@ -186,38 +195,42 @@ export const useAudioPlayer = () => {
         setDebugInfo('최종 AudioBuffer가 매우 조용함');
       }
       
-      // 🔥 오디오 소스 생성 및 재생
+      // 🔥 오디오 소스 생성 및 예약 재생
       const source = audioContextRef.current.createBufferSource();
       source.buffer = finalAudioBuffer;
       source.connect(gainNodeRef.current);
       
-      // 현재 소스로 설정
-      currentSourceRef.current = source;
+      const scheduled = scheduledSourcesRef.current;
+      scheduled.add(source);
       setIsPlaying(true);
       
-      // 재생 완료 이벤트
-      source.onended = () => {
-        console.log('✅ 오디오 재생 완료');
-        if (currentSourceRef.current === source) {
-          currentSourceRef.current = null;
+      const finish = () => {
+        scheduled.delete(source);
+        if (scheduled.size === 0) {
           setIsPlaying(false);
         }
       };
       
+      // 재생 완료 이벤트 (마지막 예약 청크가 끝나면 재생 종료)
+      source.onended = () => {
+        console.log('✅ 오디오 청크 재생 완료');
+        finish();
+      };
+      
       // 오류 이벤트
       source.onerror = (error) => {
         console.error('❌ 오디오 재생 오류:', error);
-        if (currentSourceRef.current === source) {
-          currentSourceRef.current = null;
-          setIsPlaying(false);
-        }
+        finish();
         setDebugInfo(`재생 오류: ${error.message || '알 수 없는 오류'}`);
       };
       
-      // 재생 시작
-      source.start();
+      // 이전 청크 끝에 이어서 시작 (이미 지났으면 지금 바로)
+      const startAt = Math.max(audioContextRef.current.currentTime, nextStartTimeRef.current);
+      source.start(startAt);
+      nextStartTimeRef.current = startAt + finalAudioBuffer.duration;
       
-      console.log('🎶 오디오 재생 시작:', {
+      console.log('🎶 오디오 재생 예약:', {
+        startAt: startAt,
         duration: finalAudioBuffer.duration,
         sampleRate: finalAudioBuffer.sampleRate,
         gainValue: gainNodeRef.current.gain.value
@@ -231,7 +244,7 @@ export const useAudioPlayer = () => {
       setDebugInfo(`재생 오류: ${error.message}`);
       setIsPlaying(false);
     }
-  }, [stopCurrentAudio]);
+  }, []);
   
   // 🔥 전체 중단 함수
   const stop = useCallback(() => {
@@ -300,6 +313,16 @@ export const useAudioPlayer = () => {
     }
   }, [stopCurrentAudio]);
   
+  // 📡 재생 위치 조회용 - 지금 AudioContext 시각과 다음 청크가 시작될 시각 (예약된 오디오의 끝)
+  const getPlayhead = useCallback(() => {
+    const ctx = audioContextRef.current;
+    if (!ctx) return null;
+    return {
+      now: ctx.currentTime,
+      queuedUntil: Math.max(ctx.currentTime, nextStartTimeRef.current)
+    };
+  }, []);
+  
   const resumeContext = useCallback(async () => {
     if (audioContextRef.current && audioContextRef.current.state === 'suspended') {
       await audioContextRef.current.resume();
@@ -311,6 +334,7 @@ export const useAudioPlayer = () => {
     playPCMChunk,
     stop,
     startNewAudio,
+    getPlayhead,
     resumeContext,
     testAudioPlayback,
     isPlaying,
@@ -4,11 +4,104 @@ import { v4 as uuidv4 } from 'uuid';
 // 환경 변수에서 설정 가져오기
 const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL || 'ws://localhost:8000';
 
-export const useConversationWebSocket = () => {
+// 🔥 바이너리 오디오 프레임 (Zonos/audio_framing.py와 동일)
+// version u8 | flags u8 | stream_id u16 | seq u32 | sample_rate u32 | PCM int16 LE
+const FRAME_HEADER_SIZE = 12;
+const FLAG_START = 0x01;
+const FLAG_END = 0x02;
+const FLAG_FILLER = 0x04;
+const FLAG_OPUS = 0x08; // 페이로드가 [u16 LE 길이][Opus 패킷]... (48kHz, 패킷당 20ms)
+const OPUS_PACKET_MS = 20;
+
+// 📡 서버 송신 조절용 재생 위치 보고 주기 (ms)
+const PLAYBACK_ACK_INTERVAL_MS = 250;
+
+const parseAudioFrame = (buffer) => {
+  const view = new DataView(buffer);
+  return {
+    version: view.getUint8(0),
+    flags: view.getUint8(1),
+    stream_id: view.getUint16(2, true),
+    seq: view.getUint32(4, true),
+    sample_rate: view.getUint32(8, true),
+    audioData: buffer.slice(FRAME_HEADER_SIZE)
+  };
+};
+
+// 길이 접두 Opus 패킷 분리 (WebCodecs AudioDecoder에 하나씩 넣을 수 있도록)
+const unpackOpusPackets = (payload) => {
+  const view = new DataView(payload);
+  const packets = [];
+  let offset = 0;
+  while (offset + 2 <= payload.byteLength) {
+    const length = view.getUint16(offset, true);
+    offset += 2;
+    packets.push(payload.slice(offset, offset + length));
+    offset += length;
+  }
+  return packets;
+};
+
+const frameDurationSeconds = (frame) => (
+  frame.flags & FLAG_OPUS
+    ? frame.packets.length * OPUS_PACKET_MS / 1000
+    : frame.audioData.byteLength / 2 / (frame.sample_rate || 1)
+);
+
+// getPlayhead: 오디오 플레이어의 재생 시계 (useAudioPlayer().getPlayhead, 없으면 수신 시각으로 추정)
+export const useConversationWebSocket = (getPlayhead = null) => {
   const wsRef = useRef(null);
   const clientIdRef = useRef(uuidv4());
   const currentStreamIdRef = useRef(null); // 🔥 현재 스트림 ID 추적
-  const pendingAudioChunkRef = useRef(null); // 🔥 대기 중인 오디오 청크 메타데이터
+  const getPlayheadRef = useRef(getPlayhead);
+  getPlayheadRef.current = getPlayhead;
+  // 📡 재생 위치 추정 (scheduledStart: 이 스트림 첫 청크가 플레이어에 예약된 AudioContext 시각)
+  const playbackRef = useRef({ streamId: null, startedAt: 0, scheduledStart: null, receivedSeconds: 0, timer: null });
+  
+  // 📡 재생 위치 보고 - 플레이어 재생 시계가 있으면 실제 재생 위치(currentTime - 스트림 예약 시작),
+  // 없으면 첫 프레임 이후 경과 시간으로 추정. 어느 쪽이든 받은 오디오 길이를 넘지 않음
+  const sendPlaybackAck = useCallback(() => {
+    const playback = playbackRef.current;
+    if (playback.streamId === null || wsRef.current?.readyState !== WebSocket.OPEN) return;
+    const playhead = playback.scheduledStart !== null ? getPlayheadRef.current?.() : null;
+    const played = playhead
+      ? Math.max(0, playhead.now - playback.scheduledStart)
+      : (performance.now() - playback.startedAt) / 1000;
+    wsRef.current.send(JSON.stringify({
+      type: 'playback_ack',
+      stream_id: playback.streamId,
+      played_seconds: Math.min(played, playback.receivedSeconds)
+    }));
+  }, []);
+  
+  const stopPlaybackAcks = useCallback(() => {
+    const playback = playbackRef.current;
+    if (playback.timer) clearInterval(playback.timer);
+    playbackRef.current = { streamId: null, startedAt: 0, scheduledStart: null, receivedSeconds: 0, timer: null };
+  }, []);
+  
+  const trackPlayback = useCallback((frame) => {
+    if (frame.flags & FLAG_START) {
+      stopPlaybackAcks();
+      // 첫 청크는 플레이어에서 지금 예약된 오디오 끝에 이어 붙으므로 그 시각이 이 스트림의 시작
+      const playhead = getPlayheadRef.current?.();
+      playbackRef.current = {
+        streamId: frame.stream_id,
+        startedAt: performance.now(),
+        scheduledStart: playhead ? playhead.queuedUntil : null,
+        receivedSeconds: 0,
+        timer: setInterval(sendPlaybackAck, PLAYBACK_ACK_INTERVAL_MS)
+      };
+    }
+    const playback = playbackRef.current;
+    if (playback.streamId !== frame.stream_id) return;
+    playback.receivedSeconds += frameDurationSeconds(frame);
+    if (frame.flags & FLAG_END) {
+      // 마지막 프레임 이후에는 서버가 더 보낼 것이 없으므로 보고 중단
+      sendPlaybackAck();
+      stopPlaybackAcks();
+    }
+  }, [sendPlaybackAck, stopPlaybackAcks]);
   
   const connect = useCallback((onMessage, onOpen, onClose, onError) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -22,41 +115,48 @@ export const useConversationWebSocket = () => {
     wsRef.current.onclose = onClose || (() => {});
     wsRef.current.onerror = onError || (() => {});
     
+    wsRef.current.binaryType = 'arraybuffer';
+    
+    // 🔥 바이너리 오디오 프레임 처리 (헤더에 stream_id/seq/샘플레이트 포함)
+    const handleAudioFrame = (buffer) => {
+      if (buffer.byteLength < FRAME_HEADER_SIZE) {
+        console.warn('⚠️ 잘못된 오디오 프레임:', buffer.byteLength, 'bytes');
+        return;
+      }
+      const frame = parseAudioFrame(buffer);
+      frame.codec = frame.flags & FLAG_OPUS ? 'opus' : 'pcm16';
+      if (frame.codec === 'opus') {
+        frame.packets = unpackOpusPackets(frame.audioData);
+      }
+      
+      // 대기 음성은 현재 스트림과 무관하게 바로 재생
+      if (frame.flags & FLAG_FILLER) {
+        onMessage?.({ event: 'filler_audio_binary', ...frame });
+        return;
+      }
+      
+      if (frame.flags & FLAG_START) {
+        currentStreamIdRef.current = frame.stream_id;
+      }
+      if (frame.stream_id === currentStreamIdRef.current) {
+        trackPlayback(frame);
+        onMessage?.({
+          event: 'audio_chunk_binary',
+          ...frame,
+          chunk_index: frame.seq,
+          is_final_chunk: (frame.flags & FLAG_END) !== 0
+        });
+      } else {
+        console.log('⚠️ 현재 스트림이 아닌 오디오 프레임 무시:', frame.stream_id);
+      }
+    };
+    
     wsRef.current.onmessage = (event) => {
       try {
-        // 🔥 바이너리 데이터 처리 개선 - Blob과 ArrayBuffer 모두 처리
         if (event.data instanceof ArrayBuffer) {
-          console.log('📊 ArrayBuffer 오디오 데이터 수신:', event.data.byteLength, 'bytes');
-          // 바이너리 오디오 데이터 처리
-          const pendingMeta = pendingAudioChunkRef.current;
-          if (pendingMeta && pendingMeta.stream_id === currentStreamIdRef.current) {
-            // 메타데이터와 함께 오디오 데이터 전달
-            onMessage?.({
-              event: 'audio_chunk_binary',
-              ...pendingMeta,
-              audioData: event.data
-            });
-            pendingAudioChunkRef.current = null;
-          } else {
-            console.warn('⚠️ 메타데이터 없는 ArrayBuffer 데이터 무시');
-          }
+          handleAudioFrame(event.data);
         } else if (event.data instanceof Blob) {
-          console.log('📊 Blob 오디오 데이터 수신:', event.data.size, 'bytes');
-          // Blob을 ArrayBuffer로 변환
-          event.data.arrayBuffer().then(arrayBuffer => {
-            const pendingMeta = pendingAudioChunkRef.current;
-            if (pendingMeta && pendingMeta.stream_id === currentStreamIdRef.current) {
-              console.log('✅ Blob -> ArrayBuffer 변환 완료:', arrayBuffer.byteLength, 'bytes');
-              onMessage?.({
-                event: 'audio_chunk_binary',
-                ...pendingMeta,
-                audioData: arrayBuffer
-              });
-              pendingAudioChunkRef.current = null;
-            } else {
-              console.warn('⚠️ 메타데이터 없는 Blob 데이터 무시');
-            }
-          }).catch(error => {
+          event.data.arrayBuffer().then(handleAudioFrame).catch(error => {
             console.error('❌ Blob -> ArrayBuffer 변환 실패:', error);
           });
         } else if (typeof event.data === 'string') {
@@ -65,16 +165,7 @@ export const useConversationWebSocket = () => {
             const data = JSON.parse(event.data);
             console.log('📨 JSON 메시지 수신:', data.event || data.type || 'unknown');
             
-            // 🔥 오디오 청크 메타데이터 저장
-            if (data.event === 'audio_chunk_meta') {
-              console.log('📝 오디오 메타데이터 저장:', data.stream_id, data.chunk_index);
-              pendingAudioChunkRef.current = data;
-              
-              // 메타데이터만 전달하여 클라이언트가 준비할 수 있도록 함
-              onMessage?.(data);
-            } else {
-              onMessage?.(data);
-            }
+            onMessage?.(data);
           } catch (parseError) {
             console.error('❌ JSON 파싱 오류:', parseError);
             console.error('원본 데이터:', event.data);
@@ -88,7 +179,7 @@ export const useConversationWebSocket = () => {
     };
     
     return wsRef.current;
-  }, []);
+  }, [trackPlayback]);
   
   const sendConfiguration = useCallback((config) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -114,8 +205,8 @@ export const useConversationWebSocket = () => {
       wsRef.current = null;
     }
     currentStreamIdRef.current = null; // 🔥 스트림 ID 초기화
-    pendingAudioChunkRef.current = null; // 🔥 대기 중인 메타데이터 초기화
-  }, []);
+    stopPlaybackAcks();
+  }, [stopPlaybackAcks]);
   
   const isConnected = useCallback(() => {
     return wsRef.current?.readyState === WebSocket.OPEN;
@@ -137,12 +228,12 @@ export const useConversationWebSocket = () => {
     close, 
     isConnected,
     clientId: clientIdRef.current,
-    currentStreamIdRef, // 🔥 스트림 ID 참조 노출
-    pendingAudioChunkRef // 🔥 메타데이터 참조 노출
+    currentStreamIdRef // 🔥 스트림 ID 참조 노출
   };
 };
 
-export const useConversationFlow = () => {
+// audioPlayer: 재생 위치 보고에 쓸 useAudioPlayer() (선택)
+export const useConversationFlow = (audioPlayer = null) => {
   const { 
     connect, 
     sendConfiguration, 
@@ -151,9 +242,8 @@ export const useConversationFlow = () => {
     close, 
     isConnected,
     clientId,
-    currentStreamIdRef,
-    pendingAudioChunkRef
-  } = useConversationWebSocket();
+    currentStreamIdRef
+  } = useConversationWebSocket(audioPlayer?.getPlayhead);
   
   const connectConversation = useCallback((
     onSTTResult,
@@ -197,14 +287,29 @@ export const useConversationFlow = () => {
           onSTTResult?.('');
           break;
           
+        // 🔥 LLM 스트리밍 중인 응답 텍스트 조각
+        case 'gpt_partial':
+          onStateChange?.('gpt_partial', data);
+          break;
+          
         case 'gpt_response':
           onGPTResponse?.(data.response);
           break;
           
         case 'tts_started':
+          if (data.stream_id) {
+            currentStreamIdRef.current = data.stream_id;
+          }
           onTTSStart?.(data.sr, data.dtype);
           break;
           
+        // 🔥 같은 응답의 다음 문장 - 재생 중인 오디오를 끊지 않도록 onTTSStart는 호출하지 않음
+        case 'tts_sentence_started':
+          if (data.stream_id) {
+            currentStreamIdRef.current = data.stream_id;
+          }
+          break;
+          
         // 🔥 새로운 스트림 시작 처리
         case 'audio_stream_start':
           console.log('🎵 새 오디오 스트림 시작:', data.stream_id);
@@ -233,7 +338,7 @@ export const useConversationFlow = () => {
           if (data.stream_id && data.stream_id === currentStreamIdRef.current) {
             if (data.audioData && data.audioData.byteLength > 0) {
               console.log(`✅ 오디오 청크 전달: ${data.chunk_index + 1}/${data.total_chunks}`);
-              onTTSAudio?.(data.audioData);
+              onTTSAudio?.(data.audioData, data.sample_rate);
             } else {
               console.warn('⚠️ 빈 오디오 데이터 수신');
             }
@@ -342,8 +447,13 @@ export const useConversationFlow = () => {
           }
           break;
           
+        // 💬 대기 음성 (응답이 늦을 때 STT 직후 재생)
+        case 'filler_audio_binary':
+          onTTSAudio?.(data.audioData, data.sample_rate);
+          break;
+
         case 'tts_completed':
-          onTTSComplete?.();
+          onTTSComplete?.(data.audio_url); // 다시 듣기용 URL (서버 보관이 꺼져 있으면 null)
           currentStreamIdRef.current = null; // 🔥 스트림 완료 시 ID 초기화
           break;
           
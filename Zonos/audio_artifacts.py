@@ -0,0 +1,148 @@
+# audio_artifacts.py - 생성된 오디오를 내용 해시로 보관하고 /api/audio/{hash}로 제공
+#
+# 대화 로그에는 오디오 대신 URL만 남기고, 다시 듣기/기록 보기는 재합성 없이 이 URL을 재생합니다.
+# 같은 해시는 항상 같은 바이트이므로 브라우저/CDN이 영구 캐시할 수 있습니다 (immutable, ETag = 해시).
+# 기본값(AUDIO_ARTIFACT_MAX_MB=0)에서는 지우지 않으므로 로그에 남은 URL이 계속 유효합니다.
+# 용량 한도를 주면 오래 접근하지 않은 것부터 지우고, 그 URL은 404가 됩니다.
+import hashlib
+import os
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, Request, Response
+
+from audio_codec import wav_stream_header
+from audio_framing import to_pcm16
+from tts_cache_store import KIND_ENCODED, SegmentStore
+
+ARTIFACT_DIR = os.getenv("AUDIO_ARTIFACT_DIR", "./cache/artifacts")
+ARTIFACT_MAX_MB = int(os.getenv("AUDIO_ARTIFACT_MAX_MB", "0"))  # 0 = 무제한 (축출 없음)
+# CDN을 앞에 두면 절대 URL로 지정 (예: https://cdn.example.com/api/audio)
+ARTIFACT_URL_BASE = os.getenv("AUDIO_ARTIFACT_URL_BASE", "/api/audio").rstrip("/")
+ARTIFACT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class AudioArtifactStore:
+    """내용 주소 오디오 저장소 (WAV PCM16 모노)
+
+    TTS 캐시와 같은 세그먼트 저장소(SegmentStore)를 쓰지만 디렉토리가 따로라서 캐시 축출 정책의
+    영향을 받지 않습니다. 같은 오디오는 한 번만 기록됩니다. max_size_mb가 0이면 지우지 않고,
+    양수면 그 크기를 넘을 때 가장 오래 접근하지 않은 것부터 지웁니다 (지워진 URL은 404).
+    """
+
+    def __init__(self, directory: str = ARTIFACT_DIR, max_size_mb: int = ARTIFACT_MAX_MB):
+        self.store = SegmentStore(directory)
+        self.store.start_background_compaction()
+        self.max_size = max_size_mb * 1024 * 1024
+
+    @staticmethod
+    def content_hash(blob: bytes) -> str:
+        """sha256 앞 128비트 (저장소 키 크기)"""
+        return hashlib.sha256(blob).hexdigest()[:32]
+
+    def put_wav(self, audio: np.ndarray, sample_rate: int) -> str:
+        """오디오를 WAV로 저장하고 해시 반환 (디스크 기록이 있으므로 executor에서 호출)"""
+        pcm = to_pcm16(audio).astype('<i2', copy=False).tobytes()
+        blob = wav_stream_header(int(sample_rate), data_size=len(pcm)) + pcm
+        key = self.content_hash(blob)
+        if key not in self.store:
+            self.store.put(key, np.frombuffer(blob, dtype=np.uint8), KIND_ENCODED, int(sample_rate))
+            self._evict()
+        return key
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """저장된 WAV 바이트 (제로카피 memoryview)"""
+        if not HASH_PATTERN.match(key):
+            return None
+        found = self.store.get(key)
+        if found is None:
+            return None
+        self.store.touch(key)
+        return found[0]
+
+    def url(self, key: str) -> str:
+        return f"{ARTIFACT_URL_BASE}/{key}"
+
+    def _evict(self):
+        if not self.max_size:
+            return
+        while self.store.index.total_bytes() > self.max_size:
+            victims = self.store.index.oldest()
+            if not victims:
+                break
+            for key, _ in victims:
+                self.store.delete(key)
+                if self.store.index.total_bytes() <= self.max_size:
+                    break
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self.store),
+            "size_mb": round(self.store.index.total_bytes() / 1024**2, 1),
+            "max_size_mb": self.max_size // 1024**2 or None,
+        }
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더 -> (start, end) 포함 범위
+
+    단일 bytes 범위만 처리하고, 그 밖의 형식이나 여러 범위는 None(전체 응답)으로 둡니다.
+    만족할 수 없는 범위면 ValueError.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    if not (start_text + end_text).isdigit():
+        return None
+    if not start_text:
+        suffix = int(end_text)  # 마지막 N바이트
+        if suffix == 0:
+            raise ValueError("빈 범위")
+        return max(size - suffix, 0), size - 1
+    start = int(start_text)
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    if start > end or start >= size:
+        raise ValueError("범위가 파일 밖")
+    return start, end
+
+
+def add_artifact_routes(app, store: AudioArtifactStore):
+    """GET/HEAD /api/audio/{audio_hash} - Range(206), If-None-Match(304), 장기 캐시 헤더"""
+
+    @app.api_route("/api/audio/{audio_hash}", methods=["GET", "HEAD"])
+    async def get_audio_artifact(audio_hash: str, request: Request):
+        """내용 주소 오디오 (WAV)"""
+        blob = store.get(audio_hash)
+        if blob is None:
+            raise HTTPException(status_code=404, detail="Audio not found")
+
+        etag = f'"{audio_hash}"'
+        headers = {"ETag": etag, "Cache-Control": ARTIFACT_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if "*" in tags or etag in tags:
+                return Response(status_code=304, headers=headers)
+
+        size = len(blob)
+        start, end, status_code = 0, size - 1, 200
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (if_range is None or if_range.strip() == etag):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except ValueError:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+            if byte_range is not None:
+                start, end = byte_range
+                status_code = 206
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        headers["Content-Length"] = str(end - start + 1)
+        content = b"" if request.method == "HEAD" else bytes(blob[start:end + 1])
+        return Response(content=content, status_code=status_code, media_type="audio/wav", headers=headers)
@@ -0,0 +1,191 @@
+# audio_codec.py - Opus 출력 인코딩 (선택적 의존성: opuslib + libopus)
+#
+# 스트림 형식: 48kHz 모노 raw Opus 패킷 (20ms), 바이너리 메시지마다 [u16 LE 길이][패킷]... 로 묶음 (audio_framing.pack_packets)
+# 클라이언트는 WebCodecs AudioDecoder({codec: "opus", sampleRate: 48000, numberOfChannels: 1}) 등으로 디코딩
+# HTTP 스트리밍 응답은 길이를 모르는 채로 쓰는 컨테이너 사용 (WAV 헤더 / Ogg Opus 페이지)
+
+import asyncio
+import os
+import random
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from audio_framing import OPUS_PACKET_MS, pack_packets, to_pcm16
+from audio_resample import StreamingResampler
+
+try:
+    import opuslib
+    OPUS_AVAILABLE = True
+except Exception:  # 패키지가 없거나 libopus 공유 라이브러리를 찾지 못함
+    OPUS_AVAILABLE = False
+
+OPUS_SAMPLE_RATE = 48_000
+OPUS_FRAME_SAMPLES = OPUS_SAMPLE_RATE * OPUS_PACKET_MS // 1000
+# 캐시에 미리 인코딩해 둘 수 있도록 비트레이트는 단계로만 선택
+OPUS_BITRATES = (12_000, 16_000, 24_000, 32_000, 48_000, 64_000)
+OPUS_DEFAULT_BITRATE = int(os.getenv("OPUS_DEFAULT_BITRATE", "32000"))
+OPUS_THROUGHPUT_HEADROOM = float(os.getenv("OPUS_THROUGHPUT_HEADROOM", "0.25"))  # 측정 처리량 중 오디오에 쓸 비율
+
+# 인코딩은 이벤트 루프 밖에서 (스트림별로는 순서대로 await)
+opus_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("OPUS_ENCODER_THREADS", "2")), thread_name_prefix="opus-"
+)
+
+
+def select_bitrate(throughput_bps: Optional[float] = None, requested: Optional[int] = None) -> int:
+    """요청값 또는 측정 처리량에 맞는 비트레이트 단계 (측정값이 없으면 기본값)"""
+    if requested:
+        return min(OPUS_BITRATES, key=lambda bitrate: abs(bitrate - int(requested)))
+    if throughput_bps is None:
+        return OPUS_DEFAULT_BITRATE
+    budget = throughput_bps * OPUS_THROUGHPUT_HEADROOM
+    fitting = [bitrate for bitrate in OPUS_BITRATES if bitrate <= budget]
+    return fitting[-1] if fitting else OPUS_BITRATES[0]
+
+
+class OpusStreamEncoder:
+    """청크 단위 증분 Opus 인코더 (원본 샘플레이트 -> 48kHz 리샘플링 상태와 20ms 미만 잔여 샘플 보관)"""
+
+    def __init__(self, source_rate: int, bitrate: int = OPUS_DEFAULT_BITRATE):
+        if not OPUS_AVAILABLE:
+            raise RuntimeError("Opus 인코딩을 사용할 수 없습니다 (pip install opuslib, libopus 필요)")
+        self.encoder = opuslib.Encoder(OPUS_SAMPLE_RATE, 1, opuslib.APPLICATION_AUDIO)
+        self.resampler = StreamingResampler(source_rate, OPUS_SAMPLE_RATE)
+        self.bitrate = 0
+        self.set_bitrate(bitrate)
+        self._remainder = np.zeros(0, dtype=np.int16)
+
+    def set_bitrate(self, bitrate: int):
+        """다음 패킷부터 적용"""
+        if bitrate != self.bitrate:
+            self.encoder.bitrate = bitrate
+            self.bitrate = bitrate
+
+    def encode(self, audio: np.ndarray) -> List[bytes]:
+        """입력 청크에서 완성된 20ms 프레임만큼 패킷 생성"""
+        pcm = np.concatenate([self._remainder, to_pcm16(self.resampler.process(audio))])
+        usable = len(pcm) - len(pcm) % OPUS_FRAME_SAMPLES
+        self._remainder = pcm[usable:]
+        return [
+            self.encoder.encode(pcm[i:i + OPUS_FRAME_SAMPLES].tobytes(), OPUS_FRAME_SAMPLES)
+            for i in range(0, usable, OPUS_FRAME_SAMPLES)
+        ]
+
+    def finish(self) -> List[bytes]:
+        """리샘플러 꼬리와 잔여 샘플을 무음으로 채워 마지막 패킷까지 생성"""
+        packets = self.encode(self.resampler.flush())
+        if len(self._remainder):
+            padded = np.zeros(OPUS_FRAME_SAMPLES, dtype=np.int16)
+            padded[:len(self._remainder)] = self._remainder
+            self._remainder = np.zeros(0, dtype=np.int16)
+            packets.append(self.encoder.encode(padded.tobytes(), OPUS_FRAME_SAMPLES))
+        return packets
+
+    async def encode_async(self, audio: np.ndarray, final: bool = False) -> List[bytes]:
+        """opus_executor에서 인코딩 (final이면 스트림 마무리까지)"""
+        def run():
+            packets = self.encode(audio)
+            return packets + self.finish() if final else packets
+        return await asyncio.get_running_loop().run_in_executor(opus_executor, run)
+
+
+def encode_opus(audio: np.ndarray, sample_rate: int, bitrate: int) -> bytes:
+    """전체 오디오 -> 묶인 패킷 (캐시에 미리 인코딩해 둘 때)"""
+    encoder = OpusStreamEncoder(sample_rate, bitrate)
+    return pack_packets(encoder.encode(audio) + encoder.finish())
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits: int = 16, data_size: Optional[int] = None) -> bytes:
+    """PCM WAV 헤더 (data_size가 없으면 길이 미정: RIFF/data 크기를 0xFFFFFFFF로 두고 이어서 PCM을 씀)"""
+    block_align = channels * bits // 8
+    riff_size = 0xFFFFFFFF if data_size is None else 36 + data_size
+    return (
+        b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF if data_size is None else data_size)
+    )
+
+
+def _ogg_crc_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+OGG_CRC_TABLE = _ogg_crc_table()
+OGG_PAGE_HEADER = struct.Struct("<4sBBqIII")
+OGG_MAX_SEGMENTS = 255
+OGG_BOS, OGG_EOS = 0x02, 0x04
+OPUS_PRE_SKIP = 312  # libopus 인코더 지연 (48kHz 샘플)
+
+
+def _ogg_crc(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ OGG_CRC_TABLE[((crc >> 24) ^ byte) & 0xFF]
+    return crc
+
+
+class OggOpusWriter:
+    """Opus 패킷 -> Ogg Opus 페이지 (RFC 7845, HTTP 스트리밍 응답용)
+
+    마지막 페이지에 EOS 표시를 하기 위해 직전 write의 패킷을 한 번 붙잡아 두었다가
+    다음 write나 finish에서 내보냅니다.
+    """
+
+    def __init__(self, input_sample_rate: int = OPUS_SAMPLE_RATE):
+        self.input_sample_rate = int(input_sample_rate)
+        self.serial = random.getrandbits(32)
+        self.sequence = 0
+        self.granule = 0
+        self._pending: List[bytes] = []
+
+    def header(self) -> bytes:
+        """OpusHead + OpusTags 페이지"""
+        head = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, OPUS_PRE_SKIP, self.input_sample_rate, 0, 0)
+        vendor = b"Zonos"
+        tags = b"OpusTags" + struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+        return self._page([head], 0, OGG_BOS) + self._page([tags], 0)
+
+    def write(self, packets: Iterable[bytes]) -> bytes:
+        pages = self._flush(0) if self._pending else b""
+        self._pending = list(packets)
+        return pages
+
+    def finish(self) -> bytes:
+        return self._flush(OGG_EOS)
+
+    def _flush(self, last_flags: int) -> bytes:
+        """보관 중인 패킷을 페이지당 255 세그먼트 이내로 나눠 기록"""
+        pages, batch, segments = [], [], 0
+        for packet in self._pending:
+            needed = len(packet) // 255 + 1
+            if batch and segments + needed > OGG_MAX_SEGMENTS:
+                pages.append(self._granule_page(batch, 0))
+                batch, segments = [], 0
+            batch.append(packet)
+            segments += needed
+        pages.append(self._granule_page(batch, last_flags))
+        self._pending = []
+        return b"".join(pages)
+
+    def _granule_page(self, packets: List[bytes], flags: int) -> bytes:
+        self.granule += len(packets) * OPUS_FRAME_SAMPLES
+        return self._page(packets, self.granule, flags)
+
+    def _page(self, packets: List[bytes], granule: int, flags: int = 0) -> bytes:
+        lacing = bytearray()
+        for packet in packets:
+            lacing += b"\xff" * (len(packet) // 255) + bytes([len(packet) % 255])
+        header = OGG_PAGE_HEADER.pack(b"OggS", 0, flags, granule, self.serial, self.sequence, 0) + bytes([len(lacing)]) + lacing
+        page = bytearray(header + b"".join(packets))
+        struct.pack_into("<I", page, 22, _ogg_crc(page))
+        self.sequence += 1
+        return bytes(page)
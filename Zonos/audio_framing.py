@@ -0,0 +1,226 @@
+# audio_framing.py - 대화 WebSocket용 바이너리 오디오 프레임 (base64/JSON 메타데이터 대체) 및 재생 위치 기반 송신 조절
+#
+# 프레임 = 12바이트 고정 헤더 + PCM int16 (little-endian) 페이로드
+#   version     u8   FRAME_VERSION
+#   flags       u8   FLAG_* 비트 조합
+#   stream_id   u16  스트림 식별자 (0은 대기 음성 전용)
+#   seq         u32  스트림 내 프레임 순번 (0부터)
+#   sample_rate u32  샘플레이트 (Hz)
+# FLAG_OPUS 프레임의 페이로드는 PCM 대신 [u16 LE 길이][Opus 패킷]... (48kHz, 패킷당 20ms)
+
+import asyncio
+import struct
+import time
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<BBHII")
+HEADER_SIZE = FRAME_HEADER.size
+
+FLAG_START = 0x01   # 스트림 첫 프레임
+FLAG_END = 0x02     # 스트림 마지막 프레임
+FLAG_FILLER = 0x04  # 대기 음성 (현재 스트림과 무관하게 바로 재생)
+FLAG_OPUS = 0x08    # 페이로드가 길이 접두 Opus 패킷들
+
+FILLER_STREAM_ID = 0
+
+PACKET_LENGTH = struct.Struct("<H")
+OPUS_PACKET_MS = 20
+
+
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """float [-1, 1] 또는 int16 -> int16 (int16이면 복사하지 않음)"""
+    if audio.dtype == np.int16:
+        return audio
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def encode_frames(
+    audio: np.ndarray,
+    stream_id: int,
+    sample_rate: int,
+    frame_samples: int,
+    extra_flags: int = 0,
+) -> Tuple[bytearray, List[memoryview]]:
+    """오디오 전체를 한 버퍼에 [헤더|PCM][헤더|PCM]... 로 배치하고 프레임별 memoryview 반환
+
+    float 입력은 프레임 위치에 바로 int16으로 변환해 기록하므로 중간 복사본이 없습니다.
+    반환된 버퍼는 모든 프레임을 보낼 때까지 살아 있어야 합니다.
+    """
+    total = len(audio)
+    frame_samples = max(1, frame_samples)
+    num_frames = max(1, -(-total // frame_samples))
+    buffer = bytearray(num_frames * HEADER_SIZE + total * 2)
+    frames = []
+
+    offset = 0
+    for seq in range(num_frames):
+        start = seq * frame_samples
+        chunk = audio[start:start + frame_samples]
+        flags = extra_flags
+        if seq == 0:
+            flags |= FLAG_START
+        if seq == num_frames - 1:
+            flags |= FLAG_END
+        FRAME_HEADER.pack_into(buffer, offset, FRAME_VERSION, flags, stream_id & 0xFFFF, seq, int(sample_rate))
+
+        payload = np.frombuffer(buffer, dtype='<i2', count=len(chunk), offset=offset + HEADER_SIZE)
+        if chunk.dtype == np.int16:
+            payload[:] = chunk
+        else:
+            np.multiply(np.clip(chunk, -1.0, 1.0), 32767, out=payload, casting='unsafe')
+
+        end = offset + HEADER_SIZE + len(chunk) * 2
+        frames.append(memoryview(buffer)[offset:end])
+        offset = end
+
+    return buffer, frames
+
+
+def encode_frame(pcm: np.ndarray, stream_id: int, seq: int, sample_rate: int, flags: int = 0) -> bytes:
+    """단일 프레임 (대기 음성처럼 미리 만들어 두고 재사용할 때)"""
+    return FRAME_HEADER.pack(FRAME_VERSION, flags, stream_id & 0xFFFF, seq, int(sample_rate)) + to_pcm16(pcm).astype('<i2', copy=False).tobytes()
+
+
+def encode_packet_frame(payload: bytes, stream_id: int, seq: int, sample_rate: int, flags: int = 0) -> bytes:
+    """이미 인코딩된 페이로드(Opus 등)를 담은 프레임"""
+    return FRAME_HEADER.pack(FRAME_VERSION, flags, stream_id & 0xFFFF, seq, int(sample_rate)) + payload
+
+
+def pack_packets(packets: Iterable[bytes]) -> bytes:
+    """패킷 목록 -> [u16 길이][패킷]..."""
+    return b"".join(PACKET_LENGTH.pack(len(packet)) + packet for packet in packets)
+
+
+def unpack_packets(data) -> List[bytes]:
+    """pack_packets의 역변환"""
+    data = memoryview(data)
+    packets, offset = [], 0
+    while offset + PACKET_LENGTH.size <= len(data):
+        (length,) = PACKET_LENGTH.unpack_from(data, offset)
+        offset += PACKET_LENGTH.size
+        packets.append(bytes(data[offset:offset + length]))
+        offset += length
+    return packets
+
+
+def iter_packet_groups(data, packets_per_group: int) -> Iterator[Tuple[memoryview, int]]:
+    """묶인 패킷들을 복사 없이 packets_per_group개씩 잘라 (memoryview, 패킷 수) 반환"""
+    data = memoryview(data)
+    start = offset = count = 0
+    while offset + PACKET_LENGTH.size <= len(data):
+        offset += PACKET_LENGTH.size + PACKET_LENGTH.unpack_from(data, offset)[0]
+        count += 1
+        if count == packets_per_group:
+            yield data[start:offset], count
+            start, count = offset, 0
+    if count:
+        yield data[start:offset], count
+
+
+def packed_duration(data) -> float:
+    """묶인 Opus 패킷들의 재생 시간 (초)"""
+    data = memoryview(data)
+    count, offset = 0, 0
+    while offset + PACKET_LENGTH.size <= len(data):
+        offset += PACKET_LENGTH.size + PACKET_LENGTH.unpack_from(data, offset)[0]
+        count += 1
+    return count * OPUS_PACKET_MS / 1000
+
+
+def decode_header(frame: bytes) -> Tuple[int, int, int, int, int]:
+    """(version, flags, stream_id, seq, sample_rate)"""
+    return FRAME_HEADER.unpack_from(frame, 0)
+
+
+def frame_duration(frame: bytes) -> float:
+    """프레임 페이로드의 재생 시간 (초)"""
+    _, flags, _, _, sample_rate = decode_header(frame)
+    if flags & FLAG_OPUS:
+        return packed_duration(memoryview(frame)[HEADER_SIZE:])
+    return (len(frame) - HEADER_SIZE) / 2 / sample_rate if sample_rate else 0.0
+
+
+class PlaybackPacer:
+    """클라이언트 재생 위치 기준 송신 조절 (고정 sleep 대체)
+
+    클라이언트 ack(재생한 초)와 마지막 ack 이후 경과 시간으로 재생 위치를 추정하고,
+    보낸 오디오가 재생 위치보다 lead_seconds 이상 앞서 있을 때만 기다립니다.
+    그 전까지는 소켓이 받아주는 만큼 바로 보냅니다. ack를 보내지 않는 클라이언트는
+    첫 전송 시점부터 실시간으로 재생한다고 가정합니다.
+    한 연결에서 여러 pacer가 동시에 스트림을 열 때는 id_source로 stream_id 발급기를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        lead_seconds: float = 1.0,
+        max_extrapolation: float = 2.0,
+        id_source: Optional[Callable[[], int]] = None,
+    ):
+        self.lead_seconds = lead_seconds
+        self.max_extrapolation = max_extrapolation  # ack 없이 재생이 진행됐다고 볼 최대 시간
+        self.id_source = id_source
+        self._wakeup = asyncio.Event()
+        self._next_stream_id = 0
+        self.acks = 0
+        self.waits = 0
+        self.start_stream()
+
+    def start_stream(self, stream_id: Optional[int] = None) -> int:
+        """새 스트림 시작 (송신/재생 위치 초기화)"""
+        if stream_id is None and self.id_source is not None:
+            stream_id = self.id_source()
+        elif stream_id is None:
+            self._next_stream_id = self._next_stream_id % 0xFFFF + 1
+            stream_id = self._next_stream_id
+        self.stream_id = stream_id
+        self.sent_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.acked_seconds = 0.0
+        self.acked_at: Optional[float] = None
+        return stream_id
+
+    def on_ack(self, played_seconds: float, stream_id: Optional[int] = None):
+        """클라이언트 재생 위치 보고"""
+        if stream_id is not None and stream_id != self.stream_id:
+            return  # 지난 스트림의 늦은 ack
+        self.acked_seconds = float(played_seconds)
+        self.acked_at = time.monotonic()
+        self.acks += 1
+        self._wakeup.set()
+
+    def played_seconds(self) -> float:
+        """현재 클라이언트 재생 위치 추정"""
+        now = time.monotonic()
+        if self.acked_at is not None:
+            played = self.acked_seconds + min(now - self.acked_at, self.max_extrapolation)
+        elif self.started_at is not None:
+            played = now - self.started_at
+        else:
+            played = 0.0
+        return min(played, self.sent_seconds)
+
+    def buffered_seconds(self) -> float:
+        """클라이언트에 보냈지만 아직 재생되지 않은 양"""
+        return self.sent_seconds - self.played_seconds()
+
+    async def send(self, send: Callable[[Any], Awaitable[Any]], data: Any, seconds: float) -> Any:
+        """앞선 양이 lead_seconds 아래로 내려갈 때까지(또는 ack가 올 때까지) 기다린 뒤 전송"""
+        while True:
+            wait = self.buffered_seconds() - self.lead_seconds
+            if wait <= 0:
+                break
+            self.waits += 1
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        result = await send(data)
+        self.sent_seconds += seconds
+        return result
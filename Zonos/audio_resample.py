@@ -0,0 +1,94 @@
+# audio_resample.py - 청크 단위 스트리밍 리샘플러 (polyphase FIR, 청크 경계에서 필터 상태 유지)
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+TAPS_PER_PHASE = 16     # 위상당 탭 수 (입력 샘플 기준 필터 길이)
+KAISER_BETA = 8.0
+ROLLOFF = 0.94          # 나이퀴스트 대비 차단 주파수
+
+# output_sample_rate로 요청할 수 있는 범위
+OUTPUT_RATE_MIN = 8_000
+OUTPUT_RATE_MAX = 48_000
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(source_rate: int, target_rate: int, taps_per_phase: int = TAPS_PER_PHASE) -> Tuple[int, int, np.ndarray]:
+    """(up, down, [up, taps] 위상별 계수) - 샘플레이트 쌍마다 한 번만 설계"""
+    divisor = gcd(source_rate, target_rate)
+    up, down = target_rate // divisor, source_rate // divisor
+    # 다운샘플링은 차단 주파수가 낮아지는 만큼 필터를 길게 (전이 대역폭 유지)
+    taps_per_phase = -(-taps_per_phase * max(up, down) // up)
+    length = up * taps_per_phase
+    cutoff = 0.5 * ROLLOFF / max(up, down)  # 업샘플링된 샘플레이트 기준 (cycles/sample)
+    n = np.arange(length) - (length - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, KAISER_BETA) * up
+    # phases[p, m] = h[p + m * up] -> 출력 샘플 하나는 위상 하나와 입력 taps개의 내적
+    phases = h.reshape(taps_per_phase, up).T.astype(np.float32)
+    phases.setflags(write=False)
+    return up, down, phases
+
+
+class StreamingResampler:
+    """청크를 순서대로 넣으면 경계 끊김 없이 이어지는 출력을 돌려주는 리샘플러
+
+    이전 청크의 마지막 taps-1개 샘플과 다음 출력 위상을 보관하므로, 전체를 한 번에
+    변환한 것과 같은 결과를 얻습니다. 입력은 float 또는 int16 모노.
+    필터 계수는 샘플레이트 쌍별로 polyphase_filter에 캐시되어 스트림마다 다시 설계하지 않습니다.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self.source_rate = int(source_rate)
+        self.target_rate = int(target_rate)
+        self.passthrough = self.source_rate == self.target_rate
+        if self.passthrough:
+            return
+        self.up, self.down, self.phases = polyphase_filter(self.source_rate, self.target_rate)
+        self.taps = self.phases.shape[1]
+        self._offsets = np.arange(self.taps)
+        self.history = np.zeros(self.taps - 1, dtype=np.float32)
+        self.position = (self.taps - 1) * self.up  # 다음 출력의 업샘플링 시각 (history[0] 기준)
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """입력 청크 -> 출력 청크 (float32)"""
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32767
+        if self.passthrough:
+            return np.asarray(audio, dtype=np.float32)
+
+        buffer = np.concatenate([self.history, np.asarray(audio, dtype=np.float32)])
+        count = max(0, -(-(len(buffer) * self.up - self.position) // self.down))
+        times = self.position + self.down * np.arange(count)
+        index = times // self.up
+        output = np.einsum(
+            "ij,ij->i", self.phases[times % self.up], buffer[index[:, None] - self._offsets]
+        ) if count else np.zeros(0, dtype=np.float32)
+
+        # 소비한 입력은 버리고 taps-1개만 남김
+        shift = len(buffer) - (self.taps - 1)
+        self.position += count * self.down - shift * self.up
+        self.history = buffer[shift:]
+        return output
+
+    def flush(self) -> np.ndarray:
+        """필터 지연만큼 남은 출력 (스트림 끝에서 한 번)"""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros(self.taps // 2, dtype=np.float32))
+
+
+def resolve_output_rate(requested, source_rate: int) -> int:
+    """요청한 출력 샘플레이트 (없거나 범위를 벗어나면 원본 샘플레이트)"""
+    try:
+        rate = int(requested)
+    except (TypeError, ValueError):
+        return int(source_rate)
+    return rate if OUTPUT_RATE_MIN <= rate <= OUTPUT_RATE_MAX else int(source_rate)
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """전체 오디오 한 번에 변환 (캐시에 변환본을 만들어 둘 때)"""
+    resampler = StreamingResampler(source_rate, target_rate)
+    return np.concatenate([resampler.process(audio), resampler.flush()])
@@ -1,8 +1,11 @@
 import asyncio
+import contextlib
+import hashlib
 import json
 import logging
+import os
 import time
-from typing import Dict, Optional, Any
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 
@@ -11,6 +14,21 @@ from fastapi import WebSocket, WebSocketDisconnect
 
 # Zonos 모델 import 추가
 from zonos.model import Zonos
+from audio_framing import (
+    FLAG_END, FLAG_OPUS, FLAG_START, PlaybackPacer, encode_frame, encode_frames, encode_packet_frame, frame_duration,
+    pack_packets
+)
+from audio_codec import OPUS_AVAILABLE, OPUS_SAMPLE_RATE, OpusStreamEncoder, select_bitrate
+from audio_resample import StreamingResampler, resolve_output_rate
+from outbound_queue import PRIORITY_CONTROL, PRIORITY_STREAM, OutboundQueue
+from tts_speed_optimization import PRIORITY_INTERACTIVE, IncrementalSentenceSplitter
+
+# 바이너리 오디오 프레임 하나의 길이 (ms)
+CONVERSATION_FRAME_MS = float(os.getenv("CONVERSATION_FRAME_MS", "300"))
+# 클라이언트 재생 위치보다 최대 몇 초 앞서 보낼지
+CONVERSATION_PLAYBACK_LEAD_SEC = float(os.getenv("CONVERSATION_PLAYBACK_LEAD_SEC", "1.0"))
+# LLM 스트리밍 중 이보다 짧은 문장은 다음 문장과 합쳐서 합성
+CONVERSATION_MIN_SENTENCE_CHARS = int(os.getenv("CONVERSATION_MIN_SENTENCE_CHARS", "8"))
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -20,6 +38,7 @@ executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="zonos-")
 
 # 이 함수들은 main.py에서 주입될 예정
 model_cache = None
+voice_manager = None
 make_cond_dict = None
 device = None
 log_user_message = None
@@ -27,11 +46,22 @@ log_assistant_message = None
 log_system_message = None
 get_gpt_service = None
 get_stt_service = None
+filler_bank = None
+synthesize_fillers = None
+log_audio_generation = None
+artifact_store = None
+tts_admission = None
+
+# 💬 예상 GPT+TTS 시간이 이 값(초)을 넘으면 STT 직후 대기 음성 재생
+FILLER_THRESHOLD_SEC = float(os.getenv("FILLER_THRESHOLD_SEC", "1.5"))
+FILLER_DEFAULT_PREDICTION_SEC = float(os.getenv("FILLER_DEFAULT_PREDICTION_SEC", "3.0"))  # 통계가 없을 때
 
 def set_dependencies(deps):
     """main.py에서 의존성들을 주입"""
-    global model_cache, make_cond_dict, device, log_user_message, log_assistant_message, log_system_message, get_gpt_service, get_stt_service
+    global model_cache, voice_manager, make_cond_dict, device, log_user_message, log_assistant_message, log_system_message, get_gpt_service, get_stt_service
+    global filler_bank, synthesize_fillers, log_audio_generation, artifact_store, tts_admission
     model_cache = deps['model_cache']
+    voice_manager = deps['voice_manager']
     make_cond_dict = deps['make_cond_dict']
     device = deps['device']
     log_user_message = deps['log_user_message']
@@ -39,6 +69,11 @@ def set_dependencies(deps):
     log_system_message = deps['log_system_message']
     get_gpt_service = deps['get_gpt_service']
     get_stt_service = deps['get_stt_service']
+    filler_bank = deps.get('filler_bank')
+    synthesize_fillers = deps.get('synthesize_fillers')
+    log_audio_generation = deps.get('log_audio_generation')
+    artifact_store = deps.get('artifact_store')
+    tts_admission = deps.get('tts_admission')
 
 # 📊 성능 모니터링 함수들
 def log_performance_metrics(operation: str, start_time: float, **kwargs):
@@ -77,31 +112,53 @@ class ConversationManager:
         self.conversation_states: Dict[str, Dict[str, Any]] = {}
         self.audio_buffers: Dict[str, bytearray] = {}
         self.performance_stats: Dict[str, Dict] = {}  # 성능 통계
+        self.stream_counters: Dict[str, int] = {}  # 바이너리 프레임 stream_id
+        self.pacers: Dict[str, PlaybackPacer] = {}  # 재생 ack 기반 송신 조절
+        self.pipeline_tasks: Dict[str, asyncio.Task] = {}  # STT -> GPT -> TTS 처리 태스크
+        self.outbound: Dict[str, OutboundQueue] = {}  # 연결별 송신 큐 (전용 writer 태스크)
+    
+    def next_stream_id(self, client_id: str) -> int:
+        """클라이언트별 1..65535 순환 stream_id (0은 대기 음성 전용), 송신 조절도 새 스트림으로 초기화"""
+        stream_id = self.stream_counters.get(client_id, 0) % 0xFFFF + 1
+        self.stream_counters[client_id] = stream_id
+        if client_id in self.pacers:
+            self.pacers[client_id].start_stream(stream_id)
+        return stream_id
     
     def is_connected(self, client_id: str) -> bool:
         """클라이언트 연결 상태 확인"""
-        return client_id in self.active_conversations
+        outbound = self.outbound.get(client_id)
+        return client_id in self.active_conversations and outbound is not None and not outbound.closed
     
-    async def safe_send_json(self, client_id: str, data: dict) -> bool:
-        """안전한 JSON 메시지 전송"""
-        if not self.is_connected(client_id):
+    async def safe_send_json(self, client_id: str, data: dict, priority: int = PRIORITY_STREAM) -> bool:
+        """JSON 메시지를 송신 큐에 넣음 (네트워크 전송은 기다리지 않음)
+        
+        전송 실패 시 연결 정리는 수신 루프의 WebSocketDisconnect 처리에 맡깁니다.
+        """
+        outbound = self.outbound.get(client_id)
+        if outbound is None or outbound.closed:
             logger.warning(f"⚠️ 클라이언트 {client_id}가 연결되어 있지 않음")
             return False
-        
-        try:
-            websocket = self.active_conversations[client_id]
-            await websocket.send_json(data)
-            return True
-        except Exception as e:
-            logger.error(f"❌ 메시지 전송 실패 (클라이언트 {client_id}): {e}")
-            # 연결이 끊어진 경우 정리
-            if client_id in self.active_conversations:
-                del self.active_conversations[client_id]
+        return await outbound.send_json(data, priority)
+    
+    async def safe_send_bytes(self, client_id: str, data) -> bool:
+        """바이너리 메시지(bytes/memoryview)를 송신 큐에 넣음"""
+        outbound = self.outbound.get(client_id)
+        if outbound is None:
             return False
+        return await outbound.send_bytes(data)
+    
+    async def send_frame(self, client_id: str, frame) -> bool:
+        """오디오 프레임 전송 - 클라이언트 재생 위치보다 lead 이상 앞서 있으면 대기"""
+        pacer = self.pacers.get(client_id)
+        if pacer is None:
+            return await self.safe_send_bytes(client_id, frame)
+        return await pacer.send(lambda data: self.safe_send_bytes(client_id, data), frame, frame_duration(frame))
     
     async def connect(self, websocket: WebSocket, client_id: str):
         await websocket.accept()
         self.active_conversations[client_id] = websocket
+        self.outbound[client_id] = OutboundQueue(websocket).start()
         self.conversation_states[client_id] = {
             "session_active": True,
             "waiting_for_response": False,
@@ -111,6 +168,7 @@ class ConversationManager:
             "performance_mode": "auto"  # auto, fast, quality
         }
         self.audio_buffers[client_id] = bytearray()
+        self.pacers[client_id] = PlaybackPacer(lead_seconds=CONVERSATION_PLAYBACK_LEAD_SEC)
         self.performance_stats[client_id] = {
             "total_requests": 0,
             "avg_stt_time": 0,
@@ -156,6 +214,14 @@ class ConversationManager:
             del self.conversation_states[client_id]
         if client_id in self.audio_buffers:
             del self.audio_buffers[client_id]
+        self.stream_counters.pop(client_id, None)
+        self.pacers.pop(client_id, None)
+        outbound = self.outbound.pop(client_id, None)
+        if outbound is not None:
+            outbound.close()
+        task = self.pipeline_tasks.pop(client_id, None)
+        if task is not None:
+            task.cancel()
         if client_id in self.performance_stats:
             # 세션 종료 시 성능 통계 로깅
             stats = self.performance_stats[client_id]
@@ -165,6 +231,61 @@ class ConversationManager:
         
         logger.info(f"🔌 Client {client_id} disconnected from conversation WebSocket")
 
+def prepare_audio_frames(
+    client_id: str, audio_data: np.ndarray, sample_rate: int, frame_samples: int
+) -> Tuple[int, int, Dict[str, Any], AsyncIterator[Any]]:
+    """(stream_id, 프레임 수, 형식 메타데이터, 프레임 이터레이터)
+    
+    tts_settings의 "format"이 "opus"이면 프레임마다 워커 스레드에서 증분 인코딩한 Opus 패킷을
+    FLAG_OPUS 프레임으로 보냅니다. 비트레이트는 요청값("bitrate") 또는 측정된 연결 처리량으로 결정합니다.
+    PCM은 "output_sample_rate"가 있으면 프레임마다 리샘플링합니다 (헤더 sample_rate도 변환 후 값).
+    """
+    stream_id = conversation_manager.next_stream_id(client_id)
+    tts_settings = conversation_manager.conversation_states.get(client_id, {}).get("tts_settings", {})
+    
+    if tts_settings.get("format") == "opus" and OPUS_AVAILABLE:
+        outbound = conversation_manager.outbound.get(client_id)
+        bitrate = select_bitrate(outbound.throughput_bps if outbound else None, tts_settings.get("bitrate"))
+        total = max(1, -(-len(audio_data) // frame_samples))
+        frames = _opus_frames(audio_data, stream_id, sample_rate, frame_samples, bitrate, total)
+        return stream_id, total, {"format": "opus", "bitrate": bitrate}, frames
+    
+    output_rate = resolve_output_rate(tts_settings.get("output_sample_rate"), sample_rate)
+    if output_rate != int(sample_rate):
+        total = max(1, -(-len(audio_data) // frame_samples))
+        frames = _resampled_frames(audio_data, stream_id, sample_rate, output_rate, frame_samples, total)
+        return stream_id, total, {"format": "pcm", "output_sample_rate": output_rate}, frames
+    
+    _, pcm_frames = encode_frames(audio_data, stream_id, sample_rate, frame_samples)
+    
+    async def iterate():
+        for frame in pcm_frames:
+            yield frame
+    
+    return stream_id, len(pcm_frames), {"format": "pcm"}, iterate()
+
+async def _opus_frames(audio_data: np.ndarray, stream_id: int, sample_rate: int, frame_samples: int, bitrate: int, total: int):
+    """청크별 Opus 인코딩 -> 바이너리 프레임 (헤더 sample_rate는 48kHz)"""
+    encoder = OpusStreamEncoder(sample_rate, bitrate)
+    for seq in range(total):
+        last = seq == total - 1
+        packets = await encoder.encode_async(audio_data[seq * frame_samples:(seq + 1) * frame_samples], final=last)
+        flags = FLAG_OPUS | (FLAG_START if seq == 0 else 0) | (FLAG_END if last else 0)
+        yield encode_packet_frame(pack_packets(packets), stream_id, seq, OPUS_SAMPLE_RATE, flags)
+
+async def _resampled_frames(
+    audio_data: np.ndarray, stream_id: int, sample_rate: int, output_rate: int, frame_samples: int, total: int
+):
+    """청크별 리샘플링 (필터 상태는 청크 사이에 유지) -> PCM16 바이너리 프레임"""
+    resampler = StreamingResampler(sample_rate, output_rate)
+    for seq in range(total):
+        last = seq == total - 1
+        chunk = resampler.process(audio_data[seq * frame_samples:(seq + 1) * frame_samples])
+        if last:
+            chunk = np.concatenate([chunk, resampler.flush()])
+        flags = (FLAG_START if seq == 0 else 0) | (FLAG_END if last else 0)
+        yield encode_frame(chunk, stream_id, seq, output_rate, flags)
+
 # 🔥 초고속 대화 파이프라인 클래스
 class FastConversationPipeline:
     """초고속 대화 파이프라인"""
@@ -254,8 +375,6 @@ class FastConversationPipeline:
         state = conversation_manager.conversation_states.get(client_id, {})
         tts_settings = state.get("tts_settings", {})
         
-        from voice_manager import VoiceManager
-        voice_manager = VoiceManager(device)
         speaker_embedding = await voice_manager.process_voice_request(tts_settings, tiny_model)
         
         # 🔥 초고속 컨디셔닝 (목소리 적용)
@@ -310,27 +429,23 @@ class FastConversationPipeline:
         if max_val > 0:
             audio_data = audio_data / max_val * 0.9
         
-        # 16비트 변환
-        audio_int16 = (audio_data * 32767).astype('int16')
+        # 🔥 바이너리 프레임 변환 (헤더에 stream_id/seq/샘플레이트 포함, PCM16 또는 Opus)
+        stream_id, _, audio_format, frames = prepare_audio_frames(client_id, audio_data, sample_rate, chunk_size)
         
         # 🔥 메타데이터 먼저 전송
         await conversation_manager.safe_send_json(client_id, {
             "event": "instant_audio_start",
+            "stream_id": stream_id,
+            **audio_format,
             "sr": sample_rate,
-            "total_size": len(audio_int16),
+            "total_size": len(audio_data),
             "chunk_size": chunk_size
         })
         
-        # 🔥 초고속 스트리밍 (지연 최소화)
-        for i in range(0, len(audio_int16), chunk_size):
-            chunk = audio_int16[i:i + chunk_size]
-            chunk_bytes = chunk.tobytes()
-            
-            try:
-                await websocket.send_bytes(chunk_bytes)
-                await asyncio.sleep(0.003)  # 3ms 지연만
-            except Exception as e:
-                logger.warning(f"⚠️ 즉시 스트리밍 중단: {e}")
+        # 🔥 초고속 스트리밍 (재생 위치보다 lead만큼만 앞서 전송)
+        async for frame in frames:
+            if not await conversation_manager.send_frame(client_id, frame):
+                logger.warning(f"⚠️ 즉시 스트리밍 중단")
                 break
         
         # 완료 신호
@@ -352,14 +467,24 @@ async def websocket_conversation(websocket: WebSocket, client_id: str):
                 message = data["text"]
                 
                 if message == "stop_recording":
-                    await handle_stt_completion(websocket, client_id)
+                    # 재생 중에도 playback_ack를 계속 읽도록 처리는 태스크로 (이전 턴이 끝난 뒤 순서대로)
+                    previous = conversation_manager.pipeline_tasks.get(client_id)
+                    conversation_manager.pipeline_tasks[client_id] = asyncio.create_task(
+                        run_after(previous, handle_stt_completion, websocket, client_id)
+                    )
                     
                 elif message == "stop_speaking":
-                    await conversation_manager.safe_send_json(client_id, {"event": "tts_stopped"})
+                    await conversation_manager.safe_send_json(client_id, {"event": "tts_stopped"}, PRIORITY_CONTROL)
                     
                 elif message.startswith("{"):
                     try:
                         config = json.loads(message)
+                        # 📡 클라이언트 재생 위치 보고
+                        if "playback_ack" in (config.get("event"), config.get("type")):
+                            pacer = conversation_manager.pacers.get(client_id)
+                            if pacer:
+                                pacer.on_ack(config.get("played_seconds", 0.0), config.get("stream_id"))
+                            continue
                         await handle_configuration(websocket, client_id, config)
                     except json.JSONDecodeError:
                         await conversation_manager.safe_send_json(client_id, {"error": "Invalid JSON configuration"})
@@ -381,6 +506,12 @@ async def websocket_conversation(websocket: WebSocket, client_id: str):
         logger.error(f"❌ Conversation WebSocket error: {e}")
         conversation_manager.disconnect(client_id)
 
+async def run_after(previous: Optional[asyncio.Task], handler, *args):
+    """이전 태스크가 끝난 뒤 실행 (대화 턴 순서 유지)"""
+    if previous is not None and not previous.done():
+        await asyncio.gather(previous, return_exceptions=True)
+    await handler(*args)
+
 async def handle_configuration(websocket: WebSocket, client_id: str, config: Dict[str, Any]):
     """설정 변경 처리"""
     # 연결 상태 확인
@@ -409,6 +540,10 @@ async def handle_configuration(websocket: WebSocket, client_id: str, config: Dic
                 state["tts_settings"]["model"] = validated_model
             
             state["preferred_model"] = validated_model
+        
+        # 💬 선택한 목소리의 대기 음성 미리 생성
+        if filler_bank is not None:
+            filler_bank.schedule(config["tts_settings"].get("voice_id"), synthesize_fillers)
     
     # 성능 모드 설정
     if "performance_mode" in config:
@@ -459,6 +594,7 @@ async def handle_stt_completion(websocket: WebSocket, client_id: str):
         
         stt_service = get_stt_service()
         audio_data = bytes(audio_buffer)
+        conversation_manager.audio_buffers[client_id] = bytearray()  # STT 중 들어오는 다음 녹음과 섞이지 않도록
         
         logger.info(f"🎤 STT 처리 시작: {len(audio_data)} bytes")
         
@@ -478,8 +614,6 @@ async def handle_stt_completion(websocket: WebSocket, client_id: str):
             stats = conversation_manager.performance_stats[client_id]
             stats["avg_stt_time"] = (stats["avg_stt_time"] * stats["total_requests"] + stt_time) / (stats["total_requests"] + 1)
         
-        conversation_manager.audio_buffers[client_id] = bytearray()
-        
         if not transcript.strip():
             await conversation_manager.safe_send_json(client_id, {"event": "stt_empty"})
             return
@@ -514,6 +648,9 @@ async def handle_stt_completion(websocket: WebSocket, client_id: str):
             logger.warning(f"⚠️ STT 결과 전송 실패 - 클라이언트 {client_id} 연결 끊어짐")
             return
         
+        # 💬 응답이 늦을 것 같으면 대기 음성 먼저 재생
+        await play_filler_audio(client_id)
+        
         # GPT 응답 생성
         await generate_gpt_response(websocket, client_id, transcript)
         
@@ -521,9 +658,39 @@ async def handle_stt_completion(websocket: WebSocket, client_id: str):
         logger.error(f"❌ STT completion error: {e}")
         await conversation_manager.safe_send_json(client_id, {"error": f"STT processing failed: {str(e)}"})
 
+async def play_filler_audio(client_id: str) -> bool:
+    """예상 GPT+TTS 시간이 임계값을 넘으면 미리 생성해 둔 대기 음성을 즉시 전송"""
+    if filler_bank is None:
+        return False
+    
+    state = conversation_manager.conversation_states.get(client_id, {})
+    voice_id = state.get("tts_settings", {}).get("voice_id")
+    stats = conversation_manager.performance_stats.get(client_id, {})
+    if stats.get("total_requests"):
+        predicted = stats["avg_gpt_time"] + stats["avg_tts_time"]
+    else:
+        predicted = FILLER_DEFAULT_PREDICTION_SEC
+    
+    if predicted < FILLER_THRESHOLD_SEC:
+        return False
+    
+    clip = filler_bank.pick(voice_id)
+    if clip is None:
+        # 아직 생성되지 않은 목소리 (생성은 목소리 등록/설정 시점에 예약됨)
+        return False
+    
+    logger.info(f"💬 대기 음성 재생: '{clip['text']}' (예상 대기 {predicted:.2f}초)")
+    # 미리 만들어 둔 FLAG_FILLER 프레임을 그대로 전송
+    return await conversation_manager.safe_send_bytes(client_id, clip["frame"])
+
 async def generate_gpt_response(websocket: WebSocket, client_id: str, user_message: str):
-    """GPT 응답 생성"""
+    """GPT 응답 생성 - 토큰 스트리밍, 문장이 끝나는 대로 바로 TTS
+    
+    첫 문장 오디오가 재생되는 동안 LLM은 다음 문장을 쓰고 있습니다.
+    클라이언트에는 생성 중인 텍스트를 gpt_partial로, 전체 응답을 gpt_response로 보냅니다.
+    """
     start_time = time.time()
+    speaker = None
     
     try:
         # 연결 상태 확인
@@ -547,12 +714,40 @@ async def generate_gpt_response(websocket: WebSocket, client_id: str, user_messa
         enhanced_message = f"한줄 반 정도로 간단하게 대답해주세요: {user_message}"
         logger.info(f"🎯 프리픽스 추가된 메시지: '{enhanced_message}'")
         
-        response = await gpt.chat_completion(
-            session_id=client_id,
-            user_message=enhanced_message,
-            system_prompt=system_prompt,
-            max_tokens=100  # 🔥 더욱 짧은 답변을 위해 토큰 수 추가 제한
-        )
+        # 🗣️ 문장 큐를 소비하는 TTS 태스크 (LLM 스트리밍과 동시에 진행)
+        sentences: asyncio.Queue = asyncio.Queue()
+        speaker = asyncio.create_task(speak_sentences(websocket, client_id, sentences))
+        splitter = IncrementalSentenceSplitter(CONVERSATION_MIN_SENTENCE_CHARS)
+        parts = []
+        first_sentence_time = None
+        
+        try:
+            # aclosing: 중간에 빠져나와도 HTTP 스트림을 바로 닫음
+            async with contextlib.aclosing(gpt.chat_completion_stream(
+                session_id=client_id,
+                user_message=enhanced_message,
+                system_prompt=system_prompt,
+                max_tokens=100  # 🔥 더욱 짧은 답변을 위해 토큰 수 추가 제한
+            )) as stream:
+                async for delta in stream:
+                    if not conversation_manager.is_connected(client_id):
+                        logger.warning(f"⚠️ 클라이언트 {client_id} 연결 끊어짐 - GPT 스트리밍 중단")
+                        return
+                    parts.append(delta)
+                    await conversation_manager.safe_send_json(client_id, {"event": "gpt_partial", "delta": delta})
+                    
+                    for sentence in splitter.feed(delta):
+                        if first_sentence_time is None:
+                            first_sentence_time = time.time() - start_time
+                            logger.info(f"⚡ 첫 문장 완성: {first_sentence_time:.2f}초 - TTS 시작")
+                        sentences.put_nowait(sentence)
+            
+            for sentence in splitter.flush():
+                sentences.put_nowait(sentence)
+        finally:
+            sentences.put_nowait(None)  # TTS 태스크 종료 신호 (남은 문장은 마저 재생)
+        
+        response = "".join(parts).strip()
         
         # 성능 통계 업데이트
         gpt_time = time.time() - start_time
@@ -576,6 +771,7 @@ async def generate_gpt_response(websocket: WebSocket, client_id: str, user_messa
                     "source": "gpt_response", 
                     "model": "deepseek-chat",
                     "gpt_time": gpt_time,
+                    "first_sentence_time": first_sentence_time,
                     "device": str(device),
                     "response_length": len(response),  # 🔥 응답 길이 추가
                     "short_response_mode": True  # 🔥 짧은 답변 모드 플래그
@@ -584,211 +780,157 @@ async def generate_gpt_response(websocket: WebSocket, client_id: str, user_messa
         except Exception as e:
             logger.warning(f"⚠️ Firebase 로깅 실패 (무시): {e}")
         
-        # GPT 짧은 응답 전송
+        # GPT 짧은 응답 전송 (전체 텍스트 - 오디오는 이미 문장 단위로 재생 중)
         if not await conversation_manager.safe_send_json(client_id, {
             "event": "gpt_response",
             "response": response,
             "processing_time": gpt_time,
+            "first_sentence_time": first_sentence_time,
             "response_length": len(response),  # 🔥 응답 길이 정보 추가
             "mode": "short_response"  # 🔥 짧은 답변 모드 표시
         }):
             logger.warning(f"⚠️ GPT 짧은 응답 전송 실패 - 클라이언트 {client_id} 연결 끊어짐")
             return
         
-        # 자동으로 TTS 생성 (짧은 응답 버전)
-        await generate_tts_response(websocket, client_id, response)
+        # 남은 문장 TTS가 끝날 때까지 대기
+        await speaker
         
     except Exception as e:
         logger.error(f"❌ GPT response error: {e}")
         await conversation_manager.safe_send_json(client_id, {"error": f"GPT processing failed: {str(e)}"})
+    finally:
+        # 정상적으로 끝까지 기다린 경우가 아니면(연결 끊김/GPT 오류/취소) 남은 TTS 중단
+        if speaker is not None and not speaker.done():
+            speaker.cancel()
 
 async def generate_tts_response(websocket: WebSocket, client_id: str, text: str):
-    """TTS 응답 생성 - 단순화 및 안정성 향상"""
+    """TTS 응답 생성 - 텍스트 전체를 한 번에 합성"""
+    sentences: asyncio.Queue = asyncio.Queue()
+    sentences.put_nowait(text)
+    sentences.put_nowait(None)
+    await speak_sentences(websocket, client_id, sentences)
+
+async def speak_sentences(websocket: WebSocket, client_id: str, sentences: "asyncio.Queue[Optional[str]]"):
+    """문장 큐를 순서대로 합성해 전송 (None을 받으면 종료)
+    
+    첫 문장만 tts_started(클라이언트가 이전 오디오를 끊고 새로 재생)로 알리고, 이후 문장은
+    tts_sentence_started로 같은 재생에 이어 붙입니다. tts_completed/보관/로그는 응답 전체에 대해 한 번.
+    """
     start_time = time.time()
+    spoken = []
+    audio_parts = []
+    generation_total = 0.0
+    audio_duration = 0.0
+    model = None
     
     try:
-        if not text.strip():
-            logger.warning(f"⚠️ Empty text for TTS generation for client {client_id}")
-            return
-        
-        logger.info(f"🎵 TTS 생성 시작 (client {client_id}): '{text[:50]}...'")
-        
         # 대화 상태에서 설정 가져오기
         state = conversation_manager.conversation_states.get(client_id, {})
         tts_settings = state.get("tts_settings", {})
         language = state.get("language", "ko")
         performance_mode = state.get("performance_mode", "auto")
         
-        # 모델 선택
-        requested_model = tts_settings.get("model") or state.get("preferred_model")
-        # 🔥 모든 모드에서 동일한 모델 사용
-        model_choice = get_best_model_for_task(requested_model, "general")
-        
-        logger.info(f"🎯 TTS 모델 선택: {model_choice} (모드: {performance_mode})")
-        
-        # 연결 상태 확인
-        if not conversation_manager.is_connected(client_id):
-            logger.warning(f"⚠️ 클라이언트 {client_id} 연결 끊어짐 - TTS 처리 중단")
-            return
-        
-        # TTS 시작 알림
-        await conversation_manager.safe_send_json(client_id, {
-            "event": "tts_progress",
-            "progress": 10,
-            "message": f"TTS 모델 로딩... ({model_choice})",
-            "model": model_choice
-        })
-        
-        # 모델 로드
-        model = model_cache.load_model_if_needed(model_choice)
-        logger.info(f"✅ Model loaded successfully: {model_choice}")
-        
-        # 🎤 목소리 관리자를 통한 스피커 임베딩 처리
-        from voice_manager import VoiceManager
-        voice_manager = VoiceManager(device)
-        
-        # 목소리 설정 처리
-        speaker_embedding = await voice_manager.process_voice_request(tts_settings, model)
-        
-        logger.info(f"🎤 목소리 처리 결과: {'커스텀 목소리' if speaker_embedding is not None else '기본 목소리'}")
-        
-        # 컨디셔닝 설정 - 음질 개선 및 목소리 적용
-        improved_emotion = tts_settings.get("emotion", [0.7, 0.05, 0.05, 0.05, 0.1, 0.05, 0.3, 0.15])
-        cond_dict = make_cond_dict(
-            text=text,
-            language=language,
-            speaker=speaker_embedding,  # 🔥 목소리 임베딩 적용!
-            emotion=improved_emotion,
-            fmax=tts_settings.get("fmax", 24000.0),
-            pitch_std=tts_settings.get("pitch_std", 30.0),
-            speaking_rate=tts_settings.get("speaking_rate", 20.0),
-            vqscore_8=tts_settings.get("vqscore_8", [0.9] * 8),
-            dnsmos_ovrl=tts_settings.get("dnsmos_ovrl", 4.5),
-            device=device,
-            unconditional_keys={"vqscore_8", "dnsmos_ovrl"}
-        )
-        
-        conditioning = model.prepare_conditioning(cond_dict)
-        logger.info(f"🎛️ Conditioning prepared for language: {language}")
-        
-        # 오디오 생성 시작 알림
-        await conversation_manager.safe_send_json(client_id, {
-            "event": "tts_progress",
-            "progress": 50,
-            "message": "음성 생성 중..."
-        })
-        
-        # 🔥 오디오 생성 - 파라미터 최적화
-        generation_start = time.time()
-        # 텍스트 길이 기준으로 토큰 수 계산 (한글자당 약 80-120 토큰)
-        text_length = len(text.strip())
-        min_tokens_per_char = 80
-        max_tokens_per_char = 120
-        estimated_tokens = text_length * min_tokens_per_char
-        max_new_tokens = min(86 * 30, max(estimated_tokens, text_length * max_tokens_per_char))
-        
-        logger.info(f"🎯 토큰 계산: 텍스트 길이={text_length}, 예상 토큰={estimated_tokens}, max_new_tokens={max_new_tokens}")
-        
-        cfg_scale = tts_settings.get("cfg_scale", 1.5)  # CFG 스케일 더 낮춤
-        
-        codes = model.generate(
-            prefix_conditioning=conditioning,
-            audio_prefix_codes=None,
-            max_new_tokens=max_new_tokens,
-            cfg_scale=cfg_scale,
-            batch_size=1,
-            sampling_params=dict(
-                min_p=0.05,
-                temperature=0.85,
-                top_k=40
-            ),
-            progress_bar=False,
-            disable_torch_compile=True,
-        )
-        
-        generation_time = time.time() - generation_start
-        logger.info(f"✅ Audio codes generated in {generation_time:.2f}s: {codes.shape}")
-        
-        # 오디오 디코딩
-        decode_start = time.time()
-        wav_out = model.autoencoder.decode(codes).cpu().detach()
-        if wav_out.dim() == 2 and wav_out.size(0) > 1:
-            wav_out = wav_out[0:1, :]
-        
-        audio_data = wav_out.squeeze().numpy()
-        decode_time = time.time() - decode_start
-        
-        total_time = generation_time + decode_time
-        audio_duration = len(audio_data) / model.autoencoder.sampling_rate
-        rtf = total_time / audio_duration if audio_duration > 0 else 0
-        
-        logger.info(f"🎶 오디오 디코딩 완료: {audio_data.shape}, 지속시간: {audio_duration:.2f}s, RTF: {rtf:.2f}")
-        
-        # 🔥 오디오 품질 개선 처리 및 디버깅 강화
-        max_val = np.abs(audio_data).max()
-        logger.info(f"🔍 원본 오디오 데이터 분석: max={max_val:.6f}, 길이={len(audio_data)}, 샘플 미리보기={audio_data[:10]}")
-        
-        if max_val > 0:
-            # 더 부드러운 정규화
-            audio_data = audio_data / max_val
-            audio_data = np.tanh(audio_data * 0.9) * 0.8  # soft limiting
-            audio_data = audio_data - np.mean(audio_data)  # DC 제거
-            logger.info(f"🎛️ 정규화 후 오디오: max={np.abs(audio_data).max():.6f}, mean={np.mean(audio_data):.6f}")
-        else:
-            logger.warning(f"⚠️ 오디오 데이터가 무음입니다! max_val={max_val}")
-            # 무음 데이터인 경우 작은 테스트 톤을 생성
-            logger.info("🎵 테스트 톤 생성 중...")
+        while True:
+            text = await sentences.get()
+            if text is None:
+                break
+            if not text.strip():
+                continue
+            
+            # 연결 상태 확인
+            if not conversation_manager.is_connected(client_id):
+                logger.warning(f"⚠️ 클라이언트 {client_id} 연결 끊어짐 - TTS 처리 중단")
+                return
+            
+            logger.info(f"🎵 TTS 생성 시작 (client {client_id}, 문장 {len(spoken) + 1}): '{text[:50]}...'")
+            
+            if model is None:
+                # 모델 선택
+                requested_model = tts_settings.get("model") or state.get("preferred_model")
+                # 🔥 모든 모드에서 동일한 모델 사용
+                model_choice = get_best_model_for_task(requested_model, "general")
+                
+                logger.info(f"🎯 TTS 모델 선택: {model_choice} (모드: {performance_mode})")
+                
+                # TTS 시작 알림
+                await conversation_manager.safe_send_json(client_id, {
+                    "event": "tts_progress",
+                    "progress": 10,
+                    "message": f"TTS 모델 로딩... ({model_choice})",
+                    "model": model_choice
+                })
+                
+                # 모델 로드
+                model = model_cache.load_model_if_needed(model_choice)
+                logger.info(f"✅ Model loaded successfully: {model_choice}")
+                
+                # 🎤 목소리 설정 처리 (공유 목소리 관리자 - 임베딩 캐시 재사용)
+                speaker_embedding = await voice_manager.process_voice_request(tts_settings, model)
+                
+                logger.info(f"🎤 목소리 처리 결과: {'커스텀 목소리' if speaker_embedding is not None else '기본 목소리'}")
+                
+                # 오디오 생성 시작 알림
+                await conversation_manager.safe_send_json(client_id, {
+                    "event": "tts_progress",
+                    "progress": 50,
+                    "message": "음성 생성 중..."
+                })
+            
+            # 🔥 오디오 생성 (executor에서 - 생성 중에도 LLM 토큰 수신/전송이 계속되도록)
+            # 다른 경로와 같은 동시 생성 제한(tts_admission)을 거침
+            def generate():
+                return asyncio.get_event_loop().run_in_executor(
+                    executor, _synthesize_sentence, model, text, tts_settings, language, speaker_embedding
+                )
+            if tts_admission is not None:
+                audio_data, generation_time = await tts_admission.run(generate, priority=PRIORITY_INTERACTIVE)
+            else:
+                audio_data, generation_time = await generate()
+            
             sr_out = model.autoencoder.sampling_rate
-            duration = 0.5  # 0.5초
-            t = np.linspace(0, duration, int(sr_out * duration))
-            audio_data = 0.1 * np.sin(2 * np.pi * 440 * t)  # 440Hz 테스트 톤
-            logger.info(f"🎵 테스트 톤 생성됨: max={np.abs(audio_data).max():.6f}, 길이={len(audio_data)}")
-        
-        # PCM 16-bit 변환
-        audio_int16 = np.clip(audio_data * 32767, -32768, 32767).astype('int16')
-        logger.info(f"📊 PCM 16-bit 변환: max={np.abs(audio_int16).max()}, 샘플 미리보기={audio_int16[:10]}")
-        
-        # 🔥 JSON 방식으로 간단히 전송 - 디버깅 강화
-        import base64
-        audio_bytes = audio_int16.tobytes()
-        logger.info(f"📊 오디오 바이트 배열 생성: 길이={len(audio_bytes)}, 처음 20바이트={audio_bytes[:20]}")
-        
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        logger.info(f"📦 Base64 인코딩 완료: 길이={len(audio_base64)}, 처음 50문자={audio_base64[:50]}...")
-        
-        # TTS 시작 신호 먼저 전송
-        sr_out = model.autoencoder.sampling_rate
-        if not await conversation_manager.safe_send_json(client_id, {
-            "event": "tts_started",
-            "sr": int(sr_out),
-            "dtype": "int16",
-            "text": text,
-            "model": model_choice
-        }):
-            return
-        
-        logger.info(f"📡 오디오 데이터 전송 시작: {len(audio_bytes)} bytes")
-        
-        # 오디오 데이터 전송
-        audio_message = {
-            "event": "audio_data_complete",
-            "audio_data": audio_base64,
-            "sample_rate": int(sr_out),
-            "duration": audio_duration,
-            "rtf": rtf,
-            "generation_time": total_time,
-            "model": model_choice,
-            "format": "pcm_int16_base64"
-        }
+            duration = len(audio_data) / sr_out
+            rtf = generation_time / duration if duration > 0 else 0
+            generation_total += generation_time
+            audio_duration += duration
+            
+            # 🔥 바이너리 프레임 변환 (PCM16은 하나의 버퍼에서 memoryview로 잘라 전송, Opus는 프레임마다 인코딩)
+            stream_id, total_chunks, audio_format, frames = prepare_audio_frames(
+                client_id, audio_data, sr_out, int(sr_out * CONVERSATION_FRAME_MS / 1000)
+            )
+            
+            # 문장 시작 신호 먼저 전송
+            if not await conversation_manager.safe_send_json(client_id, {
+                "event": "tts_sentence_started" if spoken else "tts_started",
+                "stream_id": stream_id,
+                **audio_format,
+                "sr": int(sr_out),
+                "dtype": "int16",
+                "text": text,
+                "sentence_index": len(spoken),
+                "model": model_choice,
+                "duration": duration,
+                "rtf": rtf,
+                "generation_time": generation_time,
+                "total_chunks": total_chunks
+            }):
+                return
+            
+            logger.info(f"📡 오디오 데이터 전송 시작: {len(audio_data)} samples, {total_chunks} 프레임 ({audio_format['format']})")
+            
+            async for frame in frames:
+                if not await conversation_manager.send_frame(client_id, frame):
+                    logger.warning(f"⚠️ 오디오 데이터 전송 실패")
+                    return
+            
+            spoken.append(text)
+            audio_parts.append(audio_data)
         
-        # 연결 상태 재확인 후 전송
-        if not conversation_manager.is_connected(client_id):
-            logger.warning(f"⚠️ 클라이언트 {client_id} 연결 끊어짐 - 오디오 전송 중단")
+        if not spoken:
+            logger.warning(f"⚠️ Empty text for TTS generation for client {client_id}")
             return
         
-        if not await conversation_manager.safe_send_json(client_id, audio_message):
-            logger.warning(f"⚠️ 오디오 데이터 전송 실패")
-            return
+        text = " ".join(spoken)
+        rtf = generation_total / audio_duration if audio_duration > 0 else 0
         
         # 성능 통계 업데이트
         tts_time = time.time() - start_time
@@ -797,34 +939,48 @@ async def generate_tts_response(websocket: WebSocket, client_id: str, text: str)
             stats["avg_tts_time"] = (stats["avg_tts_time"] * stats["total_requests"] + tts_time) / (stats["total_requests"] + 1)
             stats["total_requests"] += 1
         
+        # 🔗 다시 듣기/기록용으로 응답 전체 오디오를 내용 해시로 저장
+        audio_url = None
+        if artifact_store is not None:
+            try:
+                key = await asyncio.get_event_loop().run_in_executor(
+                    None, artifact_store.put_wav, np.concatenate(audio_parts), sr_out
+                )
+                audio_url = artifact_store.url(key)
+            except Exception as e:
+                logger.warning(f"⚠️ 오디오 보관 실패 (무시): {e}")
+        
         # 완료 신호
         await conversation_manager.safe_send_json(client_id, {
             "event": "tts_completed",
             "processing_time": tts_time,
             "model": model_choice,
             "device": str(device),
+            "sentences": len(spoken),
+            "audio_url": audio_url,
             "performance": "🚀 실시간" if tts_time < 1.0 else "⚠️ 느림"
         })
         
-        logger.info(f"✅ TTS generation completed for client {client_id} in {tts_time:.2f}s")
+        logger.info(f"✅ TTS generation completed for client {client_id} in {tts_time:.2f}s ({len(spoken)}문장)")
         
-        # Firebase에 TTS 로그
+        # Firebase에 TTS 로그 (오디오는 URL로만 참조)
         try:
-            await log_assistant_message(
-                client_id,
-                text,
-                metadata={
-                    "type": "tts_audio",
-                    "model": model_choice,
-                    "language": language,
-                    "tts_params": tts_settings,
-                    "tts_time": tts_time,
-                    "device": str(device),
-                    "performance_mode": performance_mode,
-                    "rtf": rtf,
-                    "audio_duration": audio_duration
-                }
-            )
+            tts_metadata = {
+                "type": "tts_audio",
+                "model": model_choice,
+                "language": language,
+                "tts_params": _loggable_tts_params(tts_settings),
+                "tts_time": tts_time,
+                "device": str(device),
+                "performance_mode": performance_mode,
+                "rtf": rtf,
+                "audio_duration": audio_duration,
+                "sample_rate": int(sr_out)
+            }
+            if audio_url and log_audio_generation is not None:
+                await log_audio_generation(client_id, text, audio_url, tts_metadata)
+            else:
+                await log_assistant_message(client_id, text, metadata=tts_metadata)
         except Exception as e:
             logger.warning(f"⚠️ Firebase 로깅 실패 (무시): {e}")
         
@@ -832,6 +988,102 @@ async def generate_tts_response(websocket: WebSocket, client_id: str, text: str)
         logger.error(f"❌ TTS generation error for client {client_id}: {e}")
         await conversation_manager.safe_send_json(client_id, {"error": f"TTS generation failed: {str(e)}"})
 
+def _synthesize_sentence(
+    model: Zonos, text: str, tts_settings: Dict[str, Any], language: str, speaker_embedding
+) -> Tuple[np.ndarray, float]:
+    """문장 하나 합성 -> (정규화된 오디오, 생성+디코딩 시간) - executor 스레드에서 실행"""
+    # 컨디셔닝 설정 - 음질 개선 및 목소리 적용
+    improved_emotion = tts_settings.get("emotion", [0.7, 0.05, 0.05, 0.05, 0.1, 0.05, 0.3, 0.15])
+    cond_dict = make_cond_dict(
+        text=text,
+        language=language,
+        speaker=speaker_embedding,  # 🔥 목소리 임베딩 적용!
+        emotion=improved_emotion,
+        fmax=tts_settings.get("fmax", 24000.0),
+        pitch_std=tts_settings.get("pitch_std", 30.0),
+        speaking_rate=tts_settings.get("speaking_rate", 20.0),
+        vqscore_8=tts_settings.get("vqscore_8", [0.9] * 8),
+        dnsmos_ovrl=tts_settings.get("dnsmos_ovrl", 4.5),
+        device=device,
+        unconditional_keys={"vqscore_8", "dnsmos_ovrl"}
+    )
+    
+    conditioning = model.prepare_conditioning(cond_dict)
+    logger.info(f"🎛️ Conditioning prepared for language: {language}")
+    
+    # 🔥 오디오 생성 - 파라미터 최적화
+    generation_start = time.time()
+    # 텍스트 길이 기준으로 토큰 수 계산 (한글자당 약 80-120 토큰)
+    text_length = len(text.strip())
+    min_tokens_per_char = 80
+    max_tokens_per_char = 120
+    estimated_tokens = text_length * min_tokens_per_char
+    max_new_tokens = min(86 * 30, max(estimated_tokens, text_length * max_tokens_per_char))
+    
+    logger.info(f"🎯 토큰 계산: 텍스트 길이={text_length}, 예상 토큰={estimated_tokens}, max_new_tokens={max_new_tokens}")
+    
+    cfg_scale = tts_settings.get("cfg_scale", 1.5)  # CFG 스케일 더 낮춤
+    
+    codes = model.generate(
+        prefix_conditioning=conditioning,
+        audio_prefix_codes=None,
+        max_new_tokens=max_new_tokens,
+        cfg_scale=cfg_scale,
+        batch_size=1,
+        sampling_params=dict(
+            min_p=0.05,
+            temperature=0.85,
+            top_k=40
+        ),
+        progress_bar=False,
+        disable_torch_compile=True,
+    )
+    
+    generation_time = time.time() - generation_start
+    logger.info(f"✅ Audio codes generated in {generation_time:.2f}s: {codes.shape}")
+    
+    # 오디오 디코딩
+    decode_start = time.time()
+    wav_out = model.autoencoder.decode(codes).cpu().detach()
+    if wav_out.dim() == 2 and wav_out.size(0) > 1:
+        wav_out = wav_out[0:1, :]
+    
+    audio_data = wav_out.squeeze().numpy()
+    decode_time = time.time() - decode_start
+    
+    logger.info(f"🎶 오디오 디코딩 완료: {audio_data.shape}, 지속시간: {len(audio_data) / model.autoencoder.sampling_rate:.2f}s")
+    
+    # 🔥 오디오 품질 개선 처리 및 디버깅 강화
+    max_val = np.abs(audio_data).max()
+    logger.info(f"🔍 원본 오디오 데이터 분석: max={max_val:.6f}, 길이={len(audio_data)}, 샘플 미리보기={audio_data[:10]}")
+    
+    if max_val > 0:
+        # 더 부드러운 정규화
+        audio_data = audio_data / max_val
+        audio_data = np.tanh(audio_data * 0.9) * 0.8  # soft limiting
+        audio_data = audio_data - np.mean(audio_data)  # DC 제거
+        logger.info(f"🎛️ 정규화 후 오디오: max={np.abs(audio_data).max():.6f}, mean={np.mean(audio_data):.6f}")
+    else:
+        logger.warning(f"⚠️ 오디오 데이터가 무음입니다! max_val={max_val}")
+        # 무음 데이터인 경우 작은 테스트 톤을 생성
+        logger.info("🎵 테스트 톤 생성 중...")
+        sr_out = model.autoencoder.sampling_rate
+        duration = 0.5  # 0.5초
+        t = np.linspace(0, duration, int(sr_out * duration))
+        audio_data = 0.1 * np.sin(2 * np.pi * 440 * t)  # 440Hz 테스트 톤
+        logger.info(f"🎵 테스트 톤 생성됨: max={np.abs(audio_data).max():.6f}, 길이={len(audio_data)}")
+    
+    return audio_data, generation_time + decode_time
+
+
+def _loggable_tts_params(tts_settings: Dict[str, Any]) -> Dict[str, Any]:
+    """로그용 TTS 설정 (업로드한 목소리 오디오는 본문 대신 해시만 남김)"""
+    params = dict(tts_settings)
+    voice_audio = params.pop("voice_audio_base64", None)
+    if voice_audio:
+        params["voice_audio_md5"] = hashlib.md5(voice_audio.encode()).hexdigest()
+    return params
+
 
 async def stream_conversation_audio(
     client_id: str,
@@ -911,77 +1163,37 @@ async def stream_conversation_audio(
         if max_val > 0:
             audio_data = audio_data / max_val * 0.8  # 80%로 제한하여 클리핑 방지
         
-        # 🔥 청크 단위로 전송 - 더 큰 청크로 안정성 향상
+        # 🔥 청크 단위로 전송 - 바이너리 프레임 (헤더에 stream_id/seq/샘플레이트, 별도 메타데이터 JSON 없음)
         sr = model.autoencoder.sampling_rate
-        chunk_duration = 0.3  # 🔥 0.3초로 청크 크기 증가 (안정성 향상)
-        chunk_size = int(sr * chunk_duration)
-        total_chunks = (len(audio_data) + chunk_size - 1) // chunk_size
+        chunk_size = int(sr * CONVERSATION_FRAME_MS / 1000)
+        stream_id, total_chunks, audio_format, frames = prepare_audio_frames(client_id, audio_data, sr, chunk_size)
         
         logger.info(f"📡 스트리밍 시작: {total_chunks} 청크 (청크 크기: {chunk_size})")
         
-        # 🔥 스트리밍 시작 메시지에 고유 ID 추가
-        stream_id = f"stream_{client_id}_{int(time.time() * 1000)}"
         await conversation_manager.safe_send_json(client_id, {
             "event": "audio_stream_start",
             "stream_id": stream_id,
+            **audio_format,
             "total_chunks": total_chunks,
             "sample_rate": int(sr),
             "model": model_name,
             "rtf": rtf
         })
         
-        for i in range(0, len(audio_data), chunk_size):
-            chunk = audio_data[i:i + chunk_size]
-            chunk_index = i // chunk_size
-            
-            # PCM 16-bit 변환
-            chunk_int16 = (chunk * 32767).astype('int16')
-            
-            # 🔥 바이너리 데이터로 전송 (JSON 비효율성 해결)
-            # 메타데이터 먼저 전송
-            metadata = {
-                "event": "audio_chunk_meta",
-                "stream_id": stream_id,
-                "chunk_index": chunk_index,
-                "total_chunks": total_chunks,
-                "sample_rate": int(sr),
-                "chunk_size": len(chunk_int16),
-                "model": model_name,
-                "rtf": rtf,
-                "is_final_chunk": chunk_index == total_chunks - 1
-            }
-            
+        sent_chunks = 0
+        async for frame in frames:
             # 연결 상태 확인 후 전송
             if not conversation_manager.is_connected(client_id):
                 logger.warning(f"⚠️ 클라이언트 {client_id} 연결 끊어짐 - 오디오 스트리밍 중단")
                 break
             
-            # 메타데이터 전송
-            if not await conversation_manager.safe_send_json(client_id, metadata):
-                logger.warning(f"⚠️ 오디오 메타데이터 전송 실패 - 스트리밍 중단")
-                break
-                
-            # 🔥 바이너리 오디오 데이터 전송 (효율적) - 디버깅 강화
-            try:
-                chunk_bytes = chunk_int16.tobytes()
-                logger.debug(f"📤 바이너리 오디오 청크 전솤: {len(chunk_bytes)} bytes, 청크 {chunk_index + 1}/{total_chunks}")
-                await websocket.send_bytes(chunk_bytes)
-                logger.debug(f"✅ 바이너리 오디오 청크 전송 성공: {chunk_index + 1}/{total_chunks}")
-            except Exception as e:
-                logger.warning(f"⚠️ 오디오 바이너리 전송 실패: {e}")
+            # 🔥 바이너리 프레임 전송 (헤더 + PCM) - 고정 지연 대신 클라이언트 재생 위치에 맞춰 대기
+            if not await conversation_manager.send_frame(client_id, frame):
+                logger.warning(f"⚠️ 오디오 바이너리 전송 실패 - 스트리밍 중단")
                 break
             
-            logger.debug(f"📤 청크 전송 {chunk_index + 1}/{total_chunks}")
-            
-            # 🔥 적응형 지연 개선 - RTF 기반
-            if rtf < 0.3:
-                delay = 0.02  # 매우 빠름
-            elif rtf < 0.7:
-                delay = 0.05  # 빠름
-            else:
-                delay = 0.1   # 일반
-            
-            await asyncio.sleep(delay)
+            sent_chunks += 1
+            logger.debug(f"📤 청크 전송 {sent_chunks}/{total_chunks}")
         
         # 🔥 스트리밍 완료 메시지
         await conversation_manager.safe_send_json(client_id, {
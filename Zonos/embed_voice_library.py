@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+목소리 라이브러리 일괄 임베딩 도구
+
+디렉토리의 참조 음성들을 워커 풀에서 디코딩하고, 같은 길이로 자른 클립을
+배치 단위로 SpeakerEmbeddingLDA에 통과시켜 스피커 임베딩 저장소에 한 번에 기록합니다.
+
+사용 예:
+    python embed_voice_library.py assets/voices --recursive --workers 8 --batch-size 16
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import torch
+import torchaudio
+
+from voice_manager import SpeakerEmbeddingStore, iter_voice_files
+from zonos.speaker_cloning import SpeakerEmbeddingLDA, select_voiced_segment
+
+TARGET_SAMPLE_RATE = 16_000
+
+
+def find_audio_files(voice_dir: str, include_user: bool) -> Dict[str, Path]:
+    """voice_id -> 파일 경로 (VoiceManager와 같은 디렉토리/ID 규칙: voice_dir 최상위 + user/ 업로드)
+
+    같은 voice_id가 두 파일에서 나오면 어느 쪽 임베딩인지 모호하므로 중단합니다.
+    """
+    directories = [voice_dir]
+    user_dir = os.path.join(voice_dir, "user")
+    if include_user and os.path.isdir(user_dir):
+        directories.append(user_dir)
+
+    files: Dict[str, Path] = {}
+    for directory in directories:
+        for voice_id, path in iter_voice_files(directory):
+            if voice_id in files:
+                raise SystemExit(f"❌ 중복된 voice_id '{voice_id}': {files[voice_id]} / {path}")
+            files[voice_id] = Path(path)
+    return files
+
+
+def decode_voice(path: Path, max_seconds: float) -> Optional[torch.Tensor]:
+    """오디오 디코딩 -> 모노 -> 유성음 구간 선택 -> 16kHz 리샘플링"""
+    try:
+        wav, sr = torchaudio.load(str(path))
+    except Exception as e:
+        print(f"⚠️ 디코딩 실패: {path} ({e})")
+        return None
+    wav = wav.mean(0)
+    wav = select_voiced_segment(wav, sr, max_seconds)
+    return torchaudio.functional.resample(wav, sr, TARGET_SAMPLE_RATE)
+
+
+def bucket_length(num_samples: int) -> int:
+    """같은 길이끼리 배치되도록 1초 단위로 내림 (최소 1초)"""
+    return max(1, num_samples // TARGET_SAMPLE_RATE) * TARGET_SAMPLE_RATE
+
+
+class ThroughputReporter:
+    """진행률 및 처리량 출력"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.audio_seconds = 0.0
+        self.start_time = time.time()
+
+    def update(self, count: int, audio_seconds: float):
+        self.done += count
+        self.audio_seconds += audio_seconds
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        print(
+            f"📊 [{self.done}/{self.total}] "
+            f"{self.done / elapsed:.1f} files/s, "
+            f"{self.audio_seconds / elapsed:.1f} audio-s/s, "
+            f"경과 {elapsed:.1f}s"
+        )
+
+
+@torch.inference_mode()
+def embed_batch(model: SpeakerEmbeddingLDA, batch: List[Tuple[str, torch.Tensor]]) -> Dict[str, torch.Tensor]:
+    """같은 길이의 클립들을 한 번의 forward로 임베딩"""
+    voice_ids = [voice_id for voice_id, _ in batch]
+    wavs = torch.stack([wav for _, wav in batch]).to(model.device)
+    _, lda_embeddings = model.forward_batch(wavs)
+    return dict(zip(voice_ids, lda_embeddings.bfloat16().float().cpu()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목소리 라이브러리 스피커 임베딩 일괄 생성")
+    parser.add_argument("voice_dir", nargs="?", default="assets/voices", help="참조 음성 디렉토리")
+    parser.add_argument("--recursive", action="store_true", help="사용자 업로드 목소리(user/)까지 포함")
+    parser.add_argument("--store", default=os.getenv("SPEAKER_EMBEDDING_STORE", "cache/voices/speaker_embeddings.npz"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="디코딩 워커 수")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-seconds", type=float, default=float(os.getenv("SPEAKER_EMBEDDING_MAX_SECONDS", "20")))
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--model-dir", default=os.getenv("SPEAKER_MODEL_DIR") or None,
+                        help="로컬 스피커 모델 디렉토리 (ResNet293_SimAM_ASP_base.pt, ResNet293_SimAM_ASP_base_LDA-128.pt)")
+    parser.add_argument("--force", action="store_true", help="이미 저장된 목소리도 다시 계산")
+    args = parser.parse_args()
+
+    store = SpeakerEmbeddingStore(args.store)
+    files = find_audio_files(args.voice_dir, args.recursive)
+    if not args.force:
+        files = {voice_id: path for voice_id, path in files.items() if voice_id not in store}
+
+    if not files:
+        print("✅ 새로 임베딩할 목소리가 없습니다")
+        return
+
+    print(f"🎤 {len(files)}개 목소리 임베딩 시작 (workers={args.workers}, batch={args.batch_size}, device={args.device})")
+    model = SpeakerEmbeddingLDA(device=args.device, model_dir=args.model_dir)
+    reporter = ThroughputReporter(len(files))
+
+    buckets: Dict[int, List[Tuple[str, torch.Tensor]]] = {}
+    results: Dict[str, torch.Tensor] = {}
+
+    def flush(length: int):
+        batch = buckets.pop(length)
+        results.update(embed_batch(model, batch))
+        reporter.update(len(batch), len(batch) * length / TARGET_SAMPLE_RATE)
+
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="voice-decode-") as executor:
+        futures = {executor.submit(decode_voice, path, args.max_seconds): voice_id for voice_id, path in files.items()}
+        for future in as_completed(futures):
+            wav = future.result()
+            if wav is None or wav.numel() == 0:
+                reporter.update(1, 0.0)
+                continue
+            length = bucket_length(wav.shape[-1])
+            if wav.shape[-1] < length:
+                wav = torch.nn.functional.pad(wav, (0, length - wav.shape[-1]))
+            buckets.setdefault(length, []).append((futures[future], wav[:length]))
+            if len(buckets[length]) >= args.batch_size:
+                flush(length)
+
+    for length in list(buckets):
+        flush(length)
+
+    store.update({voice_id: embedding.numpy() for voice_id, embedding in results.items()})
+    store.save()
+    print(f"💾 {len(results)}개 임베딩 저장 완료: {store.path} (총 {len(store)}개)")
+
+
+if __name__ == "__main__":
+    main()
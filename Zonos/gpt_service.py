@@ -1,6 +1,7 @@
 import asyncio
+import json
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from dataclasses import dataclass
 
 import httpx
@@ -62,6 +63,19 @@ class GPTService:
         if session_id in self.conversation_history:
             del self.conversation_history[session_id]
     
+    def _prepare_messages(self, session_id: str, user_message: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """사용자 메시지를 기록에 추가하고 API 요청용 메시지 목록 반환"""
+        # 시스템 프롬프트 설정 (세션 시작 시에만)
+        if not self.get_conversation_history(session_id) and system_prompt:
+            self.add_to_history(session_id, ChatMessage(role="system", content=system_prompt))
+        
+        # 사용자 메시지 추가 (기록 정리가 반영된 목록으로 요청)
+        self.add_to_history(session_id, ChatMessage(role="user", content=user_message))
+        return [
+            {"role": msg.role, "content": msg.content}
+            for msg in self.get_conversation_history(session_id)
+        ]
+    
     async def chat_completion(
         self, 
         session_id: str,
@@ -74,24 +88,7 @@ class GPTService:
         """채팅 완성 요청"""
         
         try:
-            # 대화 기록 가져오기
-            history = self.get_conversation_history(session_id)
-            
-            # 시스템 프롬프트 설정 (세션 시작 시에만)
-            if not history and system_prompt:
-                system_msg = ChatMessage(role="system", content=system_prompt)
-                self.add_to_history(session_id, system_msg)
-                history = [system_msg]
-            
-            # 사용자 메시지 추가
-            user_msg = ChatMessage(role="user", content=user_message)
-            self.add_to_history(session_id, user_msg)
-            
-            # API 요청용 메시지 목록 생성
-            messages = [
-                {"role": msg.role, "content": msg.content} 
-                for msg in history + [user_msg]
-            ]
+            messages = self._prepare_messages(session_id, user_message, system_prompt)
             
             # DeepSeek API 호출
             request_data = {
@@ -132,6 +129,67 @@ class GPTService:
             logger.error(f"GPT API 호출 오류: {e}")
             raise ValueError(f"GPT 서비스 오류: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        session_id: str,
+        user_message: str,
+        system_prompt: Optional[str] = None,
+        model: str = "deepseek-chat",
+        max_tokens: int = 200,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """스트리밍 채팅 완성 (SSE) - 생성되는 텍스트 조각을 도착하는 대로 yield
+        
+        끝까지 받으면 전체 응답을 기록에 추가합니다. 중간에 소비를 멈추면(끼어들기 등)
+        그때까지 받은 부분만 기록합니다.
+        """
+        messages = self._prepare_messages(session_id, user_message, system_prompt)
+        request_data = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        
+        logger.info(f"GPT API 스트리밍 요청: {len(messages)}개 메시지")
+        
+        parts: List[str] = []
+        try:
+            async with self.client.stream("POST", "/chat/completions", json=request_data) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    # SSE: "data: {...}" 줄만 처리 (빈 줄, ": keep-alive" 주석 무시)
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    
+                    choices = json.loads(payload).get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            
+            logger.info(f"GPT 스트리밍 응답 완료: {sum(len(part) for part in parts)}자")
+        
+        except httpx.HTTPStatusError as e:
+            logger.error(f"GPT API HTTP 오류: {e.response.status_code} - {e.response.text}")
+            raise ValueError(f"GPT API 오류: {e.response.status_code}")
+        except httpx.TimeoutException:
+            logger.error("GPT API 타임아웃")
+            raise ValueError("GPT API 응답 시간 초과")
+        except Exception as e:
+            logger.error(f"GPT API 호출 오류: {e}")
+            raise ValueError(f"GPT 서비스 오류: {str(e)}")
+        finally:
+            if parts:
+                self.add_to_history(session_id, ChatMessage(role="assistant", content="".join(parts)))
+
 # 글로벌 GPT 서비스 인스턴스
 gpt_service: Optional[GPTService] = None
 
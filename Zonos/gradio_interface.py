@@ -11,6 +11,7 @@ from os import getenv
 
 from zonos.model import Zonos, DEFAULT_BACKBONE_CLS as ZonosBackbone
 from zonos.conditioning import make_cond_dict, supported_language_codes
+from zonos.speaker_cloning import SpeakerEmbeddingLDA
 from zonos.utils import DEFAULT_DEVICE as device
 
 CURRENT_MODEL_TYPE = None
@@ -18,6 +19,7 @@ CURRENT_MODEL = None
 
 SPEAKER_EMBEDDING = None
 SPEAKER_AUDIO_PATH = None
+SPEAKER_MODEL = None
 
 
 def load_model_if_needed(model_choice: str):
@@ -34,6 +36,14 @@ def load_model_if_needed(model_choice: str):
     return CURRENT_MODEL
 
 
+def load_speaker_model():
+    """Speaker encoder, read from SPEAKER_MODEL_DIR when set (no Hub download)."""
+    global SPEAKER_MODEL
+    if SPEAKER_MODEL is None:
+        SPEAKER_MODEL = SpeakerEmbeddingLDA(device=device, model_dir=getenv("SPEAKER_MODEL_DIR") or None)
+    return SPEAKER_MODEL
+
+
 def update_ui(model_choice):
     """
     Dynamically show/hide UI elements based on the model's conditioners.
@@ -152,7 +162,7 @@ def generate_audio(
         if speaker_audio != SPEAKER_AUDIO_PATH:
             print("Recomputed speaker embedding")
             wav, sr = torchaudio.load(speaker_audio)
-            SPEAKER_EMBEDDING = selected_model.make_speaker_embedding(wav, sr)
+            SPEAKER_EMBEDDING = selected_model.make_speaker_embedding(wav, sr, spk_model=load_speaker_model())
             SPEAKER_EMBEDDING = SPEAKER_EMBEDDING.to(device, dtype=torch.bfloat16)
             SPEAKER_AUDIO_PATH = speaker_audio
 
@@ -1,16 +1,22 @@
 import os
 import asyncio
 import json
+import hashlib
 import logging
 import time
-from typing import Dict, Optional, Any, List
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 # 기존 import들 아래에 추가
-from tts_speed_optimization import AdvancedTTSCache, ParallelTTSProcessor, ModelWarmupManager, GPUOptimizer
+from tts_speed_optimization import (
+    AdvancedTTSCache, ParallelTTSProcessor, ModelWarmupManager, GPUOptimizer,
+    BatchTTSGenerator, SingleFlight, GenerationAdmission, AdmissionRejected, PRIORITY_BATCH, normalize_cache_text
+)
+from tts_jobs import TTSJobManager
+from audio_artifacts import AudioArtifactStore, add_artifact_routes
 import numpy as np
 
 import torch
-import torchaudio
 import uvicorn
 
 # 🔧 PyTorch 컴파일 완전 비활성화 (비호환성 문제 해결)
@@ -28,9 +34,9 @@ except ImportError:
 # PyTorch 컴파일 완전 비활성화 환경변수 설정
 os.environ["PYTORCH_DISABLE_DYNAMO_COMPILATION"] = "1"
 os.environ["TORCH_COMPILE_DISABLE"] = "1"
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, File, UploadFile
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, File, UploadFile, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from huggingface_hub import login, HfApi
@@ -97,7 +103,7 @@ def setup_device():
 # Zonos 모델 import
 from zonos.model import Zonos
 from zonos.backbone import BACKBONES
-from zonos.conditioning import make_cond_dict, supported_language_codes
+from zonos.conditioning import make_cond_dict, supported_language_codes, phonemize
 
 # STT 서비스 import
 from stt_service import add_stt_routes, get_stt_service
@@ -111,14 +117,25 @@ from firebase_service import (
     initialize_firebase_service, 
     log_user_message, 
     log_assistant_message, 
-    log_system_message
+    log_system_message,
+    log_audio_generation
 )
 
 # 대화형 WebSocket import
 from conversation_websocket import set_dependencies, add_conversation_routes
 
 # 목소리 관리 시스템 import
-from voice_manager import VoiceManager, EmotionManager
+from voice_manager import VoiceManager, EmotionManager, FillerAudioBank
+from audio_framing import (
+    FLAG_OPUS, FLAG_START, OPUS_PACKET_MS, PlaybackPacer, encode_packet_frame, iter_packet_groups, pack_packets,
+    unpack_packets
+)
+from audio_codec import (
+    OPUS_AVAILABLE, OPUS_SAMPLE_RATE, OggOpusWriter, OpusStreamEncoder, encode_opus, opus_executor, select_bitrate,
+    wav_stream_header
+)
+from audio_resample import StreamingResampler, resample, resolve_output_rate
+from outbound_queue import PRIORITY_CONTROL, PRIORITY_STREAM, OutboundQueue
 
 # eSpeak 환경 설정
 espeak_path = os.getenv("ESPEAK_NG_PATH", r"C:\Program Files\eSpeak NG")
@@ -201,8 +218,6 @@ class EnhancedModelCache:
     def __init__(self):
         self.models: Dict[str, Zonos] = {}
         self.current_model_type: Optional[str] = None
-        self.speaker_embedding: Optional[torch.Tensor] = None
-        self.speaker_audio_path: Optional[str] = None
         self.loading_progress: Dict[str, float] = {}
         self.loading_status: Dict[str, str] = {}
         self.supported_models = get_supported_models()
@@ -389,21 +404,6 @@ class EnhancedModelCache:
         self.current_model_type = validated_model
         return self.models[validated_model]
     
-    def get_speaker_embedding(self, audio_path: str) -> torch.Tensor:
-        """스피커 임베딩 캐시 관리"""
-        if audio_path != self.speaker_audio_path:
-            current_model = self.models.get(self.current_model_type)
-            if current_model is None:
-                raise ValueError("No model loaded")
-                
-            wav, sr = torchaudio.load(audio_path)
-            self.speaker_embedding = current_model.make_speaker_embedding(wav, sr)
-            self.speaker_embedding = self.speaker_embedding.to(device, dtype=torch.bfloat16)
-            self.speaker_audio_path = audio_path
-            logger.info("🎤 Recomputed speaker embedding")
-            
-        return self.speaker_embedding
-    
     async def _warmup_model(self, model_name: str, websocket: "WebSocket" = None):
         """모델 웜업 (비동기)"""
         if model_name in self.warmup_completed:
@@ -443,14 +443,131 @@ voice_manager = VoiceManager(device)
 
 
 # 기존 model_cache 선언 아래에 추가
+def _decode_cached_codes(codes: np.ndarray) -> np.ndarray:
+    """코드 캐시 히트 시 DAC 디코딩 (모든 Zonos 모델이 같은 오토인코더를 사용)"""
+    model = model_cache.models.get(model_cache.current_model_type)
+    if model is None and model_cache.models:
+        model = next(iter(model_cache.models.values()))
+    if model is None:
+        raise RuntimeError("코드 캐시를 디코딩할 모델이 로드되지 않았습니다")
+    codes_tensor = torch.from_numpy(codes.astype(np.int64)).unsqueeze(0).to(device)
+    with torch.no_grad():
+        wav_out = model.autoencoder.decode(codes_tensor).cpu().detach()
+    return wav_out.squeeze().numpy()
+
+@lru_cache(maxsize=8192)
+def _phoneme_cache_key(text: str, language: str) -> str:
+    """음소열 기반 캐시 키 (표기만 다른 문장이 같은 키로 모이도록)"""
+    normalized = normalize_cache_text(text, language)
+    try:
+        return phonemize([normalized], [language])[0]
+    except Exception as e:
+        logger.debug(f"음소 변환 실패, 텍스트 키 사용: {e}")
+        return normalized
+
 tts_cache = AdvancedTTSCache(
     cache_dir=os.getenv("TTS_CACHE_DIR", "cache/tts"),
-    max_cache_size_gb=float(os.getenv("TTS_CACHE_SIZE_GB", "2.0"))
+    key_normalizer=_phoneme_cache_key if os.getenv("TTS_CACHE_PHONEME_KEYS", "true").lower() == "true" else normalize_cache_text,
+    max_cache_size_gb=float(os.getenv("TTS_CACHE_SIZE_GB", "2.0")),
+    cache_mode=os.getenv("TTS_CACHE_MODE", "audio"),
+    decoder=_decode_cached_codes,
+    model_revision=os.getenv("TTS_CACHE_MODEL_REVISION", "descript/dac_44khz"),
+    memory_budget_mb=float(os.getenv("TTS_CACHE_MEMORY_MB", "256")),
+    hot_tier_mb=float(os.getenv("TTS_CACHE_HOT_MB", "32")),
+    segment_size_mb=int(os.getenv("TTS_CACHE_SEGMENT_MB", "256")),
+    compaction_interval=float(os.getenv("TTS_CACHE_COMPACTION_INTERVAL", "60")),
+    write_queue_size=int(os.getenv("TTS_CACHE_WRITE_QUEUE", "256")),
+    fsync_policy=os.getenv("TTS_CACHE_FSYNC", "interval"),
+    fsync_interval=float(os.getenv("TTS_CACHE_FSYNC_INTERVAL", "5")),
+    shared_memory_dir=os.getenv("TTS_CACHE_SHM_DIR") or None,
+    shared_memory_mb=float(os.getenv("TTS_CACHE_SHM_MB", "256")),
+    admission=os.getenv("TTS_CACHE_ADMISSION", "true").lower() == "true"
 )
 parallel_processor = ParallelTTSProcessor(
     max_workers=int(os.getenv("TTS_MAX_WORKERS", "2"))
 )
 warmup_manager = ModelWarmupManager()
+batch_generator = BatchTTSGenerator(
+    max_batch_size=int(os.getenv("TTS_SENTENCE_BATCH", "4"))
+)
+SENTENCE_CACHE_ENABLED = os.getenv("TTS_SENTENCE_CACHE", "true").lower() == "true"
+# 같은 텍스트/목소리/설정의 동시 요청은 한 번만 생성하고 결과를 공유
+tts_singleflight = SingleFlight()
+# 모델 생성 동시 실행 수 제한 (WebSocket/HTTP 공용, 대기열이 가득 차면 거절)
+tts_admission = GenerationAdmission(
+    max_concurrent=int(os.getenv("TTS_MAX_CONCURRENT_GENERATIONS", "2")),
+    max_waiting=int(os.getenv("TTS_MAX_WAITING_GENERATIONS", "16")),
+    max_batch=int(os.getenv("TTS_JOB_MAX_CONCURRENT", "1"))
+)
+
+# 🔗 생성된 대화 오디오를 내용 해시로 보관 (/api/audio/{hash}, 로그에는 URL만 기록)
+AUDIO_ARTIFACTS_ENABLED = os.getenv("AUDIO_ARTIFACTS_ENABLED", "true").lower() == "true"
+artifact_store = AudioArtifactStore() if AUDIO_ARTIFACTS_ENABLED else None
+
+# 💬 목소리별 대기 음성 (GPT+TTS가 오래 걸릴 때 STT 직후 재생)
+FILLER_AUDIO_ENABLED = os.getenv("FILLER_AUDIO_ENABLED", "true").lower() == "true"
+filler_bank = FillerAudioBank(
+    phrases=[p.strip() for p in os.getenv("FILLER_PHRASES", "").split("|") if p.strip()] or None
+)
+
+async def _synthesize_fillers(voice_id: Optional[str], phrases: List[str]):
+    """대기 음성 배치 생성 (모델 로드/생성은 executor에서 실행, 생성 슬롯은 대화형 요청보다 낮은 우선순위)"""
+    loop = asyncio.get_event_loop()
+    model_name = os.getenv("FILLER_MODEL", "Zyphra/Zonos-v0.1-transformer")
+    model = await loop.run_in_executor(None, model_cache.load_model_if_needed, model_name)
+    speaker_embedding = await voice_manager.process_voice_request({"voice_id": voice_id} if voice_id else {}, model)
+    request_data = {"language": "ko", "emotion_preset": "neutral", "speaking_rate": 13.0}
+    cond_dict = _make_request_cond_dict(request_data, phrases[0], speaker_embedding)
+    
+    def generate():
+        audios = []
+        for start in range(0, len(phrases), batch_generator.max_batch_size):
+            batch = phrases[start:start + batch_generator.max_batch_size]
+            conditioning = model.prepare_conditioning(dict(cond_dict, espeak=(batch, ["ko"] * len(batch))))
+            with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
+                results = batch_generator.generate(
+                    model, conditioning, batch, cfg_scale=2.0,
+                    sampling_params=dict(min_p=0.1, temperature=0.8), max_new_tokens=86 * 3
+                )
+            audios.extend(audio for audio, _ in results)
+        return audios
+    
+    audios = await tts_admission.run(lambda: loop.run_in_executor(None, generate), priority=PRIORITY_BATCH)
+    return audios, model.autoencoder.sampling_rate
+
+async def _synthesize_job_batch(request_data: Dict[str, Any], texts: List[str]):
+    """배치 작업의 한 배치 생성 -> 캐시 기록 (생성 슬롯은 대화형 요청보다 낮은 우선순위)"""
+    model_name = request_data.get("model", "Zyphra/Zonos-v0.1-transformer")
+    model = await model_cache.load_model_with_progress(model_name)
+    speaker_embedding = await voice_manager.process_voice_request(request_data, model)
+    cond_dict = _make_request_cond_dict(request_data, texts[0], speaker_embedding)
+    language = request_data.get("language", "ko")
+    cache_settings = _tts_cache_settings(request_data)
+    sr = model.autoencoder.sampling_rate
+    
+    def generate():
+        conditioning = model.prepare_conditioning(dict(cond_dict, espeak=(texts, [language] * len(texts))))
+        with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
+            return batch_generator.generate(
+                model, conditioning, texts,
+                cfg_scale=request_data.get("cfg_scale", 2.0),
+                sampling_params=dict(min_p=0.1, temperature=0.8),
+                decode_batch_size=int(os.getenv("TTS_JOB_DECODE_BATCH", "8"))
+            )
+    
+    loop = asyncio.get_event_loop()
+    results = await tts_admission.run(lambda: loop.run_in_executor(None, generate), priority=PRIORITY_BATCH)
+    for text, (audio, codes) in zip(texts, results):
+        # 명시적으로 요청된 문장이므로 입장 정책에서 밀려나지 않도록 빈도를 반영하고, 메모리 계층은 건드리지 않음
+        tts_cache.record_access(text, model_name, cache_settings, int(os.getenv("TTS_JOB_ACCESS_WEIGHT", "4")))
+        tts_cache.save_cached_audio(text, model_name, cache_settings, audio, sr, codes=codes, to_memory=False)
+    # 쓰기 큐가 넘쳐 기록이 버려지지 않도록 배치마다 비움
+    await loop.run_in_executor(None, tts_cache.flush, 30.0)
+
+job_manager = TTSJobManager(
+    _synthesize_job_batch,
+    is_cached=lambda item: tts_cache.contains(item["text"], item.get("model", ""), _tts_cache_settings(item))
+)
 
 # GPU 최적화 적용
 GPUOptimizer.optimize_gpu_settings()
@@ -460,15 +577,51 @@ GPUOptimizer.optimize_gpu_settings()
 
 
 
+# 클라이언트 재생 위치보다 이만큼(초)까지만 앞서 전송
+TTS_PLAYBACK_LEAD_SEC = float(os.getenv("TTS_PLAYBACK_LEAD_SEC", "1.0"))
+
+# 요청의 "format"으로 고를 수 있는 출력 형식 (opus는 opuslib/libopus가 있을 때만)
+OUTPUT_FORMATS = ["pcm", "float32"] + (["opus"] if OPUS_AVAILABLE else [])
+
+# request_id가 있는 요청은 한 연결에서 동시에 처리 (동시 생성 수 / 대기 포함 최대 요청 수)
+TTS_MAX_INFLIGHT = int(os.getenv("TTS_MAX_INFLIGHT", "2"))
+TTS_MAX_QUEUED_REQUESTS = int(os.getenv("TTS_MAX_QUEUED_REQUESTS", "8"))
+
+# POST /api/tts/stream 응답 형식 (Accept 미디어 타입 -> 형식)
+HTTP_STREAM_MEDIA_TYPES = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/l16": "pcm",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+}
+# 본문 청크 큐 크기 (가득 차면 생성/스트리밍이 클라이언트 수신 속도에 맞춰 기다림)
+HTTP_STREAM_QUEUE_CHUNKS = int(os.getenv("HTTP_STREAM_QUEUE_CHUNKS", "32"))
+
 # WebSocket 연결 관리자 개선
 class EnhancedConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_info: Dict[str, Dict] = {}
+        self.pacers: Dict[str, PlaybackPacer] = {}  # 클라이언트 재생 ack 기반 송신 조절
+        self.outbound: Dict[str, OutboundQueue] = {}  # 연결별 송신 큐 (전용 writer 태스크)
+        self.stream_counters: Dict[str, int] = {}  # 연결 안에서 겹치지 않는 stream_id
+    
+    def next_stream_id(self, client_id: str) -> int:
+        """클라이언트별 1..65535 순환 stream_id (동시 요청의 pacer들이 공유)"""
+        stream_id = self.stream_counters.get(client_id, 0) % 0xFFFF + 1
+        self.stream_counters[client_id] = stream_id
+        return stream_id
+    
+    def new_pacer(self, client_id: str) -> PlaybackPacer:
+        return PlaybackPacer(lead_seconds=TTS_PLAYBACK_LEAD_SEC, id_source=lambda: self.next_stream_id(client_id))
     
     async def connect(self, websocket: WebSocket, client_id: str):
         await websocket.accept()
         self.active_connections[client_id] = websocket
+        self.pacers[client_id] = self.new_pacer(client_id)
+        self.outbound[client_id] = OutboundQueue(websocket).start()
         self.connection_info[client_id] = {
             "connected_at": time.time(),
             "last_activity": time.time(),
@@ -480,19 +633,174 @@ class EnhancedConnectionManager:
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             del self.connection_info[client_id]
+            self.pacers.pop(client_id, None)
+            self.stream_counters.pop(client_id, None)
+            outbound = self.outbound.pop(client_id, None)
+            if outbound is not None:
+                outbound.close()
             logger.info(f"🔌 Client {client_id} disconnected from TTS WebSocket")
     
     async def send_to_client(self, client_id: str, message: dict):
-        """특정 클라이언트에게 메시지 전송"""
-        if client_id in self.active_connections:
+        """특정 클라이언트에게 메시지 전송 (송신 큐에 넣기만 함)"""
+        outbound = self.outbound.get(client_id)
+        if outbound is not None and await outbound.send_json(message):
+            self.connection_info[client_id]["last_activity"] = time.time()
+
+tts_manager = EnhancedConnectionManager()
+
+class MultiplexedSender:
+    """동시 요청 하나의 송신기 - 송신 큐 앞에서 메시지에 요청 태그를 붙임
+    
+    JSON 메시지에는 request_id를 넣고, 오디오 바이너리 메시지에는 audio_framing 헤더
+    (stream_id, seq, sample_rate, FLAG_OPUS)를 앞에 붙여 여러 요청의 오디오가 섞여도 구분되게 합니다.
+    stream_id/형식은 이 요청이 보내는 generation_metadata에서 가져오므로 생성/스트리밍 코드는
+    websocket 대신 이 객체를 받아 그대로 사용합니다.
+    """
+    
+    def __init__(self, outbound: OutboundQueue, request_id: Any):
+        self.outbound = outbound
+        self.request_id = request_id
+        self.stream_id = 0
+        self.sample_rate = 0
+        self.flags = 0
+        self.seq = 0
+    
+    @property
+    def throughput_bps(self) -> Optional[float]:
+        return self.outbound.throughput_bps
+    
+    async def send_json(self, data: Dict[str, Any], priority: int = PRIORITY_STREAM) -> bool:
+        data = dict(data, request_id=self.request_id)
+        if data.get("type") == "generation_metadata":
+            self.stream_id = data.get("stream_id", 0)
+            self.sample_rate = data.get("sample_rate", 0)
+            self.flags = FLAG_OPUS if data.get("format") == "opus" else 0
+            self.seq = 0
+        return await self.outbound.send_json(data, priority)
+    
+    async def send_bytes(self, data, priority: int = PRIORITY_STREAM) -> bool:
+        flags = self.flags | (FLAG_START if self.seq == 0 else 0)
+        frame = encode_packet_frame(data, self.stream_id, self.seq, self.sample_rate, flags)
+        self.seq += 1
+        return await self.outbound.send_bytes(frame, priority)
+
+class HTTPAudioSender:
+    """HTTP 스트리밍 응답용 송신기 - websocket 대신 ultra_optimized_stream_audio_generation에 넘김
+    
+    오디오 바이너리는 응답 형식에 맞게 바꿔(wav는 그대로, pcm은 L16 big-endian, opus는 Ogg 페이지)
+    본문 청크 큐에 넣고, JSON 진행 메시지는 오류만 기록합니다.
+    큐가 가득 차면 송신이 기다리므로 느린 클라이언트는 TCP 흐름 제어로 조절됩니다.
+    """
+    
+    def __init__(self, container: str, sample_rate: int):
+        self.container = container
+        self.sample_rate = sample_rate  # opus는 원본 샘플레이트 (OpusHead 정보용)
+        self.chunks: asyncio.Queue = asyncio.Queue(maxsize=HTTP_STREAM_QUEUE_CHUNKS)
+        self.ogg = OggOpusWriter(sample_rate) if container == "opus" else None
+        self.error: Optional[str] = None
+        self.error_code: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.first: Optional[bytes] = None
+    
+    @property
+    def content_type(self) -> str:
+        if self.container == "opus":
+            return "audio/ogg; codecs=opus"
+        if self.container == "pcm":
+            return f"audio/L16; rate={self.sample_rate}; channels=1"
+        return "audio/wav"
+    
+    async def send_json(self, data: Dict[str, Any], priority: int = PRIORITY_STREAM) -> bool:
+        if data.get("type") in ("error", "generation_error"):
+            self.error = data.get("error")
+            self.error_code = data.get("error_code")
+        return True
+    
+    async def send_bytes(self, data, priority: int = PRIORITY_STREAM) -> bool:
+        if self.ogg is not None:
+            chunk = self.ogg.write(unpack_packets(data))
+        elif self.container == "pcm":
+            chunk = np.frombuffer(data, dtype='<i2').astype('>i2').tobytes()
+        else:
+            chunk = bytes(data)
+        if chunk:
+            await self.chunks.put(chunk)
+        return True
+    
+    async def start(self, produce: Callable[[], Awaitable[Any]]):
+        """produce(생성 + 송신)를 백그라운드에서 시작하고 첫 본문 청크까지 기다림
+        
+        응답을 시작하기 전에 실패하면(대기열 포화, 생성 오류) HTTPException으로 알려 상태 코드에 반영합니다.
+        """
+        async def run():
             try:
-                await self.active_connections[client_id].send_json(message)
-                self.connection_info[client_id]["last_activity"] = time.time()
+                await produce()
+            except AdmissionRejected as e:
+                self.error, self.error_code = str(e), "TTS_BUSY"
             except Exception as e:
-                logger.error(f"❌ Failed to send message to {client_id}: {e}")
-                self.disconnect(client_id)
+                self.error = str(e)
+            finally:
+                await self.chunks.put(None)
+        
+        self.task = asyncio.create_task(run())
+        try:
+            self.first = await self.chunks.get()
+        except BaseException:
+            self.task.cancel()
+            raise
+        if self.first is None and self.error:
+            if self.error_code == "TTS_BUSY":
+                raise HTTPException(status_code=503, detail=self.error, headers={"Retry-After": "1"})
+            raise HTTPException(status_code=500, detail=self.error)
+    
+    async def stream(self):
+        """start() 이후 본문 청크를 순서대로 내보냄 (클라이언트가 끊으면 생성 취소)
+        
+        응답 시작 후 생성이 실패하면 예외로 청크 응답을 끊어 잘린 오디오가 정상 완료로 보이지 않게 합니다.
+        """
+        try:
+            if self.container == "wav":
+                yield wav_stream_header(self.sample_rate)
+            elif self.ogg is not None:
+                yield self.ogg.header()
+            chunk = self.first
+            while chunk is not None:
+                yield chunk
+                chunk = await self.chunks.get()
+            if self.error:
+                logger.warning(f"⚠️ HTTP TTS 스트리밍 중 오류: {self.error}")
+                raise RuntimeError(f"HTTP TTS 스트리밍 중단: {self.error}")
+            if self.ogg is not None:
+                yield self.ogg.finish()
+        finally:
+            self.task.cancel()
 
-tts_manager = EnhancedConnectionManager()
+def _negotiate_stream_format(accept: Optional[str], requested: str) -> Optional[str]:
+    """Accept 헤더(q값 순)와 요청 format으로 HTTP 응답 형식 결정 (맞는 형식이 없으면 None)"""
+    available = ["wav", "pcm"] + (["opus"] if OPUS_AVAILABLE else [])
+    default = requested if requested in available else "wav"
+    if not accept:
+        return default
+    
+    ranges = []
+    for index, part in enumerate(accept.split(",")):
+        media, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, index, media.lower()))
+    
+    for _, _, media in sorted(ranges):
+        if media in ("*/*", "audio/*"):
+            return default
+        if HTTP_STREAM_MEDIA_TYPES.get(media) in available:
+            return HTTP_STREAM_MEDIA_TYPES[media]
+    return None
 
 # 🚀 울트라 최적화된 실시간 오디오 스트리밍
 async def ultra_optimized_stream_audio_generation(
@@ -501,24 +809,40 @@ async def ultra_optimized_stream_audio_generation(
     conditioning: torch.Tensor,
     request_data: Dict[str, Any],
     format_type: str = "pcm",
-    client_id: str = None
+    client_id: str = None,
+    make_sentence_conditioning: Optional[Callable[[List[str]], torch.Tensor]] = None,
+    pacer: Optional[PlaybackPacer] = None
 ):
-    """울트라 최적화된 실시간 오디오 스트리밍"""
+    """울트라 최적화된 실시간 오디오 스트리밍
+    
+    make_sentence_conditioning: 문장 목록 -> 배치 컨디셔닝 (목소리/감정은 요청과 동일).
+    주어지면 문장 단위 캐시를 사용해 캐시에 없는 문장만 생성합니다.
+    pacer: 연결별 재생 ack 기반 송신 조절기 (없으면 실시간 재생을 가정)
+    """
     
     text = request_data.get("text", "")
     model_name = request_data.get("model", "")
     
     # 1. 캐시 확인 단계
-    cache_settings = {
-        'model': model_name,
-        'language': request_data.get('language', 'ko'),
-        'emotion': request_data.get('emotion', []),
-        'speaking_rate': request_data.get('speaking_rate', 15.0),
-        'pitch_std': request_data.get('pitch_std', 20.0),
-        'cfg_scale': request_data.get('cfg_scale', 2.0)
-    }
+    cache_settings = _tts_cache_settings(request_data)
     
     cached_audio = tts_cache.get_cached_audio(text, model_name, cache_settings)
+    flight_key = tts_cache._get_cache_key(text, model_name, cache_settings)
+    pacer = pacer or PlaybackPacer(lead_seconds=TTS_PLAYBACK_LEAD_SEC)
+    
+    # 출력 형식 협상 (Opus는 측정된 연결 처리량으로 스트림 시작 시 비트레이트 결정)
+    bitrate = None
+    if format_type == "opus":
+        if OPUS_AVAILABLE:
+            bitrate = select_bitrate(_throughput_bps(websocket), request_data.get("bitrate"))
+        else:
+            await websocket.send_json({
+                "type": "format_fallback",
+                "requested": "opus",
+                "format": "pcm",
+                "message": "Opus 인코더를 사용할 수 없어 PCM으로 전송합니다"
+            })
+            format_type = "pcm"
     
     if cached_audio is not None:
         # 캐시 히트! 즉시 스트리밍
@@ -530,9 +854,11 @@ async def ultra_optimized_stream_audio_generation(
             })
             
             sr = model.autoencoder.sampling_rate
+            output_sr = resolve_output_rate(request_data.get("output_sample_rate"), sr)
             await websocket.send_json({
                 "type": "generation_metadata",
-                "sample_rate": int(sr),
+                "stream_id": pacer.start_stream(),
+                **_output_format_metadata(format_type, sr, bitrate, output_sr),
                 "total_duration": len(cached_audio) / sr,
                 "generation_time": 0.05,  # 캐시 히트 시간
                 "latency": 0.05,
@@ -540,8 +866,28 @@ async def ultra_optimized_stream_audio_generation(
                 "performance": "🚀 캐시"
             })
             
-            # 캐시된 오디오 스트리밍
-            await _stream_cached_audio(websocket, cached_audio, sr, format_type)
+            # 캐시된 오디오 스트리밍 (Opus는 비트레이트별로 미리 인코딩해 둔 것을 그대로 전송)
+            if bitrate is not None:
+                encoding = f"opus:{bitrate}"
+                encoded = tts_cache.get_encoded(text, model_name, cache_settings, encoding)
+                if encoded is None:
+                    loop = asyncio.get_event_loop()
+                    encoded = await loop.run_in_executor(opus_executor, encode_opus, cached_audio, sr, bitrate)
+                    tts_cache.save_encoded(text, model_name, cache_settings, encoding, encoded, OPUS_SAMPLE_RATE)
+                await _stream_encoded_audio(websocket, encoded, pacer)
+            elif output_sr != sr:
+                # 요청한 출력 샘플레이트로 변환한 PCM도 캐시에 보관 (다음 히트는 변환 없이 mmap 뷰 전송)
+                encoding = f"pcm16@{output_sr}"
+                resampled = tts_cache.get_encoded(text, model_name, cache_settings, encoding)
+                if resampled is None:
+                    loop = asyncio.get_event_loop()
+                    resampled = await loop.run_in_executor(
+                        None, lambda: tts_cache.to_pcm16(resample(cached_audio, sr, output_sr)).tobytes()
+                    )
+                    tts_cache.save_encoded(text, model_name, cache_settings, encoding, resampled, output_sr)
+                await _stream_cached_audio(websocket, np.frombuffer(resampled, dtype=np.int16), output_sr, format_type, pacer)
+            else:
+                await _stream_cached_audio(websocket, cached_audio, sr, format_type, pacer)
             return
             
         except Exception as e:
@@ -549,7 +895,24 @@ async def ultra_optimized_stream_audio_generation(
             # 캐시 실패 시 일반 생성으로 fallback
     
     
-    # 2. 긴 텍스트 병렬 처리 확인
+    # 2. 문장 단위 캐시 (캐시된 문장은 재사용하고 나머지만 배치 생성 후 이어붙임)
+    if SENTENCE_CACHE_ENABLED and make_sentence_conditioning is not None:
+        sentences = parallel_processor.text_splitter.split_sentences(text)
+        if len(sentences) > 1:
+            try:
+                await _stream_sentence_cached_audio(
+                    websocket, model, request_data, sentences, cache_settings,
+                    make_sentence_conditioning, format_type, flight_key, pacer, bitrate,
+                    output_sample_rate=request_data.get("output_sample_rate")
+                )
+                return
+            except AdmissionRejected:
+                raise  # 대기열 포화는 fallback해도 똑같이 거절되므로 바로 알림
+            except Exception as e:
+                logger.warning(f"⚠️ 문장 단위 합성 실패, 일반 처리로 fallback: {e}")
+    
+    
+    # 3. 긴 텍스트 병렬 처리 확인
     
     if len(text) > int(os.getenv("PARALLEL_TEXT_THRESHOLD", "150")):
         try:
@@ -559,25 +922,37 @@ async def ultra_optimized_stream_audio_generation(
                 "text_length": len(text)
             })
             
-            audio_chunks = await _process_text_parallel(model, conditioning, request_data)
+            sr = model.autoencoder.sampling_rate
             
-            if audio_chunks:
-                # 오디오 청크 결합
-                sr = model.autoencoder.sampling_rate
-                combined_audio = parallel_processor.combine_audio_chunks(audio_chunks, sr)
-                
-                # 캐시에 저장
-                tts_cache.save_cached_audio(text, model_name, cache_settings, combined_audio, sr)
-                
+            async def generate_parallel():
+                audio_chunks = await _process_text_parallel(model, conditioning, request_data)
+                return parallel_processor.combine_audio_chunks(audio_chunks, sr) if audio_chunks else None
+            
+            combined_audio, is_leader = await tts_singleflight.run(
+                "parallel:" + flight_key, lambda: tts_admission.run(generate_parallel)
+            )
+            
+            if combined_audio is not None:
                 # 결합된 오디오 스트리밍
-                await _stream_generated_audio(websocket, combined_audio, sr, format_type, "parallel")
+                encoded = await _stream_generated_audio(
+                    websocket, combined_audio, sr, format_type, "parallel" if is_leader else "shared", pacer=pacer, bitrate=bitrate,
+                    output_sample_rate=request_data.get("output_sample_rate")
+                )
+                
+                # 캐시에 저장 (디스크 기록은 백그라운드 writer가 처리, 공유받은 결과는 리더가 이미 저장)
+                if is_leader:
+                    tts_cache.save_cached_audio(text, model_name, cache_settings, combined_audio, sr)
+                    if encoded is not None:
+                        tts_cache.save_encoded(text, model_name, cache_settings, f"opus:{bitrate}", encoded, OPUS_SAMPLE_RATE)
                 return
                 
+        except AdmissionRejected:
+            raise  # 대기열 포화는 fallback해도 똑같이 거절되므로 바로 알림
         except Exception as e:
             logger.warning(f"⚠️ 병렬 처리 실패, 일반 처리로 fallback: {e}")
     
     
-    # 3. 일반 생성 (최적화 적용)
+    # 4. 일반 생성 (최적화 적용)
     
     timer_id = perf_monitor.start_timer("optimized_audio_generation")
     
@@ -599,39 +974,60 @@ async def ultra_optimized_stream_audio_generation(
         optimal_batch_size = GPUOptimizer.get_optimal_batch_size(model_name)
         max_new_tokens = min(86 * 30, len(text) * 12)  # 더 효율적인 토큰 계산
         
-        # Mixed precision 사용
-        with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
-            codes = model.generate(
-                prefix_conditioning=conditioning,
-                audio_prefix_codes=None,
-                max_new_tokens=max_new_tokens,
-                cfg_scale=request_data.get("cfg_scale", 2.0),
-                batch_size=optimal_batch_size,
-                sampling_params=dict(
-                    min_p=0.1,
-                    temperature=0.8,  # 약간 낮춰서 안정성 향상
-                ),
-                progress_bar=False,
-                disable_torch_compile=True,
-            )
-        
-        # 오디오 디코딩
-        wav_out = model.autoencoder.decode(codes).cpu().detach()
-        if wav_out.dim() == 2 and wav_out.size(0) > 1:
-            wav_out = wav_out[0:1, :]
+        def generate_single():
+            # Mixed precision 사용
+            with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
+                codes = model.generate(
+                    prefix_conditioning=conditioning,
+                    audio_prefix_codes=None,
+                    max_new_tokens=max_new_tokens,
+                    cfg_scale=request_data.get("cfg_scale", 2.0),
+                    batch_size=optimal_batch_size,
+                    sampling_params=dict(
+                        min_p=0.1,
+                        temperature=0.8,  # 약간 낮춰서 안정성 향상
+                    ),
+                    progress_bar=False,
+                    disable_torch_compile=True,
+                )
+            
+            # 오디오 디코딩
+            wav_out = model.autoencoder.decode(codes).cpu().detach()
+            if wav_out.dim() == 2 and wav_out.size(0) > 1:
+                wav_out = wav_out[0:1, :]
+            
+            # codes 모드에서는 첫 번째 배치의 코드만 기록
+            return wav_out.squeeze().numpy(), codes[0].cpu().numpy()
         
-        audio_data = wav_out.squeeze().numpy()
+        # 같은 요청이 이미 생성 중이면 그 결과를 기다림 (이벤트 루프를 막지 않도록 executor에서 생성)
+        loop = asyncio.get_event_loop()
+        (audio_data, first_codes), is_leader = await tts_singleflight.run(
+            flight_key, lambda: tts_admission.run(lambda: loop.run_in_executor(None, generate_single))
+        )
         sr = model.autoencoder.sampling_rate
         
         generation_time = perf_monitor.end_timer(timer_id)
         perf_monitor.log_memory_usage("최적화 생성 후")
         
-        # 캐시에 저장
-        tts_cache.save_cached_audio(text, model_name, cache_settings, audio_data, sr)
-        
         # 오디오 스트리밍
-        await _stream_generated_audio(websocket, audio_data, sr, format_type, "optimized", generation_time)
+        encoded = await _stream_generated_audio(
+            websocket, audio_data, sr, format_type, "optimized" if is_leader else "shared", generation_time, pacer, bitrate,
+            output_sample_rate=request_data.get("output_sample_rate")
+        )
         
+        # 캐시에 저장 (디스크 기록은 백그라운드 writer가 처리, 공유받은 결과는 리더가 이미 저장)
+        if is_leader:
+            tts_cache.save_cached_audio(text, model_name, cache_settings, audio_data, sr, codes=first_codes)
+            if encoded is not None:
+                tts_cache.save_encoded(text, model_name, cache_settings, f"opus:{bitrate}", encoded, OPUS_SAMPLE_RATE)
+        
+    except AdmissionRejected as e:
+        logger.warning(f"⏳ 생성 대기열 포화로 요청 거절: {e}")
+        await websocket.send_json({
+            "type": "generation_error",
+            "error": str(e),
+            "error_code": "TTS_BUSY"
+        })
     except Exception as e:
         logger.error(f"❌ 최적화 오디오 생성 실패: {e}")
         await websocket.send_json({
@@ -641,30 +1037,237 @@ async def ultra_optimized_stream_audio_generation(
         })
 
 # 보조 함수들
-async def _stream_cached_audio(websocket: WebSocket, audio_data: np.ndarray, sr: int, format_type: str):
-    """캐시된 오디오 스트리밍"""
+def _tts_cache_settings(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """요청에서 캐시 키에 들어갈 설정만 추출 (_make_request_cond_dict가 쓰는 값과 일치해야 함)"""
+    enable_emotion = request_data.get("enable_emotion", True)
+    return {
+        'model': request_data.get("model", ""),
+        'voice': _voice_cache_id(request_data),
+        'language': request_data.get('language', 'ko'),
+        # 프리셋/직접 지정을 풀어 쓴 실제 감정 벡터 (감정을 끄면 무조건부라 값과 무관)
+        'emotion': EmotionManager.get_emotion_vector(request_data.get("emotion_preset"), request_data.get("emotion")) if enable_emotion else None,
+        'fmax': request_data.get("fmax", 22050.0),
+        'speaking_rate': request_data.get('speaking_rate', 15.0),
+        'pitch_std': request_data.get('pitch_std', 20.0),
+        'vqscore_8': request_data.get("vqscore_8", [0.78] * 8),
+        'dnsmos_ovrl': request_data.get("dnsmos_ovrl", 4.0),
+        'cfg_scale': request_data.get('cfg_scale', 2.0)
+    }
+
+def _make_request_cond_dict(request_data: Dict[str, Any], text: str, speaker_embedding: Optional[torch.Tensor]) -> Dict[str, Any]:
+    """TTS 요청 설정(감정/속도/음질 등)으로 컨디셔닝 딕셔너리 생성"""
+    emotion = EmotionManager.get_emotion_vector(request_data.get("emotion_preset"), request_data.get("emotion"))
+    
+    # unconditional_keys 동적 설정
+    unconditional_keys = {"vqscore_8", "dnsmos_ovrl"}
+    if not request_data.get("enable_emotion", True):
+        unconditional_keys.add("emotion")
+    
+    return make_cond_dict(
+        text=text,
+        language=request_data.get("language", "ko"),
+        speaker=speaker_embedding,  # 🎤 목소리 적용
+        emotion=emotion,  # 😊 감정 적용
+        fmax=request_data.get("fmax", 22050.0),
+        pitch_std=request_data.get("pitch_std", 20.0),
+        speaking_rate=request_data.get("speaking_rate", 15.0),
+        vqscore_8=request_data.get("vqscore_8", [0.78] * 8),
+        dnsmos_ovrl=request_data.get("dnsmos_ovrl", 4.0),
+        device=device,
+        unconditional_keys=unconditional_keys  # 동적 설정
+    )
+
+async def _prepare_request_conditioning(
+    request_data: Dict[str, Any], sender=None
+) -> Tuple[Zonos, torch.Tensor, Callable[[List[str]], torch.Tensor]]:
+    """모델 로드 + 시드 + 목소리/감정 컨디셔닝 (WebSocket/HTTP 공용)
+    
+    (모델, 전체 텍스트 컨디셔닝, 문장 배치 컨디셔닝 함수) 반환. sender가 주어지면 모델 로드 진행률을 보냅니다.
+    """
+    model_choice = request_data.get("model", "Zyphra/Zonos-v0.1-transformer")
+    
+    # 모델 로드 (프로그레스바 포함)
+    model = await model_cache.load_model_with_progress(model_choice, sender)
+    
+    # 시드 설정
+    seed = request_data.get("seed", 420)
+    if request_data.get("randomize_seed", True):
+        seed = torch.randint(0, 2**32 - 1, (1,)).item()
+    torch.manual_seed(seed)
+    
+    # 🎤 목소리 처리
+    speaker_embedding = await voice_manager.process_voice_request(request_data, model)
+    
+    # 😊 감정 처리 + 컨디셔닝 설정
+    cond_dict = _make_request_cond_dict(request_data, request_data.get("text", ""), speaker_embedding)
+    
+    conditioning = model.prepare_conditioning(cond_dict)
+    
+    def make_sentence_conditioning(sentences: List[str]) -> torch.Tensor:
+        """같은 목소리/감정으로 문장 배치 컨디셔닝 생성"""
+        language = request_data.get("language", "ko")
+        return model.prepare_conditioning(dict(cond_dict, espeak=(sentences, [language] * len(sentences))))
+    
+    return model, conditioning, make_sentence_conditioning
+
+def _voice_cache_id(request_data: Dict[str, Any]) -> Optional[str]:
+    """캐시 키에 들어갈 목소리 식별자 (목소리가 다르면 다른 항목)"""
+    if request_data.get("voice_id"):
+        return f"id:{request_data['voice_id']}"
+    if request_data.get("voice_audio_base64"):
+        return "b64:" + hashlib.md5(request_data["voice_audio_base64"].encode()).hexdigest()
+    if request_data.get("voice_file_path"):
+        return f"file:{request_data['voice_file_path']}"
+    return None
+
+async def _stream_sentence_cached_audio(
+    websocket: WebSocket,
+    model: Zonos,
+    request_data: Dict[str, Any],
+    sentences: List[str],
+    cache_settings: Dict[str, Any],
+    make_sentence_conditioning: Callable[[List[str]], torch.Tensor],
+    format_type: str,
+    flight_key: Optional[str] = None,
+    pacer: Optional[PlaybackPacer] = None,
+    bitrate: Optional[int] = None,
+    output_sample_rate: Optional[int] = None
+):
+    """문장별 캐시 조회 -> 누락 문장만 배치 생성/캐시 -> 크로스페이드로 이어붙여 스트리밍
+    
+    flight_key가 주어지면 같은 요청이 동시에 들어와도 누락 문장 생성은 한 번만 수행합니다.
+    """
+    model_name = request_data.get("model", "")
+    sr = model.autoencoder.sampling_rate
+    start_time = time.time()
+    
+    audio_parts = tts_cache.get_cached_sentences(sentences, model_name, cache_settings)
+    missing = [i for i, part in enumerate(audio_parts) if part is None]
+    
+    await websocket.send_json({
+        "type": "sentence_cache",
+        "sentences": len(sentences),
+        "cached": len(sentences) - len(missing),
+        "generating": len(missing)
+    })
+    
+    loop = asyncio.get_event_loop()
+    
+    async def generate_missing() -> Dict[int, np.ndarray]:
+        generated = {}
+        for start in range(0, len(missing), batch_generator.max_batch_size):
+            batch = missing[start:start + batch_generator.max_batch_size]
+            batch_texts = [sentences[i] for i in batch]
+            
+            def generate_batch():
+                conditioning = make_sentence_conditioning(batch_texts)
+                with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
+                    return batch_generator.generate(
+                        model, conditioning, batch_texts,
+                        cfg_scale=request_data.get("cfg_scale", 2.0),
+                        sampling_params=dict(min_p=0.1, temperature=0.8)
+                    )
+            
+            results = await loop.run_in_executor(None, generate_batch)
+            for i, (audio, codes) in zip(batch, results):
+                generated[i] = audio
+                tts_cache.save_cached_audio(sentences[i], model_name, cache_settings, audio, sr, codes=codes)
+        return generated
+    
+    if missing and flight_key is not None:
+        generated, _ = await tts_singleflight.run(
+            "sentences:" + flight_key, lambda: tts_admission.run(generate_missing)
+        )
+    elif missing:
+        generated = await tts_admission.run(generate_missing)
+    else:
+        generated = {}
+    for i, audio in generated.items():
+        audio_parts[i] = audio
+    
+    crossfade_ms = float(os.getenv("TTS_SENTENCE_CROSSFADE_MS", "20"))
+    audio_data = parallel_processor.splice_with_crossfade(audio_parts, sr, crossfade_ms)
+    source = "sentence_cache" if not missing else "sentence_partial"
+    await _stream_generated_audio(
+        websocket, audio_data, sr, format_type, source, time.time() - start_time, pacer, bitrate,
+        output_sample_rate=output_sample_rate
+    )
+
+async def _stream_cached_audio(websocket: WebSocket, audio_data: np.ndarray, sr: int, format_type: str, pacer: PlaybackPacer):
+    """캐시된 오디오 스트리밍 (클라이언트 재생 위치보다 lead만큼 앞서 전송, 스트림은 호출자가 시작)"""
     chunk_duration = 0.05  # 캐시는 더 작은 청크로 빠르게
     chunk_size = int(sr * chunk_duration)
     
+    # 디스크 캐시의 int16 PCM은 mmap 뷰이므로 memoryview 슬라이스로 복사 없이 전송
+    pcm_view = memoryview(audio_data).cast('B') if format_type == "pcm" and audio_data.dtype == np.int16 else None
+    
     for i in range(0, len(audio_data), chunk_size):
+        seconds = min(chunk_size, len(audio_data) - i) / sr
+        if pcm_view is not None:
+            await pacer.send(websocket.send_bytes, pcm_view[i * 2:(i + chunk_size) * 2], seconds)
+            continue
+        
         chunk = audio_data[i:i + chunk_size]
+        if chunk.dtype == np.int16:
+            chunk = chunk.astype('float32') / 32767
         
         if format_type == "pcm":
             chunk_int16 = (chunk * 32767).astype('int16')
-            await websocket.send_bytes(chunk_int16.tobytes())
+            await pacer.send(websocket.send_bytes, chunk_int16.tobytes(), seconds)
         else:
-            await websocket.send_bytes(chunk.astype('float32').tobytes())
-        
-        await asyncio.sleep(0.005)  # 더 빠른 스트리밍
+            await pacer.send(websocket.send_bytes, chunk.astype('float32').tobytes(), seconds)
+
+def _throughput_bps(sender) -> Optional[float]:
+    """송신 큐가 측정한 연결 처리량 (WebSocket을 직접 받은 경우 None)"""
+    return getattr(sender, "throughput_bps", None)
+
+def _output_format_metadata(
+    format_type: str, sr: int, bitrate: Optional[int] = None, output_sr: Optional[int] = None
+) -> Dict[str, Any]:
+    """generation_metadata의 출력 형식 필드 (Opus는 48kHz raw 패킷, 메시지마다 길이 접두로 묶음)"""
+    if format_type == "opus":
+        return {
+            "format": "opus",
+            "sample_rate": OPUS_SAMPLE_RATE,
+            "source_sample_rate": int(sr),
+            "bitrate": bitrate,
+            "packet_ms": OPUS_PACKET_MS,
+            "packet_framing": "u16le_length_prefixed"
+        }
+    output_sr = output_sr or int(sr)
+    if output_sr != sr:
+        return {"format": format_type, "sample_rate": output_sr, "source_sample_rate": int(sr)}
+    return {"format": format_type, "sample_rate": int(sr)}
+
+async def _stream_encoded_audio(websocket: WebSocket, encoded, pacer: PlaybackPacer):
+    """미리 인코딩된 Opus 패킷 스트리밍 (메시지당 OPUS_PACKETS_PER_MESSAGE개, 복사 없이 잘라 전송)"""
+    packets_per_message = int(os.getenv("OPUS_PACKETS_PER_MESSAGE", "5"))
+    for group, count in iter_packet_groups(encoded, packets_per_message):
+        await pacer.send(websocket.send_bytes, group, count * OPUS_PACKET_MS / 1000)
 
-async def _stream_generated_audio(websocket: WebSocket, audio_data: np.ndarray, sr: int, format_type: str, source: str, generation_time: float = 0):
-    """생성된 오디오 스트리밍"""
+async def _stream_generated_audio(
+    websocket: WebSocket, audio_data: np.ndarray, sr: int, format_type: str, source: str,
+    generation_time: float = 0, pacer: Optional[PlaybackPacer] = None, bitrate: Optional[int] = None,
+    output_sample_rate: Optional[int] = None
+) -> Optional[bytes]:
+    """생성된 오디오 스트리밍 (클라이언트 재생 위치보다 lead만큼 앞서 전송)
+    
+    format_type이 "opus"이면 청크마다 워커 스레드에서 증분 인코딩해 보내고,
+    캐시에 기록할 수 있도록 전체 인코딩 결과(길이 접두 패킷)를 반환합니다.
+    PCM/float32는 output_sample_rate가 주어지면 청크마다 리샘플링합니다 (필터 상태는 청크 사이에 유지).
+    """
     audio_duration = len(audio_data) / sr
     rtf = generation_time / audio_duration if audio_duration > 0 else 0
+    pacer = pacer or PlaybackPacer(lead_seconds=TTS_PLAYBACK_LEAD_SEC)
+    stream_id = pacer.start_stream()
+    if format_type == "opus" and bitrate is None:
+        bitrate = select_bitrate(_throughput_bps(websocket))
+    output_sr = resolve_output_rate(output_sample_rate, sr)
     
     await websocket.send_json({
         "type": "generation_metadata",
-        "sample_rate": int(sr),
+        "stream_id": stream_id,
+        **_output_format_metadata(format_type, sr, bitrate, output_sr),
         "total_duration": audio_duration,
         "generation_time": generation_time,
         "latency": generation_time,
@@ -676,16 +1279,31 @@ async def _stream_generated_audio(websocket: WebSocket, audio_data: np.ndarray,
     chunk_duration = float(os.getenv("TTS_CHUNK_DURATION", "0.1"))
     chunk_size = int(sr * chunk_duration)
     
+    if format_type == "opus":
+        encoder = OpusStreamEncoder(sr, bitrate)
+        encoded = []
+        for i in range(0, len(audio_data), chunk_size):
+            packets = await encoder.encode_async(audio_data[i:i + chunk_size], final=i + chunk_size >= len(audio_data))
+            if packets:
+                message = pack_packets(packets)
+                encoded.append(message)
+                await pacer.send(websocket.send_bytes, message, len(packets) * OPUS_PACKET_MS / 1000)
+        return b"".join(encoded)
+    
+    resampler = StreamingResampler(sr, output_sr) if output_sr != sr else None
+    
     for i in range(0, len(audio_data), chunk_size):
         chunk = audio_data[i:i + chunk_size]
+        if resampler is not None:
+            chunk = resampler.process(chunk)
+            if i + chunk_size >= len(audio_data):
+                chunk = np.concatenate([chunk, resampler.flush()])
         
         if format_type == "pcm":
-            chunk_int16 = (chunk * 32767).astype('int16')
-            await websocket.send_bytes(chunk_int16.tobytes())
+            chunk_int16 = (np.clip(chunk, -1.0, 1.0) * 32767).astype('int16')
+            await pacer.send(websocket.send_bytes, chunk_int16.tobytes(), len(chunk) / output_sr)
         else:
-            await websocket.send_bytes(chunk.astype('float32').tobytes())
-        
-        await asyncio.sleep(0.01)
+            await pacer.send(websocket.send_bytes, chunk.astype('float32').tobytes(), len(chunk) / output_sr)
 
 async def _process_text_parallel(model: Zonos, base_conditioning: torch.Tensor, request_data: Dict) -> List[np.ndarray]:
     """텍스트 병렬 처리"""
@@ -774,9 +1392,16 @@ async def lifespan(app: FastAPI):
             default_model = os.getenv("DEFAULT_TTS_MODEL", supported_models[0])
             await model_cache.load_model_with_progress(default_model)
             logger.info("✅ 기본 모델 미리 로드 완료")
+            if FILLER_AUDIO_ENABLED:
+                filler_bank.schedule(None, _synthesize_fillers)
         except Exception as e:
             logger.warning(f"⚠️ 기본 모델 미리 로드 실패: {e}")
     
+    # 🎤 스피커 클로닝 모델 백그라운드 로드 (첫 클로닝 요청의 로딩 지연 제거)
+    if os.getenv("ENABLE_VOICE_CLONING", "true").lower() == "true":
+        voice_manager.speaker_model_loader.start()
+        logger.info("📥 스피커 클로닝 모델 백그라운드 로드 시작")
+    
     # GPT 서비스 초기화
     gpt_api_key = os.getenv("DEEPSEEK_API_KEY")
     if gpt_api_key:
@@ -796,19 +1421,28 @@ async def lifespan(app: FastAPI):
     # 대화형 WebSocket 의존성 주입
     set_dependencies({
         'model_cache': model_cache,
+        'voice_manager': voice_manager,
         'make_cond_dict': make_cond_dict,
         'device': device,
         'log_user_message': log_user_message,
         'log_assistant_message': log_assistant_message,
         'log_system_message': log_system_message,
+        'log_audio_generation': log_audio_generation,
         'get_gpt_service': get_gpt_service,
-        'get_stt_service': get_stt_service
+        'get_stt_service': get_stt_service,
+        'filler_bank': filler_bank if FILLER_AUDIO_ENABLED else None,
+        'synthesize_fillers': _synthesize_fillers,
+        'artifact_store': artifact_store,
+        'tts_admission': tts_admission
     })
     
     yield
     
     # 종료 시 정리
     logger.info("🛑 Shutting down Enhanced Zonos FastAPI server...")
+    if not tts_cache.flush(timeout=10.0):
+        logger.warning("⚠️ TTS 캐시 기록이 모두 완료되지 않았습니다")
+    voice_manager.embedding_store.flush()
     model_cache.models.clear()
     if torch.cuda.is_available():
         torch.cuda.empty_cache()
@@ -826,6 +1460,8 @@ add_stt_routes(app)
 add_gpt_routes(app)
 add_firebase_routes(app)
 add_conversation_routes(app)
+if artifact_store is not None:
+    add_artifact_routes(app, artifact_store)
 
 # CORS 설정
 allowed_origins = os.getenv("ALLOWED_ORIGINS", '["*"]')
@@ -858,6 +1494,18 @@ class TTSRequest(BaseModel):
     cfg_scale: float = 2.0
     seed: int = 420
     randomize_seed: bool = True
+    voice_id: Optional[str] = None
+    output_sample_rate: Optional[int] = None
+    bitrate: Optional[int] = None
+
+class TTSJobItem(BaseModel):
+    text: str
+    settings: Dict[str, Any] = {}  # 이 항목만의 목소리/감정 등 (공유 설정을 덮어씀)
+
+class TTSJobRequest(BaseModel):
+    texts: list[str] = []
+    items: list[TTSJobItem] = []
+    settings: Dict[str, Any] = {}  # 모든 항목 공유 설정 (/ws/tts 요청과 같은 키: model, voice_id, emotion, ...)
 
 class ModelInfoResponse(BaseModel):
     supported_models: list[str]
@@ -936,6 +1584,85 @@ async def preload_model(model_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/tts/stream")
+async def stream_tts(request: TTSRequest, accept: Optional[str] = Header(None)):
+    """HTTP 청크 스트리밍 TTS (WAV / L16 PCM / Ogg Opus, Accept 헤더 또는 format으로 선택)
+    
+    /ws/tts와 같은 생성 경로(캐시, 문장 캐시, single-flight, 생성 동시 실행 제한)를 사용하므로
+    캐시 히트는 캐시 저장소에서 바로 전송되고, 생성된 오디오는 만들어지는 대로 본문에 기록됩니다.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Empty text provided")
+    
+    container = _negotiate_stream_format(accept, request.format)
+    if container is None:
+        raise HTTPException(status_code=406, detail=f"지원하는 형식: {', '.join(sorted(HTTP_STREAM_MEDIA_TYPES))}")
+    
+    if tts_admission.saturated:
+        raise HTTPException(status_code=503, detail="TTS 생성 대기열이 가득 찼습니다", headers={"Retry-After": "1"})
+    
+    request_data = request.model_dump()
+    request_data["format"] = "opus" if container == "opus" else "pcm"
+    try:
+        model, conditioning, make_sentence_conditioning = await _prepare_request_conditioning(request_data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    sr = model.autoencoder.sampling_rate
+    sender = HTTPAudioSender(container, sr if container == "opus" else resolve_output_rate(request.output_sample_rate, sr))
+    # 재생 ack가 없으므로 pacer는 기다리지 않음 (송신 조절은 본문 큐 backpressure에 맡김)
+    pacer = PlaybackPacer(lead_seconds=float("inf"))
+    
+    async def produce():
+        await ultra_optimized_stream_audio_generation(
+            sender, model, conditioning, request_data, request_data["format"], "http",
+            make_sentence_conditioning=make_sentence_conditioning,
+            pacer=pacer
+        )
+    
+    await sender.start(produce)
+    return StreamingResponse(
+        sender.stream(),
+        media_type=sender.content_type,
+        headers={"Cache-Control": "no-store"}
+    )
+
+@app.post("/api/tts/jobs", status_code=202)
+async def create_tts_job(request: TTSJobRequest):
+    """배치 합성 작업 등록 - 결과는 TTS 캐시에 기록되고 진행률은 GET /api/tts/jobs/{job_id}로 조회"""
+    shared = dict(request.settings)
+    shared.setdefault("model", "Zyphra/Zonos-v0.1-transformer")
+    items = [dict(shared, text=text) for text in request.texts]
+    items += [{**shared, **item.settings, "text": item.text} for item in request.items]
+    items = [item for item in items if item["text"].strip()]
+    
+    try:
+        job = job_manager.submit(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "total": len(items),
+        "status_url": f"/api/tts/jobs/{job.id}"
+    }
+
+@app.get("/api/tts/jobs/{job_id}")
+async def get_tts_job(job_id: str, items: bool = False):
+    """배치 합성 작업 진행률 (items=true면 항목별 상태 포함)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_items=items)
+
+@app.delete("/api/tts/jobs/{job_id}")
+async def cancel_tts_job(job_id: str):
+    """배치 합성 작업 취소 (진행 중인 배치가 끝난 뒤 중단)"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
 # 🎤 목소리 관리 API 엔드포인트들
 @app.get("/api/tts/voices")
 async def get_available_voices():
@@ -1023,14 +1750,44 @@ async def upload_voice_file(file: UploadFile = File(...)):
                 }
             )
         
+        # 🔁 업로드 중복 제거: 기존 목소리와 사실상 같으면 재사용 (임베딩/웜업/저장 생략)
+        # (클로닝 모델이 아직 로딩 중이면 업로드를 지연시키지 않고 건너뜀)
+        speaker_embedding = None
+        if voice_manager.speaker_model_loader.is_ready():
+            try:
+                loop = asyncio.get_event_loop()
+                speaker_embedding = await loop.run_in_executor(
+                    None, voice_manager.embed_audio_bytes, file_content
+                )
+                duplicate = voice_manager.find_duplicate_voice(speaker_embedding)
+                if duplicate:
+                    logger.info(f"🔁 중복 목소리 업로드 감지: {duplicate['voice_id']} (유사도 {duplicate['similarity']})")
+                    return JSONResponse(content={
+                        "status": "success",
+                        "voice_id": duplicate["voice_id"],
+                        "message": "기존 목소리와 동일하여 재사용합니다",
+                        "deduplicated": True,
+                        "similarity": duplicate["similarity"],
+                        "filename": file.filename,
+                        "timestamp": time.time()
+                    })
+            except Exception as e:
+                logger.warning(f"⚠️ 업로드 중복 검사 실패 (무시): {e}")
+                speaker_embedding = None
+        
         # 목소리 추가
-        voice_id = await voice_manager.add_voice_from_file(file_content, file.filename)
+        voice_id = await voice_manager.add_voice_from_file(file_content, file.filename, speaker_embedding)
         logger.info(f"✅ 목소리 업로드 성공: {voice_id}")
         
+        # 💬 새 목소리의 대기 음성 백그라운드 생성
+        if FILLER_AUDIO_ENABLED:
+            filler_bank.schedule(voice_id, _synthesize_fillers)
+        
         response_data = {
             "status": "success",
             "voice_id": voice_id,
             "message": "목소리 업로드 성공",
+            "deduplicated": False,
             "filename": file.filename,
             "file_size_mb": round(len(file_content) / (1024 * 1024), 2),
             "timestamp": time.time()
@@ -1049,6 +1806,49 @@ async def upload_voice_file(file: UploadFile = File(...)):
             }
         )
 
+@app.post("/api/tts/voices/similar")
+async def find_similar_voices(file: Optional[UploadFile] = File(None), voice_id: Optional[str] = None, k: int = 5):
+    """샘플 오디오 또는 기존 voice_id와 가장 유사한 목소리 검색"""
+    try:
+        if voice_id:
+            stored = voice_manager.embedding_store.get(voice_id)
+            if stored is None:
+                return JSONResponse(
+                    status_code=404,
+                    content={"status": "error", "message": f"임베딩이 없는 목소리입니다: {voice_id}"}
+                )
+            speaker_embedding = torch.from_numpy(stored)
+            matches = [m for m in voice_manager.find_similar_voices(speaker_embedding, k + 1) if m["voice_id"] != voice_id][:k]
+        elif file is not None:
+            file_content = await file.read()
+            await voice_manager.speaker_model_loader.get()
+            loop = asyncio.get_event_loop()
+            speaker_embedding = await loop.run_in_executor(
+                None, voice_manager.embed_audio_bytes, file_content
+            )
+            matches = voice_manager.find_similar_voices(speaker_embedding, k)
+        else:
+            return JSONResponse(
+                status_code=400,
+                content={"status": "error", "message": "file 또는 voice_id가 필요합니다"}
+            )
+        
+        return {
+            "status": "success",
+            "data": {
+                "matches": matches,
+                "duplicate_threshold": voice_manager.dedup_threshold,
+                "indexed_voices": len(voice_manager.voice_index)
+            },
+            "timestamp": time.time()
+        }
+    except Exception as e:
+        logger.error(f"❌ 유사 목소리 검색 실패: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "error", "message": f"유사 목소리 검색 실패: {str(e)}", "error_type": type(e).__name__}
+        )
+
 @app.get("/api/tts/emotions")
 async def get_emotion_presets():
     """사용 가능한 감정 프리셋 목록 반환"""
@@ -1089,7 +1889,8 @@ async def get_voice_cache_stats():
         stats = voice_manager.get_cache_stats()
         return {
             "status": "success",
-            "cache_stats": stats
+            "cache_stats": stats,
+            "filler_audio": filler_bank.get_stats() if FILLER_AUDIO_ENABLED else None
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1099,13 +1900,15 @@ async def get_voice_cache_stats():
 async def enhanced_websocket_tts(websocket: WebSocket, client_id: str):
     """개선된 WebSocket TTS 엔드포인트 - GPU/CPU 최적화"""
     await tts_manager.connect(websocket, client_id)
+    # 모든 송신은 연결별 송신 큐를 거침 (생성/스트리밍 코드는 네트워크 전송을 기다리지 않음)
+    outbound = tts_manager.outbound[client_id]
     
     # 연결 시 캐시 통계 전송
     cache_stats = tts_cache.get_cache_stats()
     
     # 연결 성공 메시지 전송
     try:
-        await websocket.send_json({
+        await outbound.send_json({
             "type": "connection_established",
             "client_id": client_id,
             "server_info": {
@@ -1115,6 +1918,7 @@ async def enhanced_websocket_tts(websocket: WebSocket, client_id: str):
                 "version": "2.1.0-optimized",
                 "performance_mode": "🚀 GPU 최적화" if device.type == "cuda" else "🔧 CPU",
                 "cache_stats": cache_stats,
+                "output_formats": OUTPUT_FORMATS,
                 "optimizations": {
                     "caching": True,
                     "parallel_processing": True,
@@ -1129,152 +1933,203 @@ async def enhanced_websocket_tts(websocket: WebSocket, client_id: str):
         tts_manager.disconnect(client_id)
         return
     
+    async def handle_request(request_data: Dict[str, Any], sender=outbound, pacer: Optional[PlaybackPacer] = None):
+        """요청 1건 처리 (생성 + 스트리밍) - 동시 요청이면 sender/pacer는 요청 전용"""
+        text = request_data.get("text", "")
+        format_type = request_data.get("format", "pcm")
+        
+        if not text.strip():
+            try:
+                await sender.send_json({
+                    "type": "error",
+                    "error": "Empty text provided",
+                    "error_code": "EMPTY_TEXT"
+                })
+            except:
+                logger.error(f"❌ 빈 텍스트 오류 메시지 전송 실패")
+            return
+        
+        model, conditioning, make_sentence_conditioning = await _prepare_request_conditioning(request_data, sender)
+        
+        # 🚀 울트라 최적화된 오디오 생성 및 스트리밍 (클라이언트 재생 위치에 맞춰 송신)
+        await ultra_optimized_stream_audio_generation(
+            sender, model, conditioning, request_data, format_type, client_id,
+            make_sentence_conditioning=make_sentence_conditioning,
+            pacer=pacer or tts_manager.pacers.get(client_id)
+        )
+        
+        # 완료 신호
+        try:
+            await sender.send_json({
+                "type": "generation_complete",
+                "message": "Audio generation completed successfully",
+                "device": str(device)
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ 완료 신호 전송 실패: {e}")
+    
+    # 스트리밍 중에도 playback_ack/stop/ping을 읽을 수 있도록 생성은 별도 태스크에서 처리
+    # request_id가 없는 요청은 기존처럼 워커 하나가 순서대로 처리
+    requests_queue: asyncio.Queue = asyncio.Queue()
+    
+    async def report_error(sender, e: Exception):
+        logger.error(f"❌ TTS WebSocket error: {e}")
+        try:
+            await sender.send_json({
+                "type": "error",
+                "error": str(e),
+                "error_code": "TTS_BUSY" if isinstance(e, AdmissionRejected) else "TTS_ERROR"
+            })
+        except:
+            logger.error(f"❌ TTS 오류 메시지 전송 실패")
+    
+    async def request_worker():
+        while True:
+            request_data = await requests_queue.get()
+            try:
+                await handle_request(request_data)
+            except Exception as e:
+                await report_error(outbound, e)
+    
+    worker = asyncio.create_task(request_worker())
+    
+    # 🔀 request_id가 있는 요청은 요청별 태스크로 동시 처리 (생성은 TTS_MAX_INFLIGHT개까지, 나머지는 대기)
+    inflight: Dict[Any, Tuple[asyncio.Task, PlaybackPacer]] = {}
+    inflight_slots = asyncio.Semaphore(TTS_MAX_INFLIGHT)
+    
+    async def run_multiplexed(request_id: Any, request_data: Dict[str, Any], pacer: PlaybackPacer):
+        sender = MultiplexedSender(outbound, request_id)
+        try:
+            async with inflight_slots:
+                await handle_request(request_data, sender, pacer)
+        except asyncio.CancelledError:
+            await outbound.send_json({
+                "type": "generation_cancelled",
+                "request_id": request_id,
+                "stream_id": pacer.stream_id
+            }, priority=PRIORITY_CONTROL)
+        except Exception as e:
+            await report_error(sender, e)
+        finally:
+            inflight.pop(request_id, None)
+    
+    def start_multiplexed(request_id: Any, request_data: Dict[str, Any]) -> Optional[str]:
+        """요청 태스크 시작 (거절 시 오류 코드 반환)"""
+        if request_id in inflight:
+            return "DUPLICATE_REQUEST_ID"
+        if len(inflight) >= TTS_MAX_QUEUED_REQUESTS:
+            return "TOO_MANY_REQUESTS"
+        pacer = tts_manager.new_pacer(client_id)
+        task = asyncio.create_task(run_multiplexed(request_id, request_data, pacer))
+        inflight[request_id] = (task, pacer)
+        return None
+    
+    def find_pacer(ack: Dict[str, Any]) -> Optional[PlaybackPacer]:
+        """ack의 request_id 또는 stream_id로 해당 요청의 pacer 찾기"""
+        if ack.get("request_id") in inflight:
+            return inflight[ack["request_id"]][1]
+        for _, pacer in inflight.values():
+            if pacer.stream_id == ack.get("stream_id"):
+                return pacer
+        return tts_manager.pacers.get(client_id)
+    
     try:
         while True:
             data = await websocket.receive_text()
             
             if data == "stop":
+                for task, _ in list(inflight.values()):
+                    task.cancel()
                 try:
-                    await websocket.send_json({
+                    await outbound.send_json({
                         "type": "generation_stopped",
                         "message": "Audio generation stopped by user"
-                    })
+                    }, priority=PRIORITY_CONTROL)
                 except:
                     logger.warning(f"⚠️ stop 메시지 전송 실패")
                 continue
                 
             if data == "ping":
                 try:
-                    await websocket.send_json({
+                    await outbound.send_json({
                         "type": "pong",
                         "timestamp": time.time(),
                         "device": str(device)
-                    })
+                    }, priority=PRIORITY_CONTROL)
                 except:
                     logger.warning(f"⚠️ pong 메시지 전송 실패")
                 continue
                 
             try:
                 request_data = json.loads(data)
-                text = request_data.get("text", "")
-                model_choice = request_data.get("model", "Zyphra/Zonos-v0.1-transformer")
-                format_type = request_data.get("format", "pcm")
-                
-                if not text.strip():
-                    try:
-                        await websocket.send_json({
-                            "type": "error",
-                            "error": "Empty text provided",
-                            "error_code": "EMPTY_TEXT"
-                        })
-                    except:
-                        logger.error(f"❌ 빈 텍스트 오류 메시지 전송 실패")
-                    continue
-                
-                # 모델 로드 (프로그레스바 포함)
-                model = await model_cache.load_model_with_progress(model_choice, websocket)
-                
-                # 시드 설정
-                seed = request_data.get("seed", 420)
-                if request_data.get("randomize_seed", True):
-                    seed = torch.randint(0, 2**32 - 1, (1,)).item()
-                torch.manual_seed(seed)
-                
-                # 🎤 목소리 처리
-                speaker_embedding = await voice_manager.process_voice_request(request_data, model)
-                
-                # 😊 감정 처리 개선
-                emotion_preset = request_data.get("emotion_preset")
-                emotion_custom = request_data.get("emotion")
-                emotion = EmotionManager.get_emotion_vector(emotion_preset, emotion_custom)
-                enable_emotion = request_data.get("enable_emotion", True)
-                
-                # unconditional_keys 동적 설정
-                unconditional_keys = {"vqscore_8", "dnsmos_ovrl"}
-                if not enable_emotion:
-                    unconditional_keys.add("emotion")
-                
-                # 컨디셔닝 설정
-                cond_dict = make_cond_dict(
-                    text=text,
-                    language=request_data.get("language", "ko"),
-                    speaker=speaker_embedding,  # 🎤 목소리 적용
-                    emotion=emotion,  # 😊 감정 적용
-                    fmax=request_data.get("fmax", 22050.0),
-                    pitch_std=request_data.get("pitch_std", 20.0),
-                    speaking_rate=request_data.get("speaking_rate", 15.0),
-                    vqscore_8=request_data.get("vqscore_8", [0.78] * 8),
-                    dnsmos_ovrl=request_data.get("dnsmos_ovrl", 4.0),
-                    device=device,
-                    unconditional_keys=unconditional_keys  # 동적 설정
-                )
-                
-                conditioning = model.prepare_conditioning(cond_dict)
-                
-                # 🚀 울트라 최적화된 오디오 생성 및 스트리밍
-                await ultra_optimized_stream_audio_generation(
-                    websocket, model, conditioning, request_data, format_type, client_id
-                )
-                
-                # 완료 신호
-                try:
-                    await websocket.send_json({
-                        "type": "generation_complete",
-                        "message": "Audio generation completed successfully",
-                        "device": str(device)
-                    })
-                except Exception as e:
-                    logger.warning(f"⚠️ 완료 신호 전송 실패: {e}")
-                
             except json.JSONDecodeError:
                 try:
-                    await websocket.send_json({
+                    await outbound.send_json({
                         "type": "error",
                         "error": "Invalid JSON format",
                         "error_code": "JSON_DECODE_ERROR"
-                    })
+                    }, priority=PRIORITY_CONTROL)
                 except:
                     logger.error(f"❌ JSON 오류 메시지 전송 실패")
-            except Exception as e:
-                logger.error(f"❌ TTS WebSocket error: {e}")
-                try:
-                    await websocket.send_json({
+                continue
+            
+            # 📡 클라이언트 재생 위치 보고
+            if request_data.get("type") == "playback_ack":
+                pacer = find_pacer(request_data)
+                if pacer:
+                    pacer.on_ack(request_data.get("played_seconds", 0.0), request_data.get("stream_id"))
+                continue
+            
+            # ✋ 요청 하나만 취소
+            if request_data.get("type") == "cancel":
+                request_id = request_data.get("request_id")
+                if request_id in inflight:
+                    inflight[request_id][0].cancel()
+                else:
+                    await outbound.send_json({
                         "type": "error",
-                        "error": str(e),
-                        "error_code": "TTS_ERROR"
-                    })
-                except:
-                    logger.error(f"❌ TTS 오류 메시지 전송 실패")
+                        "error": f"Unknown request_id: {request_id}",
+                        "error_code": "UNKNOWN_REQUEST_ID",
+                        "request_id": request_id
+                    }, priority=PRIORITY_CONTROL)
+                continue
+            
+            request_id = request_data.get("request_id")
+            if request_id is None:
+                requests_queue.put_nowait(request_data)
+                continue
+            
+            error_code = start_multiplexed(request_id, request_data)
+            if error_code:
+                await outbound.send_json({
+                    "type": "error",
+                    "error": f"Request {request_id} rejected",
+                    "error_code": error_code,
+                    "request_id": request_id
+                }, priority=PRIORITY_CONTROL)
                 
     except WebSocketDisconnect:
         tts_manager.disconnect(client_id)
     except Exception as e:
         logger.error(f"❌ WebSocket connection error: {e}")
         tts_manager.disconnect(client_id)
+    finally:
+        worker.cancel()
+        for task, _ in list(inflight.values()):
+            task.cancel()
 
 # 캐시 및 성능 API 엔드포인트들
 @app.get("/api/cache/stats")
 async def get_cache_stats():
     """캐시 통계 조회"""
-    return tts_cache.get_cache_stats()
+    return dict(tts_cache.get_cache_stats(), single_flight=tts_singleflight.get_stats())
 
 @app.post("/api/cache/clear")
 async def clear_cache():
     """캐시 완전 삭제"""
     try:
-        # 메모리 캐시 클리어
-        tts_cache.memory_cache.clear()
-        tts_cache.cache_metadata.clear()
-        tts_cache.access_times.clear()
-        
-        # 디스크 캐시 파일들 삭제
-        import shutil
-        if tts_cache.cache_dir.exists():
-            shutil.rmtree(tts_cache.cache_dir)
-            tts_cache.cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        tts_cache.cache_hits = 0
-        tts_cache.cache_misses = 0
+        # 메모리 캐시 + 디스크 세그먼트 삭제 (대기 중인 기록을 먼저 비우므로 executor에서)
+        await asyncio.get_event_loop().run_in_executor(None, tts_cache.clear)
         
         return {"status": "success", "message": "캐시가 완전히 삭제되었습니다"}
     except Exception as e:
@@ -1290,6 +2145,10 @@ async def get_performance_stats():
             "device_name": torch.cuda.get_device_name() if torch.cuda.is_available() else None,
             "memory_usage": model_cache._get_memory_usage()
         },
+        "send_queues": {client_id: outbound.get_stats() for client_id, outbound in tts_manager.outbound.items()},
+        "admission": tts_admission.get_stats(),
+        "batch_jobs": job_manager.get_stats(),
+        "audio_artifacts": artifact_store.get_stats() if artifact_store else None,
         "model_info": {
             "loaded_models": list(model_cache.models.keys()),
             "warmed_up_models": list(model_cache.warmup_completed) if hasattr(model_cache, 'warmup_completed') else []
@@ -0,0 +1,180 @@
+# outbound_queue.py - 연결별 송신 큐 + 전용 writer 태스크 (생성 코드가 네트워크 속도에 묶이지 않도록)
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CONTROL = 0  # pong/중단/오류 등 - 대기 중인 오디오보다 먼저 전송
+PRIORITY_STREAM = 1   # 메타데이터/오디오/완료 신호 - 서로 순서 유지
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+SEND_QUEUE_MAX = int(os.getenv("WS_SEND_QUEUE_MAX", "512"))
+SEND_QUEUE_OVERFLOW = os.getenv("WS_SEND_QUEUE_OVERFLOW", "drop_oldest")
+
+
+class OutboundQueue:
+    """WebSocket 하나의 송신을 전담하는 bounded 큐
+
+    send_json/send_bytes/send_text는 WebSocket과 같은 이름의 코루틴이지만 큐에 넣기만 하고
+    바로 돌아오므로, 기존 코드에 websocket 대신 넘겨 그대로 쓸 수 있습니다.
+    writer 태스크 하나가 PRIORITY_CONTROL 메시지를 먼저, 그다음 스트림 메시지를 넣은 순서대로 보냅니다.
+
+    스트림 메시지가 max_messages를 넘으면 overflow 정책을 적용합니다.
+      drop_oldest: 가장 오래된 오디오(바이너리) 메시지를 버림 (JSON은 유지)
+      drop_newest: 새 오디오 메시지를 버림
+      disconnect:  느린 클라이언트 연결을 닫음
+    전송이 실패하면 큐를 닫기만 하고 연결 정리는 수신 루프(WebSocketDisconnect)에 맡깁니다.
+
+    writer가 전송마다 걸린 시간(소켓 버퍼가 차면 길어짐)으로 연결 처리량(throughput_bps)도 추정합니다.
+    """
+
+    MIN_SEND_SECONDS = 0.002  # 버퍼에 바로 들어간 전송은 이 시간으로 계산 (처리량 상한)
+    THROUGHPUT_ALPHA = 0.2
+
+    def __init__(self, websocket: WebSocket, max_messages: int = SEND_QUEUE_MAX, overflow: str = SEND_QUEUE_OVERFLOW):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow} ({', '.join(OVERFLOW_POLICIES)})")
+        self.websocket = websocket
+        self.max_messages = max_messages
+        self.overflow = overflow
+        self._control: Deque[Tuple[str, Any]] = deque()
+        self._stream: Deque[Tuple[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.throughput_samples = 0
+        self._throughput = 0.0
+
+    def start(self) -> "OutboundQueue":
+        if self._task is None:
+            self._task = asyncio.create_task(self._writer())
+        return self
+
+    # WebSocket 호환 송신 (큐에 넣고 바로 반환)
+    async def send_json(self, data: Any, priority: int = PRIORITY_STREAM) -> bool:
+        return self.put("json", data, priority)
+
+    async def send_bytes(self, data: Any, priority: int = PRIORITY_STREAM) -> bool:
+        return self.put("bytes", data, priority)
+
+    async def send_text(self, data: str, priority: int = PRIORITY_STREAM) -> bool:
+        return self.put("text", data, priority)
+
+    def put(self, kind: str, data: Any, priority: int = PRIORITY_STREAM) -> bool:
+        """메시지를 큐에 넣음 (닫혔거나 정책에 따라 버려지면 False)"""
+        if self.closed:
+            return False
+        if priority == PRIORITY_CONTROL:
+            self._control.append((kind, data))
+        else:
+            if len(self._stream) >= self.max_messages and not self._make_room(kind):
+                return False
+            self._stream.append((kind, data))
+        self.max_depth = max(self.max_depth, len(self))
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def _make_room(self, kind: str) -> bool:
+        """overflow 정책 적용 (새 메시지를 넣어도 되면 True)"""
+        if self.overflow == "drop_oldest":
+            for index, (queued_kind, _) in enumerate(self._stream):
+                if queued_kind == "bytes":
+                    del self._stream[index]
+                    self.dropped += 1
+                    return True
+        elif self.overflow == "drop_newest" and kind == "bytes":
+            self.dropped += 1
+            return False
+        # 버릴 오디오가 없거나 disconnect 정책 -> 느린 클라이언트 연결 종료
+        logger.warning(f"⚠️ 송신 큐 포화 ({len(self._stream)}개) - 연결 종료")
+        self.close(code=1013)
+        return False
+
+    def __len__(self) -> int:
+        return len(self._control) + len(self._stream)
+
+    @property
+    def throughput_bps(self) -> Optional[float]:
+        """측정된 연결 처리량 (bit/s, 표본이 부족하면 None)"""
+        return self._throughput if self.throughput_samples >= 3 else None
+
+    def _record_send(self, size: int, elapsed: float):
+        rate = size * 8 / max(elapsed, self.MIN_SEND_SECONDS)
+        if self.throughput_samples == 0:
+            self._throughput = rate
+        else:
+            self._throughput += self.THROUGHPUT_ALPHA * (rate - self._throughput)
+        self.throughput_samples += 1
+
+    async def _writer(self):
+        while True:
+            if not len(self):
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            kind, data = self._control.popleft() if self._control else self._stream.popleft()
+            try:
+                started = time.monotonic()
+                if kind == "json":
+                    await self.websocket.send_json(data)
+                elif kind == "bytes":
+                    await self.websocket.send_bytes(data)
+                    self._record_send(len(data), time.monotonic() - started)
+                else:
+                    await self.websocket.send_text(data)
+                self.sent += 1
+            except Exception as e:
+                logger.warning(f"⚠️ 송신 실패 - 송신 큐 종료: {e}")
+                self.close()
+                return
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """큐가 빌 때까지 대기 (닫히기 전 마지막 메시지를 보낼 때)"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self, code: Optional[int] = None):
+        """writer 중단 및 대기 메시지 폐기 (code가 주어지면 소켓도 닫음)"""
+        if self.closed:
+            return
+        self.closed = True
+        self._control.clear()
+        self._stream.clear()
+        self._idle.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if code is not None:
+            asyncio.ensure_future(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+    def get_stats(self) -> dict:
+        return {
+            "queued": len(self),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "closed": self.closed,
+            "overflow": self.overflow,
+            "throughput_kbps": round(self._throughput / 1000, 1) if self.throughput_samples else None,
+        }
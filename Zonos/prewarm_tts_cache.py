@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+TTS 캐시 사전 생성(pre-warming) 도구
+
+conversation_logs (Firestore 또는 로컬 JSON/JSONL 내보내기)에서 어시스턴트 문장을
+목소리/감정 설정별로 집계해 자주 나오는 상위 N개를 배치 생성하고 AdvancedTTSCache에 기록합니다.
+캐시 키와 생략된 설정의 기본값은 /ws/tts(및 /api/tts/stream) 요청 기준이므로 데워지는 것은 이 경로뿐이며,
+대화 WebSocket의 문장 합성은 TTS 캐시를 거치지 않습니다.
+업로드한 목소리(로그에는 voice_audio_md5만 남음)는 목소리를 되살릴 수 없어 건너뜁니다.
+서버와 같은 환경 변수(TTS_CACHE_*)를 사용하므로 캐시 키가 그대로 일치합니다.
+트래픽이 적은 시간대에 cron 등으로 실행하세요.
+
+사용 예:
+    python prewarm_tts_cache.py --days 7 --top-n 200 --dry-run
+    python prewarm_tts_cache.py --export logs.jsonl --top-n 100 --max-minutes 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import torch
+
+from main import (
+    batch_generator, device, model_cache, parallel_processor, tts_cache, voice_manager,
+    _make_request_cond_dict, _phoneme_cache_key, _tts_cache_settings
+)
+from firebase_service import initialize_firebase_service
+
+DEFAULT_MODEL = "Zyphra/Zonos-v0.1-transformer"
+FRAME_RATE = 86  # DAC 44.1kHz 코드 프레임/초
+NUM_CODEBOOKS = 9
+
+
+def load_firestore_logs(days: int, limit: int) -> Iterable[Dict[str, Any]]:
+    """Firestore conversation_logs에서 최근 어시스턴트 메시지 조회"""
+    firebase = initialize_firebase_service(os.getenv("FIREBASE_CREDENTIALS_PATH"))
+    if not firebase.is_available():
+        raise RuntimeError("Firebase를 사용할 수 없습니다 (--export로 로컬 내보내기 파일을 지정하세요)")
+
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    query = (firebase.db.collection('conversation_logs')
+             .where('role', '==', 'assistant')
+             .where('timestamp', '>=', since)
+             .limit(limit))
+    for doc in query.stream():
+        yield doc.to_dict()
+
+
+def load_exported_logs(path: str) -> Iterable[Dict[str, Any]]:
+    """로컬 내보내기 (JSON 배열 또는 JSONL) 로드"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def log_request_data(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """로그 메타데이터 -> /ws/tts 요청과 같은 형태의 설정 (목소리를 되살릴 수 없으면 None)"""
+    metadata = log.get('metadata') or {}
+    request_data = dict(metadata.get('tts_params') or {})
+    if request_data.get('voice_audio_md5') and not request_data.get('voice_id'):
+        return None
+    request_data['model'] = request_data.get('model') or metadata.get('model') or DEFAULT_MODEL
+    request_data['language'] = metadata.get('language') or request_data.get('language', 'ko')
+    return request_data
+
+
+def mine_sentences(
+    logs: Iterable[Dict[str, Any]], message_type: str, top_n: int
+) -> List[Tuple[Dict[str, Any], List[Tuple[str, int]]]]:
+    """목소리/감정 설정별 상위 N개 문장: [(request_data, [(sentence, count), ...]), ...]"""
+    profiles: Dict[str, Dict[str, Any]] = {}
+    counters: Dict[str, Counter] = {}
+    skipped = 0
+
+    for log in logs:
+        if log.get('role', 'assistant') != 'assistant' or not log.get('content'):
+            continue
+        if message_type and (log.get('metadata') or {}).get('type') != message_type:
+            continue
+        request_data = log_request_data(log)
+        if request_data is None:
+            skipped += 1
+            continue
+        profile = json.dumps(_tts_cache_settings(request_data), sort_keys=True, ensure_ascii=False)
+        profiles.setdefault(profile, request_data)
+        counter = counters.setdefault(profile, Counter())
+        for sentence in parallel_processor.text_splitter.split_sentences(log['content']):
+            counter[sentence] += 1
+
+    if skipped:
+        print(f"⏭️ 업로드한 목소리라 되살릴 수 없는 로그 {skipped}개 건너뜀")
+    return [(profiles[profile], counter.most_common(top_n)) for profile, counter in counters.items()]
+
+
+def estimate_bytes(sentence: str, request_data: Dict[str, Any], sample_rate: int) -> int:
+    """발화 길이(음소 수 / speaking_rate) 기반 캐시 기록 크기 추정"""
+    phonemes = _phoneme_cache_key(sentence, request_data.get('language', 'ko'))
+    seconds = len(phonemes) / max(float(request_data.get('speaking_rate', 15.0)), 1.0)
+    if tts_cache.cache_mode == "codes":
+        return int(seconds * FRAME_RATE) * NUM_CODEBOOKS * 2
+    return int(seconds * sample_rate) * 2
+
+
+async def synthesize_profile(request_data: Dict[str, Any], ranked: List[Tuple[str, int]], deadline: float) -> int:
+    """한 설정(목소리/감정)의 문장들을 배치 생성해 캐시에 기록"""
+    model_name = request_data['model']
+    cache_settings = _tts_cache_settings(request_data)
+    sentences = [sentence for sentence, _ in ranked]
+
+    # 로그 빈도를 입장 정책에 반영 (캐시가 가득 차 있어도 인기 문장이 밀려나지 않도록)
+    for sentence, count in ranked:
+        tts_cache.record_access(sentence, model_name, cache_settings, count)
+
+    model = model_cache.load_model_if_needed(model_name)
+    speaker_embedding = await voice_manager.process_voice_request(request_data, model)
+    cond_dict = _make_request_cond_dict(request_data, sentences[0], speaker_embedding)
+    language = request_data.get('language', 'ko')
+    sr = model.autoencoder.sampling_rate
+
+    written = 0
+    for start in range(0, len(sentences), batch_generator.max_batch_size):
+        if time.time() > deadline:
+            print("⏰ 시간 제한 도달 - 중단")
+            break
+        batch = sentences[start:start + batch_generator.max_batch_size]
+        conditioning = model.prepare_conditioning(dict(cond_dict, espeak=(batch, [language] * len(batch))))
+        with torch.autocast(device_type=device.type, enabled=device.type == 'cuda'):
+            results = batch_generator.generate(
+                model, conditioning, batch,
+                cfg_scale=request_data.get("cfg_scale", 2.0),
+                sampling_params=dict(min_p=0.1, temperature=0.8)
+            )
+        for sentence, (audio, codes) in zip(batch, results):
+            tts_cache.save_cached_audio(sentence, model_name, cache_settings, audio, sr, codes=codes)
+            written += 1
+        tts_cache.flush(timeout=30.0)  # 쓰기 큐가 넘쳐 기록이 버려지지 않도록 배치마다 비움
+        print(f"📊 [{written}/{len(sentences)}] {model_name} / {cache_settings['voice'] or '기본 목소리'}")
+    return written
+
+
+async def run(args):
+    logs = load_exported_logs(args.export) if args.export else load_firestore_logs(args.days, args.limit)
+    plan = mine_sentences(logs, args.message_type, args.top_n)
+
+    # 이미 캐시에 있는 문장 제외
+    todo = []
+    for request_data, ranked in plan:
+        settings = _tts_cache_settings(request_data)
+        ranked = [(s, count) for s, count in ranked
+                  if count >= args.min_count and not tts_cache.contains(s, request_data['model'], settings)]
+        if ranked:
+            todo.append((request_data, ranked))
+
+    total = sum(len(ranked) for _, ranked in todo)
+    estimated = sum(estimate_bytes(s, request_data, args.sample_rate) for request_data, ranked in todo for s, _ in ranked)
+    stats = tts_cache.get_cache_stats()
+    print(f"🎯 {len(plan)}개 설정, 생성 대상 {total}개 문장")
+    print(f"💾 예상 디스크 사용량: {estimated / 1024**2:.1f}MB "
+          f"(현재 {stats['total_cache_size_mb']:.1f}MB / 한도 {tts_cache.max_cache_size / 1024**2:.0f}MB, 모드: {tts_cache.cache_mode})")
+
+    if args.dry_run or not todo:
+        for request_data, ranked in todo:
+            print(f"  - {request_data['model']} / {_tts_cache_settings(request_data)['voice'] or '기본 목소리'}: {len(ranked)}개")
+            for sentence, count in ranked[:5]:
+                print(f"      {count:>5}회  {sentence[:60]}")
+        return
+
+    deadline = time.time() + args.max_minutes * 60 if args.max_minutes else float('inf')
+    start_time = time.time()
+    written = 0
+    for request_data, ranked in todo:
+        try:
+            written += await synthesize_profile(request_data, ranked, deadline)
+        except Exception as e:
+            print(f"⚠️ 설정 처리 실패 ({request_data['model']}): {e}")
+        if time.time() > deadline:
+            break
+
+    tts_cache.flush(timeout=60.0)
+    print(f"✅ {written}개 문장 캐시 기록 완료 ({time.time() - start_time:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 로그 기반 TTS 캐시 사전 생성")
+    parser.add_argument("--export", help="로컬 로그 내보내기 파일 (.json/.jsonl). 없으면 Firestore에서 조회")
+    parser.add_argument("--days", type=int, default=7, help="Firestore 조회 기간 (일)")
+    parser.add_argument("--limit", type=int, default=50_000, help="Firestore 최대 조회 문서 수")
+    parser.add_argument("--message-type", default="tts_audio", help="metadata.type 필터 (빈 문자열이면 전체)")
+    parser.add_argument("--top-n", type=int, default=100, help="설정별 상위 문장 수")
+    parser.add_argument("--min-count", type=int, default=2, help="최소 등장 횟수")
+    parser.add_argument("--sample-rate", type=int, default=44_100, help="디스크 추정용 샘플레이트")
+    parser.add_argument("--max-minutes", type=float, default=0, help="최대 실행 시간 (0이면 제한 없음)")
+    parser.add_argument("--dry-run", action="store_true", help="생성 없이 대상/디스크 사용량만 출력")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# speaker_index.py - 스피커 임베딩 벡터 인덱스 (유사 목소리 검색 / 중복 제거)
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerEmbeddingIndex:
+    """코사인 유사도 기반 인메모리 벡터 인덱스
+
+    항목 수가 적을 때는 전수 검색(exact), `ivf_threshold` 이상이면 k-means로
+    만든 역파일(IVF) 리스트 중 가까운 `nprobe`개만 검색합니다.
+    """
+
+    def __init__(self, dim: int = 128, ivf_threshold: int = 2048, nprobe: int = 8):
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.size = 0  # 사용 중인 행 수 (삭제된 행 포함)
+
+        # IVF 상태
+        self.centroids: Optional[np.ndarray] = None
+        self.inverted_lists: List[List[int]] = []
+        self.built_size = 0
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def __len__(self) -> int:
+        return len(self.id_to_row)
+
+    def __contains__(self, voice_id: str) -> bool:
+        return voice_id in self.id_to_row
+
+    def add(self, voice_id: str, embedding: np.ndarray):
+        """임베딩 추가 (같은 ID는 교체)"""
+        if voice_id in self.id_to_row:
+            self.remove(voice_id)
+
+        if self.size == len(self.vectors):
+            capacity = max(64, len(self.vectors) * 2)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:self.size] = self.vectors[:self.size]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self.size] = self.alive[:self.size]
+            self.vectors, self.alive = vectors, alive
+
+        row = self.size
+        self.vectors[row] = self._normalize(embedding)
+        self.alive[row] = True
+        self.ids.append(voice_id)
+        self.id_to_row[voice_id] = row
+        self.size += 1
+
+        if self.centroids is not None:
+            self.inverted_lists[int(np.argmax(self.centroids @ self.vectors[row]))].append(row)
+        self._maybe_rebuild()
+
+    def add_many(self, embeddings: Dict[str, np.ndarray]):
+        for voice_id, embedding in embeddings.items():
+            self.add(voice_id, embedding)
+
+    def remove(self, voice_id: str):
+        row = self.id_to_row.pop(voice_id, None)
+        if row is not None:
+            self.alive[row] = False
+
+    def search(self, embedding: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        """가장 유사한 목소리 k개 반환: [(voice_id, cosine_similarity), ...]"""
+        if not self.id_to_row:
+            return []
+
+        query = self._normalize(embedding)
+        if self.centroids is None:
+            candidates = np.flatnonzero(self.alive[:self.size])
+        else:
+            probe = np.argsort(self.centroids @ query)[::-1][:self.nprobe]
+            candidates = np.array([row for c in probe for row in self.inverted_lists[c]], dtype=np.int64)
+            candidates = candidates[self.alive[candidates]] if len(candidates) else candidates
+
+        if len(candidates) == 0:
+            return []
+
+        scores = self.vectors[candidates] @ query
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[candidates[i]], float(scores[i])) for i in top]
+
+    def _maybe_rebuild(self):
+        """항목 수가 늘거나 삭제가 누적되면 IVF 재구성"""
+        live = len(self.id_to_row)
+        dead = self.size - live
+        if live < self.ivf_threshold:
+            self.centroids = None
+            if dead > self.size // 4:
+                self._compact()
+            return
+        if self.centroids is None or self.size >= 2 * self.built_size or dead > self.size // 4:
+            self._build_ivf()
+
+    def _build_ivf(self, iterations: int = 10, sample_size: int = 50_000):
+        """구형 k-means로 coarse quantizer 학습 후 역파일 리스트 구성"""
+        self._compact()
+        data = self.vectors[:self.size]
+        nlist = max(1, int(np.sqrt(self.size)))
+        rng = np.random.default_rng(0)
+
+        sample = data[rng.choice(self.size, min(sample_size, self.size), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-8)
+
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        self.inverted_lists = [[] for _ in range(nlist)]
+        for row, c in enumerate(assignment):
+            self.inverted_lists[c].append(row)
+        self.centroids = centroids
+        self.built_size = self.size
+        logger.info(f"🧭 스피커 IVF 인덱스 재구성: {self.size}개, {nlist}개 리스트")
+
+    def _compact(self):
+        """삭제된 행 제거"""
+        if self.size == len(self.id_to_row):
+            return
+        rows = np.flatnonzero(self.alive[:self.size])
+        self.vectors = self.vectors[rows]
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.ids = [self.ids[r] for r in rows]
+        self.id_to_row = {voice_id: row for row, voice_id in enumerate(self.ids)}
+        self.size = len(rows)
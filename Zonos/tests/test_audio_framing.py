@@ -0,0 +1,56 @@
+import struct
+
+import numpy as np
+
+from audio_framing import (
+    FLAG_END, FLAG_FILLER, FLAG_OPUS, FLAG_START, FRAME_VERSION, HEADER_SIZE,
+    decode_header, encode_frame, encode_frames, encode_packet_frame, frame_duration,
+    iter_packet_groups, pack_packets, packed_duration, unpack_packets,
+)
+
+
+def test_header_layout():
+    """version u8 | flags u8 | stream_id u16 | seq u32 | sample_rate u32 (little-endian, 12바이트)"""
+    frame = encode_frame(np.array([1, -2], dtype=np.int16), stream_id=0x1234, seq=7, sample_rate=24000, flags=FLAG_FILLER)
+    assert HEADER_SIZE == 12
+    assert frame[:HEADER_SIZE] == struct.pack("<BBHII", FRAME_VERSION, FLAG_FILLER, 0x1234, 7, 24000)
+    assert frame[HEADER_SIZE:] == struct.pack("<hh", 1, -2)
+    assert decode_header(frame) == (FRAME_VERSION, FLAG_FILLER, 0x1234, 7, 24000)
+
+
+def test_encode_frames_splits_and_flags():
+    """마지막 프레임만 짧고, 첫/마지막 프레임에 START/END 플래그"""
+    audio = np.linspace(-1.0, 1.0, 250, dtype=np.float32)
+    _, frames = encode_frames(audio, stream_id=3, sample_rate=1000, frame_samples=100)
+
+    headers = [decode_header(frame) for frame in frames]
+    assert [seq for _, _, _, seq, _ in headers] == [0, 1, 2]
+    assert headers[0][1] == FLAG_START
+    assert headers[1][1] == 0
+    assert headers[2][1] == FLAG_END
+    assert [len(frame) - HEADER_SIZE for frame in frames] == [200, 200, 100]
+    assert sum(frame_duration(frame) for frame in frames) == 0.25
+
+    payload = np.concatenate([np.frombuffer(frame[HEADER_SIZE:], dtype="<i2") for frame in frames])
+    assert np.array_equal(payload, (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16))
+
+
+def test_single_frame_has_start_and_end():
+    _, frames = encode_frames(np.zeros(10, dtype=np.int16), stream_id=1, sample_rate=24000, frame_samples=100)
+    assert len(frames) == 1
+    assert decode_header(frames[0])[1] == FLAG_START | FLAG_END
+
+
+def test_packet_round_trip_and_groups():
+    """길이 접두 Opus 패킷 묶음/분리, 20ms 단위 재생 시간"""
+    packets = [b"a", b"bc", b"", b"def", b"g"]
+    packed = pack_packets(packets)
+    assert unpack_packets(packed) == packets
+    assert packed_duration(packed) == len(packets) * 0.02
+
+    groups = list(iter_packet_groups(packed, 2))
+    assert [count for _, count in groups] == [2, 2, 1]
+    assert [packet for view, _ in groups for packet in unpack_packets(view)] == packets
+
+    frame = encode_packet_frame(packed, stream_id=2, seq=0, sample_rate=48000, flags=FLAG_OPUS)
+    assert frame_duration(frame) == len(packets) * 0.02
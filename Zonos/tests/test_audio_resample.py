@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from audio_resample import StreamingResampler, resample, resolve_output_rate
+
+
+@pytest.mark.parametrize("source_rate,target_rate", [(44100, 24000), (24000, 16000), (16000, 48000)])
+def test_chunked_matches_whole(source_rate, target_rate):
+    """청크 크기와 무관하게 한 번에 변환한 결과와 같음"""
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, source_rate // 2).astype(np.float32)
+    whole = resample(audio, source_rate, target_rate)
+
+    resampler = StreamingResampler(source_rate, target_rate)
+    chunks, start = [], 0
+    for size in rng.integers(1, 3000, 100):
+        chunks.append(resampler.process(audio[start:start + size]))
+        start += size
+        if start >= len(audio):
+            break
+    chunks.append(resampler.flush())
+    chunked = np.concatenate(chunks)
+
+    assert len(chunked) == len(whole)
+    np.testing.assert_allclose(chunked, whole, atol=1e-5)
+    assert abs(len(whole) - len(audio) * target_rate / source_rate) <= 2 * resampler.taps
+
+
+def test_preserves_low_frequency_tone():
+    """통과 대역의 사인파는 진폭이 유지됨"""
+    t = np.arange(44100) / 44100
+    out = resample(np.sin(2 * np.pi * 440 * t).astype(np.float32), 44100, 24000)
+    steady = out[1000:-1000]
+    assert 0.95 < np.abs(steady).max() < 1.05
+
+
+def test_passthrough_and_int16_input():
+    resampler = StreamingResampler(24000, 24000)
+    pcm = np.array([0, 32767, -32767], dtype=np.int16)
+    np.testing.assert_allclose(resampler.process(pcm), [0.0, 1.0, -1.0])
+    assert len(resampler.flush()) == 0
+
+
+def test_resolve_output_rate():
+    assert resolve_output_rate(None, 44100) == 44100
+    assert resolve_output_rate("16000", 44100) == 16000
+    assert resolve_output_rate(96000, 44100) == 44100
+    assert resolve_output_rate("abc", 24000) == 24000
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from outbound_queue import PRIORITY_CONTROL, OutboundQueue  # noqa: E402
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+
+    async def send_json(self, data):
+        self.sent.append(("json", data))
+
+    async def send_bytes(self, data):
+        self.sent.append(("bytes", data))
+
+    async def send_text(self, data):
+        self.sent.append(("text", data))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_drop_oldest_keeps_json():
+    """가득 차면 가장 오래된 오디오를 버리고 JSON은 남김"""
+    queue = OutboundQueue(FakeWebSocket(), max_messages=3, overflow="drop_oldest")
+    queue.put("json", {"type": "meta"})
+    queue.put("bytes", b"1")
+    queue.put("bytes", b"2")
+    assert queue.put("bytes", b"3")
+    assert [data for _, data in queue._stream] == [{"type": "meta"}, b"2", b"3"]
+    assert queue.dropped == 1
+
+
+def test_drop_newest_rejects_audio():
+    queue = OutboundQueue(FakeWebSocket(), max_messages=2, overflow="drop_newest")
+    queue.put("bytes", b"1")
+    queue.put("bytes", b"2")
+    assert not queue.put("bytes", b"3")
+    assert [data for _, data in queue._stream] == [b"1", b"2"]
+    assert queue.dropped == 1 and not queue.closed
+
+
+def test_disconnect_closes_slow_client():
+    async def run():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, max_messages=1, overflow="disconnect")
+        queue.put("bytes", b"1")
+        assert not queue.put("bytes", b"2")
+        await asyncio.sleep(0)
+        return queue, websocket
+
+    queue, websocket = asyncio.run(run())
+    assert queue.closed and len(queue) == 0
+    assert websocket.closed_with == 1013
+    assert not queue.put("json", {})
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        OutboundQueue(FakeWebSocket(), overflow="block")
+
+
+def test_writer_sends_control_first_in_order():
+    """PRIORITY_CONTROL 메시지가 먼저, 스트림 메시지는 넣은 순서대로"""
+    async def run():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, max_messages=8)
+        await queue.send_json({"type": "metadata"})
+        await queue.send_bytes(b"audio")
+        await queue.send_json({"type": "pong"}, priority=PRIORITY_CONTROL)
+        queue.start()
+        assert await queue.drain(timeout=1.0)
+        queue.close()
+        return websocket.sent
+
+    assert asyncio.run(run()) == [
+        ("json", {"type": "pong"}), ("json", {"type": "metadata"}), ("bytes", b"audio")
+    ]
@@ -0,0 +1,48 @@
+import numpy as np
+
+from speaker_index import SpeakerEmbeddingIndex
+
+
+def _embeddings(count: int, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return {f"voice_{i}": rng.normal(size=dim).astype(np.float32) for i in range(count)}
+
+
+def test_exact_search_finds_itself():
+    embeddings = _embeddings(20)
+    index = SpeakerEmbeddingIndex(dim=16)
+    index.add_many(embeddings)
+
+    results = index.search(embeddings["voice_7"] * 3.0, k=3)
+    assert results[0][0] == "voice_7"
+    assert abs(results[0][1] - 1.0) < 1e-5
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_remove_and_replace():
+    embeddings = _embeddings(5)
+    index = SpeakerEmbeddingIndex(dim=16)
+    index.add_many(embeddings)
+
+    index.remove("voice_1")
+    assert "voice_1" not in index and len(index) == 4
+    assert "voice_1" not in [voice_id for voice_id, _ in index.search(embeddings["voice_1"], k=5)]
+
+    index.add("voice_2", embeddings["voice_3"])
+    top = dict(index.search(embeddings["voice_3"], k=2))
+    assert set(top) == {"voice_2", "voice_3"}
+
+
+def test_ivf_search_matches_exact_top_hit():
+    """IVF 전환 후에도 자기 자신은 가장 가까운 항목으로 찾음"""
+    embeddings = _embeddings(300)
+    index = SpeakerEmbeddingIndex(dim=16, ivf_threshold=100, nprobe=4)
+    index.add_many(embeddings)
+    assert index.centroids is not None
+
+    for voice_id in ("voice_0", "voice_150", "voice_299"):
+        assert index.search(embeddings[voice_id], k=1)[0][0] == voice_id
+
+
+def test_empty_index():
+    assert SpeakerEmbeddingIndex(dim=4).search(np.ones(4)) == []
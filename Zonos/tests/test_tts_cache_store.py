@@ -0,0 +1,78 @@
+import numpy as np
+
+from tts_cache_store import KIND_CODES, KIND_ENCODED, KIND_PCM16, SegmentStore
+
+
+def _key(i: int) -> str:
+    return f"{i:032x}"
+
+
+def test_segment_round_trip(tmp_path):
+    """세 종류 레코드를 저장하고 같은 배열로 다시 읽음"""
+    store = SegmentStore(str(tmp_path))
+    pcm = (np.sin(np.arange(2400) / 10) * 20000).astype(np.int16)
+    codes = np.arange(9 * 50, dtype=np.uint16).reshape(9, 50)
+    encoded = np.frombuffer(b"\x03\x00abc", dtype=np.uint8)
+
+    store.put(_key(1), pcm, KIND_PCM16, 24000, model="m", text="안녕")
+    store.put(_key(2), codes, KIND_CODES, 44100)
+    store.put(_key(3), encoded, KIND_ENCODED, 48000)
+
+    array, location = store.get_array(_key(1))
+    assert np.array_equal(array, pcm)
+    assert location.sample_rate == 24000
+    array, location = store.get_array(_key(2))
+    assert array.shape == (9, 50) and np.array_equal(array, codes)
+    assert bytes(store.get(_key(3))[0]) == b"\x03\x00abc"
+    assert store.get_array(_key(4)) is None
+    assert len(store) == 3
+    store.close()
+
+
+def test_index_persists_and_rebuilds(tmp_path):
+    """다시 열면 인덱스로, 인덱스가 없으면 세그먼트 스캔으로 항목을 찾음"""
+    pcm = np.arange(1000, dtype=np.int16)
+    store = SegmentStore(str(tmp_path))
+    store.put(_key(1), pcm, KIND_PCM16, 24000)
+    store.put(_key(2), pcm[::-1], KIND_PCM16, 24000)
+    store.delete(_key(2))
+    store.close()
+
+    store = SegmentStore(str(tmp_path))
+    assert np.array_equal(store.get_array(_key(1))[0], pcm)
+    assert _key(2) not in store
+    store.close()
+
+    for path in tmp_path.glob("index.sqlite3*"):
+        path.unlink()
+    store = SegmentStore(str(tmp_path))
+    # 삭제는 인덱스에만 기록되므로 재구성하면 세그먼트에 남은 레코드가 다시 살아남
+    assert np.array_equal(store.get_array(_key(1))[0], pcm)
+    assert np.array_equal(store.get_array(_key(2))[0], pcm[::-1])
+    store.close()
+
+
+def test_compaction_reclaims_dead_segments(tmp_path):
+    """살아있는 바이트가 적은 봉인된 세그먼트는 살아있는 레코드만 옮기고 삭제"""
+    store = SegmentStore(str(tmp_path), compaction_ratio=0.5)
+    store.segment_size = 16 * 1024  # 레코드 몇 개마다 새 세그먼트
+    arrays = {i: np.full(2000, i, dtype=np.int16) for i in range(8)}
+    for i, array in arrays.items():
+        store.put(_key(i), array, KIND_PCM16, 24000)
+    assert len(store.segment_bytes) > 1
+    first_segment = store.get(_key(0))[1].segment_id
+
+    for i in range(1, 8, 2):
+        store.delete(_key(i))
+    store.delete(_key(2))
+    before = store.disk_usage()
+    reclaimed = store.compact()
+
+    assert reclaimed > 0
+    assert store.disk_usage() < before
+    assert not (tmp_path / f"segment-{first_segment:06d}.seg").exists()
+    for i in (0, 4, 6):
+        array, location = store.get_array(_key(i))
+        assert np.array_equal(array, arrays[i])
+    assert len(store) == 3
+    store.close()
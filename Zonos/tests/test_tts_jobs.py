@@ -0,0 +1,52 @@
+import asyncio
+
+from tts_jobs import TTSJobManager, plan_batches
+
+
+def test_plan_batches_groups_by_profile_and_length():
+    """설정별로 묶고, 설정 안에서는 짧은 텍스트부터 batch_size개씩"""
+    items = [
+        {"text": "가나다라", "voice_id": "a"},
+        {"text": "가", "voice_id": "b"},
+        {"text": "가나", "voice_id": "a"},
+        {"text": "가나다", "voice_id": "a"},
+        {"text": "가나다라마바", "voice_id": "b"},
+        {"text": "가나다라마", "voice_id": "a"},
+    ]
+    batches = plan_batches(items, batch_size=2)
+
+    assert batches == [[2, 3], [0, 5], [1, 4]]
+    for batch in batches:
+        assert len({items[i]["voice_id"] for i in batch}) == 1
+
+
+def test_plan_batches_separates_differing_settings():
+    items = [{"text": "a", "speaking_rate": 15}, {"text": "b", "speaking_rate": 20}, {"text": "c", "speaking_rate": 15}]
+    assert sorted(plan_batches(items, batch_size=8)) == [[0, 2], [1]]
+
+
+def test_job_skips_cached_and_reports_status():
+    calls = []
+
+    async def synthesize(settings, texts):
+        calls.append((settings["voice_id"], texts))
+        if "실패" in texts:
+            raise RuntimeError("boom")
+
+    async def run():
+        manager = TTSJobManager(synthesize, lambda item: item["text"] == "캐시", batch_size=2)
+        job = manager.submit([
+            {"text": "캐시", "voice_id": "a"},
+            {"text": "하나", "voice_id": "a"},
+            {"text": "실패", "voice_id": "b"},
+        ])
+        while job.status not in ("completed", "failed", "cancelled"):
+            await asyncio.sleep(0.01)
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "completed"
+    assert job.item_status == ["cached", "done", "failed"]
+    assert sorted(calls) == [("a", ["하나"]), ("b", ["실패"])]
+    data = job.to_dict(include_items=True)
+    assert (data["completed"], data["cached"], data["failed"], data["progress"]) == (1, 1, 1, 1.0)
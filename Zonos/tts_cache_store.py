@@ -0,0 +1,482 @@
+# TTS 캐시 디스크 저장소 - 추가 전용(append-only) 세그먼트 파일 + mmap 제로카피 읽기 + SQLite 인덱스
+import contextlib
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# 여러 uvicorn 워커가 같은 저장소를 쓰기 위한 프로세스 간 파일 잠금 (POSIX 전용)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# 레코드 헤더: magic, version, kind, rows, key(md5 16바이트), sample_rate, payload_len (+4바이트 패딩)
+RECORD_HEADER = struct.Struct("<4sBBH16sIQ4x")
+RECORD_MAGIC = b"TTSC"
+RECORD_VERSION = 1
+
+KIND_PCM16 = 0       # int16 PCM (모노)
+KIND_CODES = 1       # uint16 DAC 코드 [rows, T]
+KIND_ENCODED = 2     # 미리 인코딩된 출력 바이트 (예: 길이 접두 Opus 패킷)
+
+KIND_DTYPES = {KIND_PCM16: np.int16, KIND_CODES: np.uint16, KIND_ENCODED: np.uint8}
+
+
+class RecordLocation(NamedTuple):
+    segment_id: int
+    offset: int       # 페이로드 시작 위치
+    length: int       # 페이로드 바이트 수
+    kind: int
+    rows: int
+    sample_rate: int
+    model_revision: str = ""
+
+
+class CacheIndex:
+    """SQLite(WAL) 캐시 인덱스
+
+    시작 시 전체를 메모리에 올리지 않고 키 단위로 조회합니다. 총 크기/항목 수는 트리거로
+    유지되는 통계 행에서 바로 읽고, 접근 시간/히트 수 갱신은 모아서 한 번에 기록합니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            segment_id INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            kind INTEGER NOT NULL,
+            rows INTEGER NOT NULL,
+            sample_rate INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            model_revision TEXT NOT NULL DEFAULT '',
+            model TEXT NOT NULL DEFAULT '',
+            text TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+        CREATE INDEX IF NOT EXISTS idx_entries_segment ON entries(segment_id);
+
+        CREATE TABLE IF NOT EXISTS stats (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            total_bytes INTEGER NOT NULL,
+            entry_count INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO stats VALUES (0, 0, 0);
+
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            UPDATE stats SET total_bytes = total_bytes + NEW.size, entry_count = entry_count + 1 WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            UPDATE stats SET total_bytes = total_bytes - OLD.size, entry_count = entry_count - 1 WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+            UPDATE stats SET total_bytes = total_bytes - OLD.size + NEW.size WHERE id = 0;
+        END;
+    """
+
+    def __init__(self, path: str, access_flush_interval: float = 2.0, access_flush_batch: int = 512):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.access_flush_interval = access_flush_interval
+        self.access_flush_batch = access_flush_batch
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA busy_timeout=5000")  # 다른 프로세스의 쓰기 대기
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # key -> (마지막 접근 시간, 누적 히트 수) : flush_access() 때 한 번에 기록
+        self._pending_access: Dict[str, Tuple[float, int]] = {}
+        self._last_access_flush = time.time()
+
+    def get(self, key: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def put(self, key: str, location: RecordLocation, size: int, model: str = "", text: str = ""):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO entries (key, segment_id, offset, length, kind, rows, sample_rate, size,
+                                        last_access, hit_count, model_revision, model, text, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       segment_id = excluded.segment_id, offset = excluded.offset, length = excluded.length,
+                       kind = excluded.kind, rows = excluded.rows, sample_rate = excluded.sample_rate,
+                       size = excluded.size, last_access = excluded.last_access,
+                       model_revision = excluded.model_revision, model = excluded.model, text = excluded.text""",
+                (key, location.segment_id, location.offset, location.length, location.kind, location.rows,
+                 location.sample_rate, size, now, location.model_revision, model, text, now),
+            )
+
+    def move(self, key: str, location: RecordLocation):
+        """압축 시 레코드 위치만 갱신"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET segment_id = ?, offset = ? WHERE key = ?",
+                (location.segment_id, location.offset, key),
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def touch(self, key: str):
+        """접근 기록 (배치로 모았다가 기록)"""
+        with self._lock:
+            _, hits = self._pending_access.get(key, (0.0, 0))
+            self._pending_access[key] = (time.time(), hits + 1)
+            if (len(self._pending_access) >= self.access_flush_batch
+                    or time.time() - self._last_access_flush >= self.access_flush_interval):
+                self.flush_access()
+
+    def flush_access(self):
+        with self._lock:
+            if self._pending_access:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "UPDATE entries SET last_access = ?, hit_count = hit_count + ? WHERE key = ?",
+                    [(last_access, hits, key) for key, (last_access, hits) in self._pending_access.items()],
+                )
+                self._conn.execute("COMMIT")
+                self._pending_access.clear()
+            self._last_access_flush = time.time()
+
+    def oldest(self, limit: int = 64) -> List[Tuple[str, int]]:
+        """가장 오래 접근하지 않은 항목들 (last_access 인덱스 사용)"""
+        self.flush_access()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row["key"], row["size"]) for row in rows]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT total_bytes FROM stats WHERE id = 0").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT entry_count FROM stats WHERE id = 0").fetchone()[0]
+
+    def count_kind(self, kind: int) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def live_bytes_by_segment(self) -> Dict[int, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT segment_id, SUM(size) FROM entries GROUP BY segment_id").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def entries_in_segment(self, segment_id: int) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute("SELECT * FROM entries WHERE segment_id = ?", (segment_id,)).fetchall()
+
+    def keys(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM entries").fetchall()
+        return (row["key"] for row in rows)
+
+    def clear(self):
+        with self._lock:
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        with self._lock:
+            self.flush_access()
+            self._conn.close()
+
+
+class SegmentStore:
+    """로그 구조 캐시 저장소
+
+    항목은 큰 세그먼트 파일 끝에 순서대로 추가되고, SQLite 인덱스(CacheIndex)로 위치를 찾습니다.
+    읽기는 mmap의 memoryview 슬라이스를 그대로 돌려주므로 복사/압축 해제가 없고,
+    항목 수와 무관하게 일정한 시간이 걸립니다. 삭제는 인덱스에서만 지우고,
+    살아있는 바이트가 적은 세그먼트는 백그라운드 압축(compaction)으로 회수합니다.
+
+    여러 프로세스가 같은 디렉토리를 공유할 수 있습니다. 추가 쓰기는 파일 잠금(flock)으로
+    직렬화하고, 다른 프로세스가 늘린 세그먼트는 다시 매핑하며, 압축은 리더 잠금을 잡은
+    프로세스 하나만 수행합니다.
+    """
+
+    def __init__(self, directory: str, segment_size_mb: int = 256, compaction_ratio: float = 0.5):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size_mb * 1024 * 1024
+        self.compaction_ratio = compaction_ratio
+
+        self.segment_bytes: Dict[int, int] = {}  # 세그먼트별 전체 크기
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.RLock()
+        self._append_lock_file = open(self.directory / "append.lock", "a+b")
+        self._leader_lock_file = open(self.directory / "compaction.lock", "a+b")
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        with self._process_lock():
+            index_path = self.directory / "index.sqlite3"
+            rebuild = not index_path.exists()
+            self.index = CacheIndex(index_path)
+
+            self._refresh_segments()
+            if rebuild and self.segment_bytes:
+                self._rebuild_index()
+
+            self.active_id = max(self.segment_bytes, default=0)
+            self._writer = open(self._segment_path(self.active_id), "ab")
+            self.segment_bytes[self.active_id] = self._writer.tell()
+
+    @contextlib.contextmanager
+    def _process_lock(self):
+        """스레드 + 프로세스 간 추가 쓰기 잠금"""
+        with self._lock:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self._append_lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(self._append_lock_file, fcntl.LOCK_UN)
+
+    def _refresh_segments(self):
+        """디스크의 세그먼트 목록/크기 갱신 (다른 프로세스의 추가/압축 반영)"""
+        self.segment_bytes = {
+            int(path.stem.split("-")[1]): path.stat().st_size
+            for path in self.directory.glob("segment-*.seg")
+        }
+
+    def _sync_active_segment(self):
+        """다른 프로세스가 새 세그먼트로 넘어갔거나 파일을 늘렸으면 따라감 (잠금 안에서 호출)"""
+        next_id = self.active_id + 1
+        if self._segment_path(next_id).exists():
+            while self._segment_path(next_id + 1).exists():
+                next_id += 1
+            self._writer.close()
+            self.active_id = next_id
+            self._writer = open(self._segment_path(self.active_id), "ab")
+        self._writer.seek(0, os.SEEK_END)
+        self.segment_bytes[self.active_id] = self._writer.tell()
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"segment-{segment_id:06d}.seg"
+
+    def _rebuild_index(self):
+        """인덱스 파일이 없을 때 세그먼트를 순서대로 스캔해 재구성"""
+        for segment_id in sorted(self.segment_bytes):
+            path = self._segment_path(segment_id)
+            size = self.segment_bytes[segment_id]
+            offset = 0
+            with open(path, "rb") as f:
+                while offset + RECORD_HEADER.size <= size:
+                    f.seek(offset)
+                    magic, version, kind, rows, raw_key, sample_rate, length = RECORD_HEADER.unpack(
+                        f.read(RECORD_HEADER.size)
+                    )
+                    payload_offset = offset + RECORD_HEADER.size
+                    if magic != RECORD_MAGIC or version != RECORD_VERSION or payload_offset + length > size:
+                        break
+                    location = RecordLocation(segment_id, payload_offset, length, kind, rows, sample_rate)
+                    self.index.put(raw_key.hex(), location, RECORD_HEADER.size + length)
+                    offset = payload_offset + length
+        print(f"📂 세그먼트 캐시 인덱스 재구성됨: {len(self.index)}개 항목, {len(self.segment_bytes)}개 세그먼트")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def _append(self, key: str, kind: int, rows: int, sample_rate: int, payload) -> RecordLocation:
+        """활성 세그먼트 끝에 레코드 추가 (가득 차면 새 세그먼트로 교체, 프로세스 잠금 안에서 호출)"""
+        payload = memoryview(payload).cast("B")
+        self._sync_active_segment()
+        if self.segment_bytes[self.active_id] > 0 and (
+            self.segment_bytes[self.active_id] + RECORD_HEADER.size + len(payload) > self.segment_size
+        ):
+            self._roll_segment()
+
+        offset = self.segment_bytes[self.active_id]
+        header = RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, kind, rows, bytes.fromhex(key), sample_rate, len(payload))
+        self._writer.write(header)
+        self._writer.write(payload)
+        self._writer.flush()
+        self.segment_bytes[self.active_id] = offset + RECORD_HEADER.size + len(payload)
+        return RecordLocation(self.active_id, offset + RECORD_HEADER.size, len(payload), kind, rows, sample_rate)
+
+    def _roll_segment(self):
+        self._writer.close()
+        self.active_id += 1
+        self._writer = open(self._segment_path(self.active_id), "ab")
+        self.segment_bytes[self.active_id] = 0
+
+    def put(self, key: str, array: np.ndarray, kind: int, sample_rate: int,
+            model_revision: str = "", model: str = "", text: str = "") -> int:
+        """배열 저장 후 디스크에 기록된 바이트 수 반환"""
+        array = np.ascontiguousarray(array, dtype=KIND_DTYPES[kind])
+        rows = array.shape[0] if array.ndim == 2 else 1
+        with self._process_lock():
+            location = self._append(key, kind, rows, sample_rate, array)._replace(model_revision=model_revision)
+            size = location.length + RECORD_HEADER.size
+            self.index.put(key, location, size, model=model, text=text)
+        return size
+
+    def delete(self, key: str):
+        self.index.delete(key)
+
+    def touch(self, key: str):
+        self.index.touch(key)
+
+    def _map(self, segment_id: int, end: int) -> mmap.mmap:
+        """세그먼트 mmap (활성 세그먼트가 커졌으면 다시 매핑)"""
+        mapped = self._maps.get(segment_id)
+        if mapped is None or len(mapped) < end:
+            with open(self._segment_path(segment_id), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # 이전 매핑은 내보낸 memoryview가 모두 해제되면 GC가 닫음
+            self._maps[segment_id] = mapped
+        return mapped
+
+    def get(self, key: str) -> Optional[Tuple[memoryview, RecordLocation]]:
+        """제로카피 조회: (페이로드 memoryview, 위치 정보)"""
+        with self._lock:
+            # 다른 프로세스가 압축으로 세그먼트를 옮긴 직후라면 인덱스를 한 번 더 읽음
+            for attempt in range(2):
+                row = self.index.get(key)
+                if row is None:
+                    return None
+                location = RecordLocation(row["segment_id"], row["offset"], row["length"], row["kind"],
+                                          row["rows"], row["sample_rate"], row["model_revision"])
+                try:
+                    mapped = self._map(location.segment_id, location.offset + location.length)
+                    break
+                except FileNotFoundError:
+                    self._maps.pop(location.segment_id, None)
+                    if attempt:
+                        raise
+        return memoryview(mapped)[location.offset:location.offset + location.length], location
+
+    def get_array(self, key: str) -> Optional[Tuple[np.ndarray, RecordLocation]]:
+        """제로카피 numpy 뷰 조회 (읽기 전용)"""
+        result = self.get(key)
+        if result is None:
+            return None
+        view, location = result
+        array = np.frombuffer(view, dtype=KIND_DTYPES[location.kind])
+        if location.kind == KIND_CODES:
+            array = array.reshape(location.rows, -1)
+        return array, location
+
+    def compact(self) -> int:
+        """살아있는 바이트 비율이 낮은 봉인된 세그먼트를 정리하고 회수한 바이트 수 반환
+
+        리더 잠금을 잡은 프로세스 하나만 수행하고, 나머지는 바로 0을 반환합니다.
+        """
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.flock(self._leader_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+        try:
+            return self._compact()
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self._leader_lock_file, fcntl.LOCK_UN)
+
+    def _compact(self) -> int:
+        reclaimed = 0
+        with self._process_lock():
+            self._refresh_segments()
+            self._sync_active_segment()
+        live_bytes = self.index.live_bytes_by_segment()
+        for segment_id in sorted(self.segment_bytes):
+            with self._process_lock():
+                if segment_id >= self.active_id or segment_id not in self.segment_bytes:
+                    continue
+                total = self.segment_bytes[segment_id]
+                if total and 1 - live_bytes.get(segment_id, 0) / total < self.compaction_ratio:
+                    continue
+
+                # 살아있는 레코드를 활성 세그먼트로 복사
+                mapped = self._map(segment_id, total)
+                for row in self.index.entries_in_segment(segment_id):
+                    view = memoryview(mapped)[row["offset"]:row["offset"] + row["length"]]
+                    moved = self._append(row["key"], row["kind"], row["rows"], row["sample_rate"], view)
+                    self.index.move(row["key"], moved)
+
+                self._maps.pop(segment_id, None)
+                self.segment_bytes.pop(segment_id)
+                self._segment_path(segment_id).unlink(missing_ok=True)
+                reclaimed += total - live_bytes.get(segment_id, 0)
+
+        if reclaimed:
+            print(f"🧹 세그먼트 압축 완료: {reclaimed / 1024 / 1024:.1f}MB 회수")
+        return reclaimed
+
+    def start_background_compaction(self, interval: float = 60.0):
+        """주기적으로 compact()를 실행하는 데몬 스레드 시작"""
+        if self._compaction_thread is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.index.flush_access()
+                    self.compact()
+                except Exception as e:
+                    print(f"⚠️ 세그먼트 압축 실패: {e}")
+
+        self._compaction_thread = threading.Thread(target=run, name="tts-cache-compaction", daemon=True)
+        self._compaction_thread.start()
+
+    def sync(self):
+        """활성 세그먼트를 디스크에 fsync"""
+        with self._lock:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        self.index.flush_access()
+
+    def disk_usage(self) -> int:
+        return sum(self.segment_bytes.values())
+
+    def clear(self):
+        """모든 세그먼트 삭제 (다른 프로세스의 매핑과 겹치지 않도록 세그먼트 번호는 이어서 사용)"""
+        with self._process_lock():
+            self._sync_active_segment()
+            self._writer.close()
+            self._maps.clear()
+            self.index.clear()
+            for path in self.directory.glob("segment-*.seg"):
+                path.unlink(missing_ok=True)
+            self.active_id += 1
+            self.segment_bytes = {self.active_id: 0}
+            self._writer = open(self._segment_path(self.active_id), "ab")
+
+    def close(self):
+        self._stop_event.set()
+        with self._lock:
+            self._writer.close()
+            self._maps.clear()
+            self.index.close()
+            self._append_lock_file.close()
+            self._leader_lock_file.close()
@@ -0,0 +1,204 @@
+# tts_jobs.py - 비동기 배치 합성 작업 (/api/tts/jobs)
+#
+# 많은 문장을 미리 합성해 TTS 캐시에 넣어 두는 용도. 항목을 목소리/설정별로 묶고 길이순으로 정렬해
+# 큰 배치로 생성하며, 생성 슬롯은 대화형 요청보다 낮은 우선순위로 받습니다 (main.py의 synthesize_batch).
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_BATCH_SIZE = int(os.getenv("TTS_JOB_BATCH_SIZE", "16"))
+JOB_MAX_ITEMS = int(os.getenv("TTS_JOB_MAX_ITEMS", "5000"))
+JOB_HISTORY = int(os.getenv("TTS_JOB_HISTORY", "100"))  # 보관할 작업 수 (끝난 작업부터 삭제)
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def profile_key(item: Dict[str, Any]) -> str:
+    """텍스트를 뺀 나머지 설정 (같으면 컨디셔닝을 공유해 한 배치로 생성할 수 있음)"""
+    return json.dumps({k: v for k, v in item.items() if k != "text"}, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def plan_batches(items: List[Dict[str, Any]], batch_size: int = JOB_BATCH_SIZE) -> List[List[int]]:
+    """항목 인덱스를 설정별로 묶고, 설정 안에서는 텍스트 길이순으로 batch_size개씩 자름
+
+    배치 생성은 가장 긴 항목이 끝날 때까지 돌기 때문에 길이가 비슷한 것끼리 묶어 낭비를 줄입니다.
+    """
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(profile_key(item), []).append(index)
+
+    batches = []
+    for indices in groups.values():
+        indices.sort(key=lambda i: len(items[i]["text"]))
+        batches.extend(indices[start:start + batch_size] for start in range(0, len(indices), batch_size))
+    return batches
+
+
+class TTSJob:
+    """배치 합성 작업 하나의 상태 (항목별: queued | cached | done | failed)"""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.id = uuid.uuid4().hex
+        self.items = items
+        self.item_status = ["queued"] * len(items)
+        self.status = "queued"
+        self.errors: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+
+    def to_dict(self, include_items: bool = False) -> Dict[str, Any]:
+        counts = Counter(self.item_status)
+        total = len(self.items)
+        finished = counts["done"] + counts["cached"] + counts["failed"]
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "total": total,
+            "completed": counts["done"],
+            "cached": counts["cached"],
+            "failed": counts["failed"],
+            "progress": round(finished / total, 3) if total else 1.0,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "errors": self.errors[:10],
+        }
+        if self.status == "running" and counts["done"]:
+            # 캐시에 있던 항목은 시간이 들지 않으므로 생성한 항목 기준으로 추정
+            elapsed = time.time() - self.started_at
+            data["eta_seconds"] = round(elapsed / counts["done"] * counts["queued"], 1)
+        if include_items:
+            data["items"] = [
+                {"text": item["text"], "status": status} for item, status in zip(self.items, self.item_status)
+            ]
+        return data
+
+
+class TTSJobManager:
+    """배치 합성 작업 큐 - 워커 하나가 작업을 순서대로, 작업 안에서는 배치를 순서대로 처리
+
+    synthesize_batch(설정, 텍스트 목록)는 한 배치를 생성해 캐시에 기록하는 코루틴이고,
+    is_cached(항목)가 True인 항목은 생성하지 않고 cached로 표시합니다 (is_cached는 워커 스레드에서 호출).
+    취소는 진행 중인 배치가 끝난 뒤 다음 배치부터 적용됩니다.
+    """
+
+    def __init__(
+        self,
+        synthesize_batch: Callable[[Dict[str, Any], List[str]], Awaitable[None]],
+        is_cached: Callable[[Dict[str, Any]], bool],
+        batch_size: int = JOB_BATCH_SIZE,
+        history: int = JOB_HISTORY,
+    ):
+        self.synthesize_batch = synthesize_batch
+        self.is_cached = is_cached
+        self.batch_size = batch_size
+        self.history = history
+        self.jobs: "OrderedDict[str, TTSJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, items: List[Dict[str, Any]]) -> TTSJob:
+        """작업 등록 (워커는 첫 작업 때 시작)"""
+        if not items:
+            raise ValueError("합성할 텍스트가 없습니다")
+        if len(items) > JOB_MAX_ITEMS:
+            raise ValueError(f"작업당 최대 {JOB_MAX_ITEMS}개 항목까지 가능합니다 ({len(items)}개 요청)")
+
+        job = TTSJob(items)
+        self.jobs[job.id] = job
+        self._trim_history()
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_worker())
+        self._queue.put_nowait(job)
+        logger.info(f"📦 TTS 배치 작업 등록: {job.id} ({len(items)}개 항목)")
+        return job
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[TTSJob]:
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+        job.cancel_requested = True
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        return job
+
+    def _trim_history(self):
+        """보관 한도를 넘으면 오래된 끝난 작업부터 삭제"""
+        excess = len(self.jobs) - self.history
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATUSES][:max(excess, 0)]:
+            del self.jobs[job_id]
+
+    async def _run_worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.status == "cancelled":
+                continue
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                logger.error(f"❌ TTS 배치 작업 실패 {job.id}: {e}")
+                job.status = "failed"
+                job.errors.append({"error": str(e)})
+                job.finished_at = time.time()
+
+    async def _run_job(self, job: TTSJob):
+        job.status = "running"
+        job.started_at = time.time()
+
+        # 이미 캐시에 있는 항목은 건너뜀 (항목마다 키 정규화/인덱스 조회가 있어 executor에서 한 번에 확인)
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, lambda: [self.is_cached(item) for item in job.items])
+        todo = []
+        for index, is_cached in enumerate(cached):
+            if is_cached:
+                job.item_status[index] = "cached"
+            else:
+                todo.append(index)
+
+        pending = [job.items[index] for index in todo]
+        for batch in plan_batches(pending, self.batch_size):
+            if job.cancel_requested:
+                break
+            indices = [todo[i] for i in batch]
+            texts = [job.items[index]["text"] for index in indices]
+            try:
+                await self.synthesize_batch(job.items[indices[0]], texts)
+                status = "done"
+            except Exception as e:
+                logger.warning(f"⚠️ 배치 생성 실패 ({len(texts)}개): {e}")
+                job.errors.append({"texts": texts[:3], "error": str(e)})
+                status = "failed"
+            for index in indices:
+                job.item_status[index] = status
+
+        counts = Counter(job.item_status)
+        if job.cancel_requested:
+            job.status = "cancelled"
+        elif counts["failed"] and not counts["done"] and not counts["cached"]:
+            job.status = "failed"
+        else:
+            job.status = "completed"
+        job.finished_at = time.time()
+        logger.info(f"✅ TTS 배치 작업 {job.status}: {job.id} (생성 {counts['done']}, 캐시 {counts['cached']}, 실패 {counts['failed']})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": dict(Counter(job.status for job in self.jobs.values())),
+            "queued_jobs": self._queue.qsize() if self._queue else 0,
+        }
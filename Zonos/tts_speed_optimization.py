@@ -2,188 +2,528 @@
 # TTS 속도 최적화 개선안 - 캐싱 및 병렬 처리
 import asyncio
 import hashlib
-import pickle
 import os
+import re
+import threading
 import time
-from typing import Dict, Optional, List
+import unicodedata
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, List, Tuple
 from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import torch
 import torchaudio
 from pathlib import Path
 
+from tts_cache_store import SegmentStore, RecordLocation, KIND_CODES, KIND_ENCODED, KIND_PCM16
+
+
+@lru_cache(maxsize=8192)
+def normalize_cache_text(text: str, language: str = "ko") -> str:
+    """캐시 키용 텍스트 정규화 (서식/공백/반복 문장부호 차이를 무시)"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"[*_#`~\"'“”‘’()\[\]<>]", "", text)  # 마크다운/따옴표/괄호
+    text = re.sub(r"([.!?。！？…])\1+", r"\1", text)       # "!!" -> "!"
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+class FrequencySketch:
+    """TinyLFU용 count-min sketch (4비트 포화 카운터 + 주기적 절반 감쇠)
+    
+    캐시 키별 최근 요청 빈도를 고정 메모리로 추정합니다. 기록 횟수가
+    `sample_size`에 도달하면 모든 카운터를 절반으로 줄여 오래된 인기도를 잊습니다.
+    """
+    
+    def __init__(self, width: int = 1 << 16, depth: int = 4, sample_factor: int = 10):
+        self.width = 1 << (max(width, 16) - 1).bit_length()  # 2의 거듭제곱
+        self.depth = depth
+        self.table = np.zeros((depth, self.width), dtype=np.uint8)
+        self.sample_size = sample_factor * self.width
+        self.additions = 0
+        self.resets = 0
+    
+    def _indexes(self, key: str) -> np.ndarray:
+        h1 = int(key[:16], 16)
+        h2 = int(key[16:32], 16) | 1
+        return np.array([(h1 + i * h2) & (self.width - 1) for i in range(self.depth)])
+    
+    def increment(self, key: str):
+        indexes = self._indexes(key)
+        rows = np.arange(self.depth)
+        counters = self.table[rows, indexes]
+        self.table[rows, indexes] = np.minimum(counters + 1, 15)
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table >>= 1  # aging
+            self.additions //= 2
+            self.resets += 1
+    
+    def estimate(self, key: str) -> int:
+        return int(self.table[np.arange(self.depth), self._indexes(key)].min())
+
+
 class AdvancedTTSCache:
-    """고급 TTS 캐싱 시스템"""
+    """고급 TTS 캐싱 시스템
+    
+    cache_mode="audio": int16 PCM 파형을 저장 (히트 시 mmap 제로카피 뷰 반환)
+    cache_mode="codes": DAC 코드(9 x T, uint16)만 저장하고 히트 시 `decoder`로 다시 디코딩
+                        (초당 ~1.5KB로 파형 대비 약 100배 많은 항목을 같은 디스크에 보관)
+    
+    디스크 계층은 추가 전용 세그먼트 저장소(SegmentStore)와 SQLite 인덱스를 사용합니다.
+    디스크 기록은 백그라운드 writer 스레드가 처리하므로(write-behind) 요청 경로는 메모리만 건드립니다.
+    fsync_policy: "always"(기록마다), "interval"(fsync_interval초마다), "never"(OS에 맡김)
+    
+    admission=True이면 TinyLFU 방식으로, 계층이 가득 찼을 때 새 항목의 추정 빈도가
+    밀려날 항목보다 높을 때만 받아들입니다 (일회성 응답이 인기 문구를 밀어내지 않도록).
     
-    def __init__(self, cache_dir: str = "cache/tts", max_cache_size_gb: float = 2.0):
+    get_encoded/save_encoded는 같은 항목을 출력 형식(예: Opus 비트레이트)별로 미리 인코딩한
+    바이트를 별도 키로 디스크 계층에 보관합니다 (히트 시 다시 인코딩하지 않도록).
+    
+    디스크 계층은 여러 워커 프로세스가 공유할 수 있고, `shared_memory_dir`(예: /dev/shm/zonos-tts)를
+    지정하면 디코딩된 PCM을 프로세스 간 공유 hot tier에도 보관합니다.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str = "cache/tts",
+        key_normalizer: Callable[[str, str], str] = normalize_cache_text,
+        max_cache_size_gb: float = 2.0,
+        cache_mode: str = "audio",
+        decoder: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        model_revision: str = "",
+        memory_budget_mb: float = 256.0,
+        hot_tier_mb: float = 32.0,
+        segment_size_mb: int = 256,
+        compaction_interval: float = 60.0,
+        write_queue_size: int = 256,
+        fsync_policy: str = "interval",
+        fsync_interval: float = 5.0,
+        shared_memory_dir: Optional[str] = None,
+        shared_memory_mb: float = 256.0,
+        admission: bool = True,
+        sketch_width: int = 1 << 16,
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = SegmentStore(self.cache_dir / "segments", segment_size_mb=segment_size_mb)
+        self.store.start_background_compaction(compaction_interval)
         self.max_cache_size = max_cache_size_gb * 1024 * 1024 * 1024  # GB to bytes
-        self.memory_cache: Dict[str, np.ndarray] = {}
-        self.cache_metadata: Dict[str, Dict] = {}
-        self.access_times: Dict[str, float] = {}
+        self.cache_mode = cache_mode
+        self.key_normalizer = key_normalizer  # (text, language) -> 키 문자열 (예: 음소열)
+        self.decoder = decoder  # codes(np.uint16, [9, T]) -> 파형(np.float32)
+        self.model_revision = model_revision
+        # 메모리 계층: 바이트 예산 LRU (codes 모드에서는 디코딩된 파형용 작은 hot tier)
+        self.max_memory_bytes = int((hot_tier_mb if cache_mode == "codes" else memory_budget_mb) * 1024 * 1024)
+        self.memory_bytes = 0
+        self.memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        
+        # 프로세스 간 공유 hot tier (tmpfs 위의 세그먼트 저장소)
+        self.shared_store: Optional[SegmentStore] = None
+        self.max_shared_size = shared_memory_mb * 1024 * 1024
+        if shared_memory_dir:
+            try:
+                self.shared_store = SegmentStore(shared_memory_dir, segment_size_mb=64)
+                self.shared_store.start_background_compaction(compaction_interval)
+            except OSError as e:
+                print(f"⚠️ 공유 메모리 캐시 비활성화: {e}")
+        
+        # TinyLFU 입장 정책
+        self.admission = admission
+        self.sketch = FrequencySketch(width=sketch_width)
+        self.admission_stats = {
+            'memory_admitted': 0, 'memory_rejected': 0,
+            'disk_admitted': 0, 'disk_rejected': 0,
+        }
         
         # 캐시 통계
         self.cache_hits = 0
         self.cache_misses = 0
         
-        self._load_cache_index()
+        # write-behind: 같은 키의 대기 중인 기록은 최신 것 하나로 합침 (coalescing)
+        self.write_queue_size = write_queue_size
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.dropped_writes = 0
+        self._pending: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._pending_cond = threading.Condition(self._lock)
+        self._writing = False
+        self._last_fsync = time.time()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="tts-cache-writer", daemon=True)
+        self._writer_thread.start()
     
     def _get_cache_key(self, text: str, model: str, settings: Dict) -> str:
         """텍스트와 설정으로 캐시 키 생성"""
         # 중요한 TTS 설정만 키에 포함
+        language = settings.get('language', 'ko')
         key_data = {
-            'text': text.strip().lower(),
+            'text': self.key_normalizer(text, language),
             'model': model,
-            'language': settings.get('language', 'ko'),
+            'voice': settings.get('voice'),
+            'language': language,
             'emotion': settings.get('emotion', []),
             'speaking_rate': settings.get('speaking_rate', 15.0),
-            'pitch_std': settings.get('pitch_std', 20.0)
+            'pitch_std': settings.get('pitch_std', 20.0),
+            'fmax': settings.get('fmax'),
+            'vqscore_8': settings.get('vqscore_8'),
+            'dnsmos_ovrl': settings.get('dnsmos_ovrl'),
+            'cfg_scale': settings.get('cfg_scale')
         }
         key_str = str(sorted(key_data.items()))
         return hashlib.md5(key_str.encode()).hexdigest()
     
-    def _load_cache_index(self):
-        """캐시 인덱스 로드"""
-        index_file = self.cache_dir / "cache_index.pkl"
-        if index_file.exists():
-            try:
-                with open(index_file, 'rb') as f:
-                    data = pickle.load(f)
-                    self.cache_metadata = data.get('metadata', {})
-                    self.access_times = data.get('access_times', {})
-                print(f"📂 캐시 인덱스 로드됨: {len(self.cache_metadata)}개 항목")
-            except Exception as e:
-                print(f"⚠️ 캐시 인덱스 로드 실패: {e}")
+    def contains(self, text: str, model: str, settings: Dict) -> bool:
+        """캐시에 있는지 확인 (히트 통계/빈도/LRU 순서에 영향 없음)"""
+        cache_key = self._get_cache_key(text, model, settings)
+        return cache_key in self.memory_cache or cache_key in self._pending or cache_key in self.store.index
     
-    def _save_cache_index(self):
-        """캐시 인덱스 저장"""
-        index_file = self.cache_dir / "cache_index.pkl"
-        try:
-            with open(index_file, 'wb') as f:
-                pickle.dump({
-                    'metadata': self.cache_metadata,
-                    'access_times': self.access_times
-                }, f)
-        except Exception as e:
-            print(f"⚠️ 캐시 인덱스 저장 실패: {e}")
+    def record_access(self, text: str, model: str, settings: Dict, count: int = 1):
+        """외부에서 알려진 요청 빈도를 입장 정책 sketch에 반영 (예: 로그 기반 사전 생성)"""
+        cache_key = self._get_cache_key(text, model, settings)
+        for _ in range(min(count, 15)):
+            self.sketch.increment(cache_key)
     
     def get_cached_audio(self, text: str, model: str, settings: Dict) -> Optional[np.ndarray]:
         """캐시된 오디오 조회"""
         cache_key = self._get_cache_key(text, model, settings)
+        self.sketch.increment(cache_key)  # 히트/미스 모두 빈도에 반영
         
         # 메모리 캐시 먼저 확인
-        if cache_key in self.memory_cache:
-            self.access_times[cache_key] = time.time()
+        audio_data = self.memory_cache.get(cache_key)
+        if audio_data is not None:
+            self._touch(cache_key)
             self.cache_hits += 1
             print(f"🎯 메모리 캐시 히트: {text[:30]}...")
-            return self.memory_cache[cache_key]
+            return audio_data
+        
+        # 아직 디스크에 기록되지 않은 항목
+        pending = self._pending.get(cache_key)
+        if pending is not None:
+            self._touch(cache_key, on_disk=False)
+            self.cache_hits += 1
+            return pending['audio_data']
         
-        # 디스크 캐시 확인
-        cache_file = self.cache_dir / f"{cache_key}.npz"
-        if cache_file.exists():
+        # 공유 메모리 hot tier 확인 (다른 워커가 생성/디코딩한 PCM)
+        if self.shared_store is not None:
             try:
-                data = np.load(cache_file)
-                audio_data = data['audio']
-                
-                # 메모리 캐시에도 저장 (LRU 방식)
-                self._add_to_memory_cache(cache_key, audio_data)
+                stored = self.shared_store.get_array(cache_key)
+                if stored is not None:
+                    audio_data = stored[0]
+                    self._add_to_memory_cache(cache_key, audio_data, copy=False)
+                    self.shared_store.touch(cache_key)
+                    self._touch(cache_key)
+                    self.cache_hits += 1
+                    print(f"🧠 공유 메모리 캐시 히트: {text[:30]}...")
+                    return audio_data
+            except Exception as e:
+                print(f"⚠️ 공유 메모리 캐시 로드 실패: {e}")
+                self.shared_store.delete(cache_key)
+        
+        # 디스크 캐시 확인 (mmap 제로카피)
+        try:
+            stored = self.store.get_array(cache_key)
+            if stored is not None:
+                array, location = stored
+                if location.kind == KIND_CODES:
+                    audio_data = self._decode_codes(location, array)
+                    if audio_data is None:
+                        self.cache_misses += 1
+                        return None
+                    self._add_to_memory_cache(cache_key, audio_data)
+                    self._put_shared(cache_key, audio_data, location.sample_rate)
+                else:
+                    # int16 PCM 뷰는 복사 없이 그대로 보관/반환
+                    audio_data = array
+                    self._add_to_memory_cache(cache_key, audio_data, copy=False)
                 
-                self.access_times[cache_key] = time.time()
+                self._touch(cache_key)
                 self.cache_hits += 1
                 print(f"💾 디스크 캐시 히트: {text[:30]}...")
                 return audio_data
                 
-            except Exception as e:
-                print(f"⚠️ 캐시 파일 로드 실패: {e}")
-                cache_file.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"⚠️ 캐시 레코드 로드 실패: {e}")
+            self._evict(cache_key)
         
         self.cache_misses += 1
         return None
     
-    def save_cached_audio(self, text: str, model: str, settings: Dict, audio_data: np.ndarray, sample_rate: int):
-        """오디오를 캐시에 저장"""
+    def _encoded_key(self, text: str, model: str, settings: Dict, encoding: str) -> str:
+        """원본 항목 키 + 출력 형식 (예: "opus:32000")"""
+        return hashlib.md5(f"{self._get_cache_key(text, model, settings)}:{encoding}".encode()).hexdigest()
+    
+    def get_encoded(self, text: str, model: str, settings: Dict, encoding: str) -> Optional[memoryview]:
+        """미리 인코딩된 출력 조회 (디스크 mmap 제로카피)"""
+        encoded_key = self._encoded_key(text, model, settings, encoding)
+        pending = self._pending.get(encoded_key)
+        if pending is not None:
+            return memoryview(pending['encoded'])
+        try:
+            stored = self.store.get(encoded_key)
+        except Exception as e:
+            print(f"⚠️ 인코딩 캐시 로드 실패: {e}")
+            self.store.delete(encoded_key)
+            return None
+        if stored is None or stored[1].kind != KIND_ENCODED:
+            return None
+        self.store.touch(encoded_key)
+        return stored[0]
+    
+    def save_encoded(self, text: str, model: str, settings: Dict, encoding: str, data: bytes, sample_rate: int):
+        """인코딩된 출력을 writer 스레드로 디스크에 기록 (메모리 계층에는 두지 않음)"""
+        encoded_key = self._encoded_key(text, model, settings, encoding)
+        with self._pending_cond:
+            if encoded_key in self._pending:
+                return
+            if len(self._pending) >= self.write_queue_size:
+                # 큐가 가득 차면 기록 포기 (다음 히트 때 다시 인코딩)
+                self.dropped_writes += 1
+                return
+            self._pending[encoded_key] = {
+                'text': text,
+                'model': model,
+                'encoded': np.frombuffer(data, dtype=np.uint8),
+                'sample_rate': sample_rate,
+            }
+            self._pending_cond.notify()
+    
+    def get_cached_sentences(self, sentences: List[str], model: str, settings: Dict) -> List[Optional[np.ndarray]]:
+        """문장별 캐시 조회 (같은 목소리/감정 설정, 없으면 None)"""
+        return [self.get_cached_audio(sentence, model, settings) for sentence in sentences]
+    
+    def _decode_codes(self, location: RecordLocation, codes: np.ndarray) -> Optional[np.ndarray]:
+        """저장된 코드를 파형으로 디코딩 (모델 리비전이 다르면 무효 처리)"""
+        revision = location.model_revision
+        if revision != self.model_revision:
+            print(f"⚠️ 코드 캐시 리비전 불일치: {revision} != {self.model_revision}")
+            return None
+        if self.decoder is None:
+            print("⚠️ 코드 캐시 디코더가 설정되지 않았습니다")
+            return None
+        return self.decoder(codes)
+    
+    @staticmethod
+    def to_pcm16(audio_data: np.ndarray) -> np.ndarray:
+        """float 파형을 int16 PCM으로 변환 (이미 int16이면 그대로)"""
+        if audio_data.dtype == np.int16:
+            return audio_data
+        return (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    def save_cached_audio(
+        self,
+        text: str,
+        model: str,
+        settings: Dict,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        codes: Optional[np.ndarray] = None,
+        to_memory: bool = True,
+    ):
+        """오디오를 캐시에 저장 (메모리 계층에 넣고 디스크 기록은 writer 스레드로 넘김)
+        
+        to_memory=False면 디스크에만 기록 (배치 작업이 대화형 요청의 메모리 캐시를 밀어내지 않도록)
+        """
         cache_key = self._get_cache_key(text, model, settings)
         
         # 메모리 캐시에 추가
-        self._add_to_memory_cache(cache_key, audio_data)
+        if to_memory:
+            self._add_to_memory_cache(cache_key, audio_data)
         
-        # 디스크 캐시에 저장
-        cache_file = self.cache_dir / f"{cache_key}.npz"
-        try:
-            np.savez_compressed(
-                cache_file,
-                audio=audio_data,
-                sample_rate=sample_rate,
-                text=text,
-                model=model
-            )
-            
-            # 메타데이터 업데이트
-            self.cache_metadata[cache_key] = {
-                'text': text[:100],  # 첫 100자만 저장
+        with self._pending_cond:
+            if cache_key not in self._pending and len(self._pending) >= self.write_queue_size:
+                # 큐가 가득 차면 디스크 기록을 포기 (메모리 계층에는 남아 있음)
+                self.dropped_writes += 1
+                print(f"⚠️ 캐시 기록 큐 포화, 디스크 저장 생략: {text[:30]}...")
+                return
+            self._pending.pop(cache_key, None)
+            self._pending[cache_key] = {
+                'text': text,
                 'model': model,
-                'file_size': cache_file.stat().st_size,
-                'created_at': time.time(),
-                'sample_rate': sample_rate
+                'audio_data': audio_data,
+                'sample_rate': sample_rate,
+                'codes': codes,
             }
-            self.access_times[cache_key] = time.time()
-            
-            print(f"💾 캐시 저장됨: {text[:30]}... ({len(audio_data)} samples)")
+            self._pending_cond.notify()
+    
+    def _writer_loop(self):
+        """백그라운드 writer: 대기 중인 항목을 세그먼트에 기록"""
+        while True:
+            with self._pending_cond:
+                while not self._pending:
+                    self._writing = False
+                    self._pending_cond.notify_all()
+                    self._pending_cond.wait()
+                self._writing = True
+                cache_key, item = self._pending.popitem(last=False)
+            self._write_entry(cache_key, item)
+    
+    def _write_entry(self, cache_key: str, item: Dict):
+        """디스크 캐시에 저장 (세그먼트 끝에 추가)"""
+        text = item['text']
+        if 'encoded' in item:
+            self._write_encoded(cache_key, item)
+            return
+        codes = item['codes']
+        store_codes = self.cache_mode == "codes" and codes is not None
+        try:
+            # 메타데이터(첫 100자 텍스트, 모델, 리비전)는 SQLite 인덱스에 함께 기록
+            meta = dict(model_revision=self.model_revision, model=item['model'], text=text[:100])
+            record_size = (codes.size if store_codes else len(item['audio_data'])) * 2
+            if not self._admit_to_disk(cache_key, record_size):
+                return
+            if store_codes:
+                # 코드는 10비트 값이므로 uint16으로 충분
+                self.store.put(cache_key, codes, KIND_CODES, item['sample_rate'], **meta)
+            else:
+                self.store.put(cache_key, self.to_pcm16(item['audio_data']), KIND_PCM16, item['sample_rate'], **meta)
+            self._maybe_fsync()
+            if store_codes:
+                # 디코딩 없이 다른 워커가 바로 쓸 수 있도록 PCM도 공유 hot tier에 보관
+                self._put_shared(cache_key, item['audio_data'], item['sample_rate'])
             
             # 캐시 크기 관리
-            self._manage_cache_size()
+            with self._lock:
+                self._manage_cache_size()
+            
+            print(f"💾 캐시 저장됨 ({'codes' if store_codes else 'audio'}): {text[:30]}... ({len(item['audio_data'])} samples)")
             
         except Exception as e:
             print(f"⚠️ 캐시 저장 실패: {e}")
     
-    def _add_to_memory_cache(self, cache_key: str, audio_data: np.ndarray):
-        """메모리 캐시에 추가 (LRU 방식)"""
-        # 메모리 캐시 크기 제한 (50MB)
-        max_memory_items = 100
-        if len(self.memory_cache) >= max_memory_items:
-            # 가장 오래된 항목 제거
-            oldest_key = min(self.access_times.keys(), key=lambda k: self.access_times.get(k, 0))
-            if oldest_key in self.memory_cache:
-                del self.memory_cache[oldest_key]
-        
-        self.memory_cache[cache_key] = audio_data.copy()
+    def _write_encoded(self, encoded_key: str, item: Dict):
+        """미리 인코딩된 출력 기록 (입장 정책은 원본 항목에서 이미 거쳤으므로 생략)"""
+        try:
+            self.store.put(encoded_key, item['encoded'], KIND_ENCODED, item['sample_rate'],
+                           model_revision=self.model_revision, model=item['model'], text=item['text'][:100])
+            self._maybe_fsync()
+            with self._lock:
+                self._manage_cache_size()
+        except Exception as e:
+            print(f"⚠️ 인코딩 캐시 저장 실패: {e}")
     
-    def _manage_cache_size(self):
-        """캐시 크기 관리"""
-        total_size = sum(
-            self.cache_dir.joinpath(f"{key}.npz").stat().st_size 
-            for key in self.cache_metadata 
-            if self.cache_dir.joinpath(f"{key}.npz").exists()
-        )
+    def _admit_to_disk(self, cache_key: str, record_size: int) -> bool:
+        """디스크가 가득 찼을 때는 LRU 희생 항목보다 자주 요청된 항목만 입장"""
+        if not self.admission or self.store.index.total_bytes() + record_size <= self.max_cache_size:
+            return True
+        victims = self.store.index.oldest(limit=1)
+        if victims and self.sketch.estimate(cache_key) <= self.sketch.estimate(victims[0][0]):
+            self.admission_stats['disk_rejected'] += 1
+            return False
+        self.admission_stats['disk_admitted'] += 1
+        return True
+    
+    def _put_shared(self, cache_key: str, audio_data: np.ndarray, sample_rate: int):
+        """공유 메모리 hot tier에 PCM 저장 (예산 초과 시 오래된 것부터 제거)"""
+        if self.shared_store is None:
+            return
+        try:
+            self.shared_store.put(cache_key, self.to_pcm16(audio_data), KIND_PCM16, sample_rate,
+                                  model_revision=self.model_revision)
+            self._trim_store(self.shared_store, self.max_shared_size)
+        except OSError as e:
+            print(f"⚠️ 공유 메모리 캐시 저장 실패: {e}")
+    
+    def _maybe_fsync(self):
+        """fsync 정책에 따라 세그먼트를 디스크에 동기화"""
+        if self.fsync_policy == "always" or (
+            self.fsync_policy == "interval" and time.time() - self._last_fsync >= self.fsync_interval
+        ):
+            self.store.sync()
+            self._last_fsync = time.time()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 기록이 모두 끝날 때까지 대기"""
+        with self._pending_cond:
+            done = self._pending_cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+        if done and self.fsync_policy != "never":
+            self.store.sync()
+        return done
+    
+    def _touch(self, cache_key: str, on_disk: bool = True):
+        """접근 기록 갱신 (메모리 LRU 순서를 맨 뒤로, 디스크 인덱스는 배치 갱신)"""
+        with self._lock:
+            if cache_key in self.memory_cache:
+                self.memory_cache.move_to_end(cache_key)
+        if on_disk:
+            self.store.touch(cache_key)
+    
+    def _evict(self, cache_key: str):
+        """항목 제거 (인덱스에서만 지우고, 세그먼트 공간은 압축 시 회수)"""
+        with self._lock:
+            self.store.delete(cache_key)
+            self._remove_from_memory_cache(cache_key)
+    
+    def _remove_from_memory_cache(self, cache_key: str):
+        audio_data = self.memory_cache.pop(cache_key, None)
+        if audio_data is not None:
+            self.memory_bytes -= audio_data.nbytes
+    
+    def _add_to_memory_cache(self, cache_key: str, audio_data: np.ndarray, copy: bool = True):
+        """메모리 캐시에 추가 (바이트 예산 LRU)"""
+        if audio_data.nbytes > self.max_memory_bytes:
+            return  # 예산보다 큰 항목은 메모리에 두지 않음
         
-        if total_size > self.max_cache_size:
-            # 오래된 캐시 파일부터 삭제
-            sorted_keys = sorted(
-                self.cache_metadata.keys(), 
-                key=lambda k: self.access_times.get(k, 0)
-            )
+        with self._lock:
+            self._remove_from_memory_cache(cache_key)
             
-            for key in sorted_keys:
-                cache_file = self.cache_dir / f"{key}.npz"
-                if cache_file.exists():
-                    file_size = cache_file.stat().st_size
-                    cache_file.unlink()
-                    total_size -= file_size
-                    
-                    # 메타데이터에서도 제거
-                    del self.cache_metadata[key]
-                    if key in self.access_times:
-                        del self.access_times[key]
-                    if key in self.memory_cache:
-                        del self.memory_cache[key]
-                    
-                    if total_size <= self.max_cache_size * 0.8:  # 80%까지 정리
-                        break
+            # 메모리 계층이 가득 찼으면 LRU 희생 항목보다 빈도가 높을 때만 입장 (TinyLFU)
+            if self.admission and self.memory_cache and self.memory_bytes + audio_data.nbytes > self.max_memory_bytes:
+                victim_key = next(iter(self.memory_cache))
+                if self.sketch.estimate(cache_key) <= self.sketch.estimate(victim_key):
+                    self.admission_stats['memory_rejected'] += 1
+                    return
+                self.admission_stats['memory_admitted'] += 1
             
-            self._save_cache_index()
+            # 예산을 넘으면 가장 오래 쓰지 않은 항목부터 제거
+            while self.memory_cache and self.memory_bytes + audio_data.nbytes > self.max_memory_bytes:
+                _, evicted = self.memory_cache.popitem(last=False)
+                self.memory_bytes -= evicted.nbytes
+            
+            self.memory_cache[cache_key] = audio_data.copy() if copy else audio_data
+            self.memory_bytes += audio_data.nbytes
+    
+    def _manage_cache_size(self):
+        """캐시 크기 관리 (인덱스의 누적 크기 기준, last_access가 오래된 것부터 제거)"""
+        total_size = self._trim_store(self.store, self.max_cache_size, on_evict=self._remove_from_memory_cache)
+        if total_size is not None:
             print(f"🧹 캐시 정리 완료. 현재 크기: {total_size / 1024 / 1024:.1f}MB")
     
+    @staticmethod
+    def _trim_store(store: SegmentStore, max_size: float, on_evict: Optional[Callable[[str], None]] = None) -> Optional[int]:
+        """저장소를 예산의 80%까지 정리하고 정리 후 크기 반환 (정리가 필요 없으면 None)"""
+        total_size = store.index.total_bytes()
+        if total_size <= max_size:
+            return None
+        
+        while total_size > max_size * 0.8:  # 80%까지 정리
+            victims = store.index.oldest()
+            if not victims:
+                break
+            for key, size in victims:
+                store.delete(key)
+                if on_evict is not None:
+                    on_evict(key)
+                total_size -= size
+                if total_size <= max_size * 0.8:
+                    break
+        return total_size
+    
+    def clear(self):
+        """메모리/디스크 캐시 전체 삭제"""
+        with self._pending_cond:
+            self._pending.clear()
+        self.flush()
+        with self._lock:
+            self.memory_cache.clear()
+            self.memory_bytes = 0
+            self.store.clear()
+            if self.shared_store is not None:
+                self.shared_store.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
     def get_cache_stats(self) -> Dict:
         """캐시 통계 반환"""
         total_requests = self.cache_hits + self.cache_misses
@@ -193,11 +533,181 @@ class AdvancedTTSCache:
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
             'hit_rate': f"{hit_rate:.1f}%",
+            'cache_mode': self.cache_mode,
+            'codes_entries': self.store.index.count_kind(KIND_CODES),
+            'encoded_entries': self.store.index.count_kind(KIND_ENCODED),
+            'admission': dict(self.admission_stats, enabled=self.admission, sketch_resets=self.sketch.resets),
+            'pending_writes': len(self._pending),
+            'dropped_writes': self.dropped_writes,
+            'segment_files': len(self.store.segment_bytes),
+            'segment_disk_mb': self.store.disk_usage() / 1024 / 1024,
+            'shared_memory_entries': len(self.shared_store) if self.shared_store is not None else 0,
             'memory_cache_size': len(self.memory_cache),
-            'disk_cache_size': len(self.cache_metadata),
-            'total_cache_size_mb': sum(
-                meta.get('file_size', 0) for meta in self.cache_metadata.values()
-            ) / 1024 / 1024
+            'memory_cache_mb': self.memory_bytes / 1024 / 1024,
+            'disk_cache_size': len(self.store),
+            'total_cache_size_mb': self.store.index.total_bytes() / 1024 / 1024
+        }
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 작업을 하나로 합침
+    
+    첫 요청(리더)만 작업을 실행하고, 그동안 들어온 같은 키의 요청(팔로워)은
+    리더의 Future를 기다려 결과를 공유합니다. 리더가 취소되면 팔로워 중 하나가
+    새 리더가 되어 다시 실행하고, 리더의 예외는 팔로워에게 그대로 전달됩니다.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+    
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """(결과, 리더 여부) 반환"""
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.followers += 1
+            try:
+                return await asyncio.shield(future), False
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # 팔로워 자신이 취소됨
+                # 리더가 취소됨 -> 다시 시도 (새 리더가 되거나 다른 리더를 기다림)
+        
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            result = await work()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 팔로워가 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        else:
+            future.set_result(result)
+            return result, True
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'in_flight': len(self._inflight),
+            'leaders': self.leaders,
+            'followers': self.followers,
+        }
+
+
+class AdmissionRejected(Exception):
+    """생성 대기열이 가득 차 요청을 받을 수 없음"""
+
+
+PRIORITY_INTERACTIVE = 0  # 대화/스트리밍 요청
+PRIORITY_BATCH = 1        # 배치 작업 (/api/tts/jobs)
+
+
+class GenerationAdmission:
+    """모델 생성 동시 실행 수 제한 (WebSocket/HTTP/배치 작업 등 모든 경로 공용)
+    
+    max_concurrent개까지 동시에 생성하고 나머지는 우선순위별로 도착 순서대로 기다립니다.
+    PRIORITY_BATCH 요청은 기다리는 대화형 요청이 없을 때만 시작하고 max_batch개 슬롯까지만 쓰므로,
+    배치 작업이 돌고 있어도 나머지 슬롯은 대화형 요청 몫으로 남습니다.
+    기다리는 대화형 요청이 max_waiting개에 이르면 새 요청은 AdmissionRejected로 바로 거절합니다.
+    실행 중에 호출자가 취소되면 작업은 끝까지 돌고(스레드는 중단할 수 없으므로) 슬롯도 그때 반납합니다.
+    """
+    
+    def __init__(self, max_concurrent: int = 2, max_waiting: int = 16, max_batch: int = 1):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_batch = max_batch
+        self._running = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 0}
+        self._waiters: Dict[int, Deque[asyncio.Future]] = {PRIORITY_INTERACTIVE: deque(), PRIORITY_BATCH: deque()}
+        self.admitted = 0
+        self.rejected = 0
+    
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+    
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+    
+    @property
+    def saturated(self) -> bool:
+        return len(self._waiters[PRIORITY_INTERACTIVE]) >= self.max_waiting
+    
+    def _can_start(self, priority: int) -> bool:
+        if self.running >= self.max_concurrent:
+            return False
+        if priority == PRIORITY_BATCH:
+            return self._running[PRIORITY_BATCH] < self.max_batch and not self._waiters[PRIORITY_INTERACTIVE]
+        return True
+    
+    def _wake(self):
+        """빈 슬롯을 대화형 -> 배치 순으로 대기자에게 넘김"""
+        for priority in (PRIORITY_INTERACTIVE, PRIORITY_BATCH):
+            waiters = self._waiters[priority]
+            while waiters and self._can_start(priority):
+                future = waiters.popleft()
+                if future.done():  # 기다리다 취소됨
+                    continue
+                self._running[priority] += 1
+                future.set_result(None)
+    
+    async def run(self, work: Callable[[], Awaitable[Any]], priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """슬롯을 얻은 뒤 work 실행"""
+        if priority == PRIORITY_INTERACTIVE and self.saturated:
+            self.rejected += 1
+            raise AdmissionRejected(f"생성 대기열 포화 ({self.waiting}개 대기)")
+        
+        if self._waiters[priority] or not self._can_start(priority):
+            future = asyncio.get_event_loop().create_future()
+            self._waiters[priority].append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    if future in self._waiters[priority]:
+                        self._waiters[priority].remove(future)
+                else:  # 슬롯을 넘겨받은 직후 취소됨
+                    self._running[priority] -= 1
+                    self._wake()
+                raise
+        else:
+            self._running[priority] += 1
+        
+        self.admitted += 1
+        try:
+            inner = asyncio.ensure_future(work())
+        except BaseException:
+            self._release(priority)
+            raise
+        # 호출자가 취소돼도 executor 스레드의 생성은 멈추지 않으므로, 슬롯은 실제 작업이 끝날 때 반납
+        inner.add_done_callback(lambda done: self._release(priority, done))
+        return await asyncio.shield(inner)
+    
+    def _release(self, priority: int, done: Optional[asyncio.Future] = None):
+        self._running[priority] -= 1
+        if done is not None and not done.cancelled():
+            done.exception()  # 호출자가 먼저 취소된 경우 "exception was never retrieved" 경고 방지
+        self._wake()
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_batch': self.max_batch,
+            'running': self._running[PRIORITY_INTERACTIVE],
+            'running_batch': self._running[PRIORITY_BATCH],
+            'waiting': len(self._waiters[PRIORITY_INTERACTIVE]),
+            'waiting_batch': len(self._waiters[PRIORITY_BATCH]),
+            'admitted': self.admitted,
+            'rejected': self.rejected,
         }
 
 
@@ -246,6 +756,30 @@ class ParallelTTSProcessor:
         
         return valid_results
     
+    @staticmethod
+    def splice_with_crossfade(audio_chunks: List[np.ndarray], sample_rate: int, crossfade_ms: float = 20.0) -> np.ndarray:
+        """문장 오디오들을 짧은 등전력 크로스페이드로 이어붙임 (int16 캐시 항목은 float로 변환)"""
+        chunks = [
+            chunk.astype(np.float32) / 32767 if chunk.dtype == np.int16 else chunk.astype(np.float32, copy=False)
+            for chunk in audio_chunks if len(chunk)
+        ]
+        if not chunks:
+            return np.array([], dtype=np.float32)
+        
+        fade_samples = int(sample_rate * crossfade_ms / 1000)
+        total = sum(len(chunk) for chunk in chunks)
+        out = np.empty(total, dtype=np.float32)
+        position = 0
+        for i, chunk in enumerate(chunks):
+            overlap = min(fade_samples, position, len(chunk)) if i else 0
+            if overlap:
+                t = np.linspace(0.0, np.pi / 2, overlap, dtype=np.float32)
+                position -= overlap
+                out[position:position + overlap] = out[position:position + overlap] * np.cos(t) + chunk[:overlap] * np.sin(t)
+            out[position + overlap:position + len(chunk)] = chunk[overlap:]
+            position += len(chunk)
+        return out[:position]
+    
     def combine_audio_chunks(self, audio_chunks: List[np.ndarray], sample_rate: int) -> np.ndarray:
         """오디오 청크들을 하나로 결합"""
         if not audio_chunks:
@@ -307,12 +841,14 @@ class SmartTextSplitter:
         
         return chunks
     
+    def split_sentences(self, text: str) -> List[str]:
+        """문장 단위로 분할 (문장부호 유지, 문장 단위 캐시 키로 사용)"""
+        return self._split_into_sentences(text)
+    
     def _split_into_sentences(self, text: str) -> List[str]:
-        """문장 단위로 분할"""
-        import re
-        
-        # 한국어와 영어 문장 구분자
-        sentence_endings = r'[.!?।।]+\s+'
+        """문장 단위로 분할 (문장 끝 억양을 위해 문장부호는 유지)"""
+        # 한국어와 영어 문장 구분자 뒤의 공백에서 분할
+        sentence_endings = r'(?<=[.!?।。！？…])\s+'
         sentences = re.split(sentence_endings, text.strip())
         
         # 빈 문장 제거
@@ -321,6 +857,103 @@ class SmartTextSplitter:
         return sentences
 
 
+class IncrementalSentenceSplitter:
+    """스트리밍 텍스트(LLM 토큰)에서 끝난 문장만 잘라내는 분할기
+
+    문장부호 뒤에 공백이 와야(또는 줄바꿈) 문장이 끝난 것으로 보므로 "3.5"처럼 아직 이어질 수 있는
+    부분은 자르지 않습니다. min_chars보다 짧은 문장은 다음 문장과 합쳐 너무 짧은 합성을 피합니다.
+    """
+
+    BOUNDARY = re.compile(r'[.!?।。！？…]+["\'”’)\]]*\s+|\n+')
+
+    def __init__(self, min_chars: int = 8):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """텍스트 조각 추가 -> 이번에 끝난 문장들"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in self.BOUNDARY.finditer(self.buffer):
+            sentence = self.buffer[start:match.end()].strip()
+            if len(sentence) < self.min_chars:
+                continue  # 다음 문장 경계까지 이어 붙임
+            sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """스트림 끝 - 남은 텍스트 (문장부호 없이 끝난 마지막 문장 포함)"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+class BatchTTSGenerator:
+    """여러 문장을 한 번의 generate 호출로 합성 (화자/감정 등 나머지 조건은 공유)
+    
+    배치 안의 문장들은 끝나는 시점이 다르므로, generate 콜백으로 항목별 EOS 스텝을 기록해
+    각 결과를 자기 길이에 맞게 잘라냅니다.
+    """
+    
+    def __init__(self, max_batch_size: int = 4):
+        self.max_batch_size = max_batch_size
+    
+    @torch.no_grad()
+    def generate(
+        self,
+        model,
+        conditioning: torch.Tensor,
+        texts: List[str],
+        cfg_scale: float = 2.0,
+        sampling_params: Optional[Dict] = None,
+        max_new_tokens: Optional[int] = None,
+        decode_batch_size: Optional[int] = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """conditioning: [2B, L, D] (prepare_conditioning 결과) -> [(파형, 코드[9, T]), ...]
+        
+        decode_batch_size: DAC 디코딩을 이 크기씩 나눠 수행 (큰 배치의 디코딩 메모리 제한, 없으면 한 번에)
+        """
+        batch_size = len(texts)
+        if max_new_tokens is None:
+            max_new_tokens = min(86 * 30, max(len(text) for text in texts) * 12)
+        
+        eos_steps: List[Optional[int]] = [None] * batch_size
+        
+        def track_eos(frame: torch.Tensor, step: int, max_steps: int) -> bool:
+            finished = (frame[:, 0, 0] == model.eos_token_id).nonzero().flatten().tolist()
+            for i in finished:
+                if eos_steps[i] is None:
+                    eos_steps[i] = step
+            return True
+        
+        codes = model.generate(
+            prefix_conditioning=conditioning,
+            max_new_tokens=max_new_tokens,
+            cfg_scale=cfg_scale,
+            batch_size=batch_size,
+            sampling_params=sampling_params or dict(min_p=0.1),
+            progress_bar=False,
+            disable_torch_compile=True,
+            callback=track_eos,
+        )
+        
+        step = decode_batch_size or batch_size
+        wav_out = torch.cat([
+            model.autoencoder.decode(codes[i:i + step]).cpu().detach() for i in range(0, batch_size, step)
+        ])  # [B, 1, samples]
+        hop_length = wav_out.shape[-1] // max(codes.shape[-1], 1)
+        
+        results = []
+        for i in range(batch_size):
+            length = min(eos_steps[i] or codes.shape[-1], codes.shape[-1])
+            audio = wav_out[i, 0, :length * hop_length].numpy()
+            results.append((audio, codes[i, :, :length].cpu().numpy()))
+        return results
+
+
 class ModelWarmupManager:
     """모델 웜업 관리자"""
     
@@ -1,26 +1,195 @@
 # voice_manager.py - 목소리 관리 시스템
 
+import io
 import os
 import time
 import base64
+import asyncio
 import tempfile
 import logging
-from typing import Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+import numpy as np
 import torch
 import torchaudio
 from zonos.model import Zonos
+from zonos.speaker_cloning import SpeakerEmbeddingLDA, select_voiced_segment
+from speaker_index import SpeakerEmbeddingIndex
+from audio_framing import FILLER_STREAM_ID, FLAG_END, FLAG_FILLER, FLAG_START, encode_frame
 
 logger = logging.getLogger(__name__)
 
+VOICE_EXTENSIONS = ('.wav', '.mp3', '.flac')
+
+
+def iter_voice_files(directory: str) -> List[Tuple[str, str]]:
+    """디렉토리(하위 제외)의 참조 음성 -> [(voice_id, 경로)] (voice_id는 파일명의 첫 '.' 앞부분)"""
+    return [
+        (voice_file.split('.')[0], os.path.join(directory, voice_file))
+        for voice_file in sorted(os.listdir(directory))
+        if voice_file.endswith(VOICE_EXTENSIONS)
+    ]
+
+
+class SpeakerEmbeddingStore:
+    """디스크에 영구 저장되는 스피커 임베딩 저장소 (voice_id -> LDA 임베딩)
+    
+    서버에서는 save_later()로 기록을 미룹니다. 파일 전체를 다시 쓰는 저장이므로 업로드마다
+    바로 저장하지 않고, save_delay초 안의 변경을 백그라운드 스레드에서 한 번에 기록합니다.
+    """
+    
+    def __init__(self, path: str = "cache/voices/speaker_embeddings.npz", save_delay: float = 2.0):
+        self.path = Path(path)
+        self.save_delay = save_delay
+        self.embeddings: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 파일 기록 직렬화 (임시 파일 공유)
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self.load()
+    
+    def load(self):
+        """저장된 임베딩 로드"""
+        if not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as data:
+                for voice_id, embedding in zip(data["voice_ids"], data["embeddings"]):
+                    self.embeddings[str(voice_id)] = embedding
+            logger.info(f"📂 스피커 임베딩 저장소 로드: {len(self.embeddings)}개")
+        except Exception as e:
+            logger.warning(f"⚠️ 스피커 임베딩 저장소 로드 실패: {e}")
+    
+    def save(self):
+        """임베딩 전체를 한 번에 저장 (임시 파일 교체 방식)"""
+        with self._save_lock:
+            with self._lock:
+                self._dirty = False
+                voice_ids = list(self.embeddings.keys())
+                embeddings = np.stack([self.embeddings[v] for v in voice_ids]) if voice_ids else np.zeros((0, 128), np.float32)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp.npz")
+            np.savez(temp_path, voice_ids=np.array(voice_ids, dtype=str), embeddings=embeddings)
+            os.replace(temp_path, self.path)
+    
+    def save_later(self):
+        """save_delay초 뒤 백그라운드 스레드에서 저장 (그 사이의 변경은 한 번의 기록으로 묶임)"""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self._save_pending)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _save_pending(self):
+        with self._lock:
+            self._save_timer = None
+        try:
+            self.save()
+        except Exception as e:
+            logger.warning(f"⚠️ 스피커 임베딩 저장 실패: {e}")
+    
+    def flush(self):
+        """대기 중인 저장을 바로 실행 (종료 시)"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty = self._dirty
+        if timer is not None:
+            timer.cancel()
+        if dirty:
+            self.save()
+    
+    def get(self, voice_id: str) -> Optional[np.ndarray]:
+        return self.embeddings.get(voice_id)
+    
+    def update(self, embeddings: Dict[str, np.ndarray]):
+        """임베딩 추가/갱신 (저장은 save()/save_later() 호출 시)"""
+        with self._lock:
+            for voice_id, embedding in embeddings.items():
+                self.embeddings[voice_id] = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    
+    def __contains__(self, voice_id: str) -> bool:
+        return voice_id in self.embeddings
+    
+    def __len__(self) -> int:
+        return len(self.embeddings)
+
+class SpeakerModelLoader:
+    """스피커 클로닝 모델(SpeakerEmbeddingLDA) 백그라운드 로더
+    
+    전용 스레드에서 한 번만 로드하고, 동시에 요청한 호출자들은 같은 Future를 기다립니다.
+    `model_dir`가 주어지면 Hugging Face Hub에 접속하지 않고 로컬 체크포인트를 사용합니다.
+    """
+    
+    def __init__(self, device: torch.device, model_dir: Optional[str] = None):
+        self.device = device
+        self.model_dir = model_dir
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spk-model-")
+    
+    def start(self) -> Future:
+        """로딩 시작 (이미 시작됐으면 기존 Future 반환, 실패했으면 재시도)"""
+        with self._lock:
+            if self._future is None or (self._future.done() and self._future.exception() is not None):
+                self._future = self._executor.submit(self._load)
+            return self._future
+    
+    def _load(self) -> SpeakerEmbeddingLDA:
+        start_time = time.time()
+        source = self.model_dir or "Hugging Face Hub"
+        logger.info(f"📥 스피커 클로닝 모델 로드 시작 ({source})")
+        try:
+            model = SpeakerEmbeddingLDA(device=self.device, model_dir=self.model_dir)
+        except Exception as e:
+            logger.error(f"❌ 스피커 클로닝 모델 로드 실패: {e}")
+            raise
+        logger.info(f"✅ 스피커 클로닝 모델 로드 완료: {time.time() - start_time:.2f}s")
+        return model
+    
+    def is_ready(self) -> bool:
+        future = self._future
+        return future is not None and future.done() and future.exception() is None
+    
+    async def get(self) -> SpeakerEmbeddingLDA:
+        """비동기 대기 (이벤트 루프를 막지 않음)"""
+        return await asyncio.wrap_future(self.start())
+    
+    def get_sync(self) -> SpeakerEmbeddingLDA:
+        """동기 대기 (워커 스레드용)"""
+        return self.start().result()
+
+
 class VoiceManager:
     """목소리 선택 및 관리 시스템"""
     
-    def __init__(self, device: torch.device):
+    def __init__(self, device: torch.device, speaker_model_loader: Optional[SpeakerModelLoader] = None):
         self.device = device
+        self.speaker_model_loader = speaker_model_loader or SpeakerModelLoader(
+            device, os.getenv("SPEAKER_MODEL_DIR") or None
+        )
         self.predefined_voices: Dict[str, str] = {}
         self.user_voice_cache: Dict[str, torch.Tensor] = {}
         self.speaker_embedding_cache: Dict[str, torch.Tensor] = {}
+        # 스피커 임베딩에 사용할 최대 유성음 구간 (초)
+        self.max_embedding_seconds = float(os.getenv("SPEAKER_EMBEDDING_MAX_SECONDS", "20"))
+        # 오프라인으로 미리 계산된 임베딩 (embed_voice_library.py)
+        self.embedding_store = SpeakerEmbeddingStore(
+            os.getenv("SPEAKER_EMBEDDING_STORE", "cache/voices/speaker_embeddings.npz"),
+            save_delay=float(os.getenv("SPEAKER_EMBEDDING_SAVE_DELAY_SEC", "2.0"))
+        )
+        # 유사 목소리 검색 / 업로드 중복 제거용 인덱스
+        self.voice_index = SpeakerEmbeddingIndex()
+        self.dedup_threshold = float(os.getenv("VOICE_DEDUP_THRESHOLD", "0.97"))
         self.load_predefined_voices()
+        self.voice_index.add_many({
+            voice_id: embedding for voice_id, embedding in self.embedding_store.embeddings.items()
+            if voice_id in self.predefined_voices
+        })
     
     def load_predefined_voices(self):
         """미리 정의된 목소리들 로드"""
@@ -31,11 +200,16 @@ class VoiceManager:
         os.makedirs(f"{voice_dir}/user", exist_ok=True)
         
         if os.path.exists(voice_dir):
-            for voice_file in os.listdir(voice_dir):
-                if voice_file.endswith(('.wav', '.mp3', '.flac')):
-                    voice_id = voice_file.split('.')[0]
-                    self.predefined_voices[voice_id] = os.path.join(voice_dir, voice_file)
-                    logger.info(f"🎤 미리 정의된 목소리 로드: {voice_id}")
+            for voice_id, path in iter_voice_files(voice_dir):
+                self.predefined_voices[voice_id] = path
+                logger.info(f"🎤 미리 정의된 목소리 로드: {voice_id}")
+        
+        # 이전에 업로드된 사용자 목소리 재등록 (재시작 후에도 유사 목소리 검색 대상 유지)
+        user_voices = iter_voice_files(f"{voice_dir}/user")
+        for voice_id, path in user_voices:
+            self.predefined_voices[voice_id] = path
+        if user_voices:
+            logger.info(f"🎤 사용자 업로드 목소리 로드: {len(user_voices)}개")
         
         # 샘플 목소리가 없으면 안내 메시지
         if not self.predefined_voices:
@@ -83,19 +257,27 @@ class VoiceManager:
             logger.info(f"🚀 캐시된 스피커 임베딩 사용: {cache_key}")
             return self.speaker_embedding_cache[cache_key]
         
+        # 영구 저장소에서 확인
+        stored = self.embedding_store.get(cache_key)
+        if stored is not None:
+            speaker_embedding = torch.from_numpy(stored).view(1, 1, -1).to(self.device, dtype=torch.bfloat16)
+            self.speaker_embedding_cache[cache_key] = speaker_embedding
+            logger.info(f"📂 저장된 스피커 임베딩 사용: {cache_key}")
+            return speaker_embedding
+        
         try:
             logger.info(f"📥 스피커 임베딩 생성 중: {audio_path}")
-            wav, sr = torchaudio.load(audio_path)
+            # 클로닝 모델은 백그라운드 로더에서 받아옴 (동시 요청은 같은 로딩을 공유)
+            await self.speaker_model_loader.get()
             
-            # 스테레오를 모노로 변환
-            if wav.shape[0] > 1:
-                wav = wav.mean(dim=0, keepdim=True)
-            
-            speaker_embedding = model.make_speaker_embedding(wav, sr)
-            speaker_embedding = speaker_embedding.to(self.device, dtype=torch.bfloat16)
+            wav, sr = torchaudio.load(audio_path)
+            loop = asyncio.get_event_loop()
+            speaker_embedding = await loop.run_in_executor(None, self._embed_wav, wav, sr)
             
-            # 캐시에 저장
+            # 캐시에 저장 (등록된 목소리는 영구 저장소에도 기록)
             self.speaker_embedding_cache[cache_key] = speaker_embedding
+            if cache_key in self.predefined_voices:
+                self._register_embedding(cache_key, speaker_embedding)
             logger.info(f"✅ 스피커 임베딩 생성 및 캐시 완료: {cache_key}")
             
             return speaker_embedding
@@ -104,6 +286,46 @@ class VoiceManager:
             logger.error(f"❌ 스피커 임베딩 생성 실패: {e}")
             raise e
     
+    def _register_embedding(self, voice_id: str, speaker_embedding: torch.Tensor):
+        """등록된 목소리의 임베딩을 영구 저장소와 검색 인덱스에 기록"""
+        embedding = speaker_embedding.float().cpu().numpy().reshape(-1)
+        self.embedding_store.update({voice_id: embedding})
+        self.embedding_store.save_later()
+        self.voice_index.add(voice_id, embedding)
+    
+    def _embed_wav(self, wav: torch.Tensor, sr: int) -> torch.Tensor:
+        """스피커 임베딩 계산 (워커 스레드에서 호출)"""
+        spk_model = self.speaker_model_loader.get_sync()
+        
+        # 스테레오를 모노로 변환
+        if wav.shape[0] > 1:
+            wav = wav.mean(dim=0, keepdim=True)
+        
+        wav = select_voiced_segment(wav, sr, self.max_embedding_seconds)
+        _, speaker_embedding = spk_model(wav.to(spk_model.device), sr)
+        return speaker_embedding.unsqueeze(0).to(self.device, dtype=torch.bfloat16)
+    
+    def embed_audio_bytes(self, file_content: bytes) -> torch.Tensor:
+        """업로드된 오디오 바이트에서 스피커 임베딩 생성 (워커 스레드에서 호출)"""
+        wav, sr = torchaudio.load(io.BytesIO(file_content))
+        return self._embed_wav(wav, sr)
+    
+    def find_similar_voices(self, speaker_embedding: torch.Tensor, k: int = 5) -> list:
+        """임베딩과 가장 유사한 등록 목소리 k개 반환"""
+        embedding = speaker_embedding.float().cpu().numpy().reshape(-1)
+        return [
+            {"voice_id": voice_id, "similarity": round(score, 4)}
+            for voice_id, score in self.voice_index.search(embedding, k)
+            if voice_id in self.predefined_voices
+        ]
+    
+    def find_duplicate_voice(self, speaker_embedding: torch.Tensor) -> Optional[Dict[str, Any]]:
+        """중복 업로드 판정 - 임계값 이상으로 유사한 기존 목소리 반환"""
+        similar = self.find_similar_voices(speaker_embedding, k=1)
+        if similar and similar[0]["similarity"] >= self.dedup_threshold:
+            return similar[0]
+        return None
+    
     async def _process_base64_audio(self, base64_data: str, model: Zonos) -> torch.Tensor:
         """Base64 오디오 데이터 처리"""
         try:
@@ -147,8 +369,10 @@ class VoiceManager:
             }
         }
     
-    async def add_voice_from_file(self, file_content: bytes, filename: str) -> str:
-        """파일로부터 새 목소리 추가"""
+    async def add_voice_from_file(
+        self, file_content: bytes, filename: str, speaker_embedding: Optional[torch.Tensor] = None
+    ) -> str:
+        """파일로부터 새 목소리 추가 (임베딩이 있으면 함께 등록)"""
         try:
             # 고유한 voice_id 생성
             voice_id = f"user_{int(time.time())}_{filename.split('.')[0]}"
@@ -162,6 +386,9 @@ class VoiceManager:
             
             # 목소리 등록
             self.predefined_voices[voice_id] = file_path
+            if speaker_embedding is not None:
+                self.speaker_embedding_cache[voice_id] = speaker_embedding
+                self._register_embedding(voice_id, speaker_embedding)
             logger.info(f"✅ 새 목소리 추가됨: {voice_id}")
             
             return voice_id
@@ -179,11 +406,113 @@ class VoiceManager:
         """캐시 통계 반환"""
         return {
             "cached_embeddings": len(self.speaker_embedding_cache),
+            "stored_embeddings": len(self.embedding_store),
+            "indexed_voices": len(self.voice_index),
+            "speaker_model_ready": self.speaker_model_loader.is_ready(),
             "predefined_voices": len(self.predefined_voices),
             "cache_keys": list(self.speaker_embedding_cache.keys())
         }
 
 
+class FillerAudioBank:
+    """목소리별 짧은 대기/맞장구 음성 뱅크 ("음...", "네, 잠시만요")
+    
+    목소리 등록 시 한 번 배치 생성해 전송 가능한 바이너리 프레임으로 메모리에 보관하고,
+    GPT+TTS가 오래 걸릴 것으로 예상될 때 STT 직후 바로 재생합니다 (재생 시 추가 연산 없음).
+    """
+    
+    DEFAULT_PHRASES = ["음...", "네, 잠시만요.", "아, 네.", "음, 그러니까요."]
+    DEFAULT_VOICE = "__default__"
+    
+    # 문장 목록 -> (오디오 목록, 샘플레이트)
+    Synthesizer = Callable[[Optional[str], List[str]], Awaitable[Tuple[List[np.ndarray], int]]]
+    
+    def __init__(self, phrases: Optional[List[str]] = None, max_voices: int = 64):
+        self.phrases = phrases or self.DEFAULT_PHRASES
+        self.max_voices = max_voices
+        self.clips: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._building: Dict[str, asyncio.Task] = {}
+        self._next_index: Dict[str, int] = {}
+        self.played = 0
+    
+    def _voice_key(self, voice_id: Optional[str]) -> str:
+        return voice_id or self.DEFAULT_VOICE
+    
+    def has_voice(self, voice_id: Optional[str]) -> bool:
+        return self._voice_key(voice_id) in self.clips
+    
+    async def build(self, voice_id: Optional[str], synthesize: "FillerAudioBank.Synthesizer"):
+        """목소리의 대기 음성 일괄 생성 후 등록"""
+        key = self._voice_key(voice_id)
+        start_time = time.time()
+        audios, sample_rate = await synthesize(voice_id, self.phrases)
+        
+        clips = []
+        for text, audio in zip(self.phrases, audios):
+            audio = np.asarray(audio, dtype=np.float32)
+            peak = np.abs(audio).max() if audio.size else 0.0
+            if peak > 0:
+                audio = audio / peak * 0.8
+            pcm = (audio * 32767).astype(np.int16)
+            clips.append({
+                "text": text,
+                "pcm": pcm,
+                "frame": encode_frame(pcm, FILLER_STREAM_ID, 0, sample_rate, FLAG_FILLER | FLAG_START | FLAG_END),
+                "sample_rate": int(sample_rate),
+                "duration": len(pcm) / sample_rate,
+            })
+        
+        self.clips[key] = clips
+        self.clips.move_to_end(key)
+        while len(self.clips) > self.max_voices:
+            self.clips.popitem(last=False)
+        logger.info(f"💬 대기 음성 {len(clips)}개 생성 완료: {key} ({time.time() - start_time:.2f}s)")
+    
+    def schedule(self, voice_id: Optional[str], synthesize: "FillerAudioBank.Synthesizer") -> Optional[asyncio.Task]:
+        """백그라운드 생성 예약 (이미 있거나 생성 중이면 무시)"""
+        key = self._voice_key(voice_id)
+        if key in self.clips or key in self._building:
+            return self._building.get(key)
+        
+        async def run():
+            try:
+                await self.build(voice_id, synthesize)
+            except Exception as e:
+                logger.warning(f"⚠️ 대기 음성 생성 실패 ({key}): {e}")
+            finally:
+                self._building.pop(key, None)
+        
+        task = asyncio.ensure_future(run())
+        self._building[key] = task
+        return task
+    
+    def pick(self, voice_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """목소리의 대기 음성 하나를 순서대로 반환 (없으면 None)"""
+        key = self._voice_key(voice_id)
+        clips = self.clips.get(key)
+        if not clips:
+            return None
+        index = self._next_index.get(key, 0)
+        self._next_index[key] = (index + 1) % len(clips)
+        self.clips.move_to_end(key)
+        self.played += 1
+        return clips[index]
+    
+    def remove(self, voice_id: Optional[str]):
+        key = self._voice_key(voice_id)
+        self.clips.pop(key, None)
+        self._next_index.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "voices": list(self.clips.keys()),
+            "building": list(self._building.keys()),
+            "phrases": self.phrases,
+            "played": self.played,
+            "memory_kb": round(sum(clip["pcm"].nbytes for clips in self.clips.values() for clip in clips) / 1024, 1),
+        }
+
+
 # 감정 설정 헬퍼 클래스
 class EmotionManager:
     """감정 설정 관리"""
@@ -13,7 +13,7 @@ from zonos.codebook_pattern import apply_delay_pattern, revert_delay_pattern
 from zonos.conditioning import PrefixConditioner
 from zonos.config import InferenceParams, ZonosConfig
 from zonos.sampling import sample_from_logits
-from zonos.speaker_cloning import SpeakerEmbeddingLDA
+from zonos.speaker_cloning import SpeakerEmbeddingLDA, select_voiced_segment
 from zonos.utils import DEFAULT_DEVICE, find_multiple, pad_weight_
 
 DEFAULT_BACKBONE_CLS = next(iter(BACKBONES.values()))
@@ -87,10 +87,27 @@ class Zonos(nn.Module):
 
         return model
 
-    def make_speaker_embedding(self, wav: torch.Tensor, sr: int) -> torch.Tensor:
-        """Generate a speaker embedding from an audio clip."""
-        if self.spk_clone_model is None:
+    def make_speaker_embedding(
+        self,
+        wav: torch.Tensor,
+        sr: int,
+        max_seconds: float | None = 20.0,
+        spk_model: SpeakerEmbeddingLDA | None = None,
+    ) -> torch.Tensor:
+        """
+        Generate a speaker embedding from an audio clip.
+
+        Only the most voiced `max_seconds` of the clip are fed to the speaker encoder,
+        which keeps the cost flat for long uploads. Pass `None` to embed the whole clip.
+        Pass an already loaded `spk_model` (e.g. from local checkpoints) to avoid
+        downloading the speaker encoder from the Hub.
+        """
+        if spk_model is not None:
+            self.spk_clone_model = spk_model
+        elif self.spk_clone_model is None:
             self.spk_clone_model = SpeakerEmbeddingLDA()
+        if max_seconds is not None:
+            wav = select_voiced_segment(wav, sr, max_seconds)
         _, spk_embedding = self.spk_clone_model(wav.to(self.spk_clone_model.device), sr)
         return spk_embedding.unsqueeze(0).bfloat16()
 
@@ -1,4 +1,5 @@
 import math
+import os
 from functools import cache
 
 import torch
@@ -353,6 +354,41 @@ class ECAPA_TDNN(nn.Module):
         return x
 
 
+def select_voiced_segment(
+    wav: torch.Tensor,
+    sample_rate: int,
+    max_seconds: float,
+    frame_seconds: float = 0.03,
+    threshold_db: float = 35.0,
+) -> torch.Tensor:
+    """
+    Crop `wav` to the contiguous `max_seconds` window that holds the most voiced energy.
+
+    Frames within `threshold_db` of the loudest frame count as voiced; every other frame
+    contributes nothing to a window's score. Clips that already fit are returned unchanged,
+    so the speaker encoder only ever sees a bounded amount of audio.
+    """
+    max_samples = int(max_seconds * sample_rate)
+    if max_samples <= 0 or wav.shape[-1] <= max_samples:
+        return wav
+
+    frame = max(1, int(frame_seconds * sample_rate))
+    num_frames = wav.shape[-1] // frame
+    window = max(1, max_samples // frame)
+    if num_frames <= window:
+        return wav[..., :max_samples]
+
+    mono = wav.mean(0) if wav.ndim == 2 else wav
+    energy = mono[: num_frames * frame].float().reshape(num_frames, frame).pow(2).mean(dim=1)
+    energy_db = 10 * torch.log10(energy + 1e-10)
+    voiced_energy = torch.where(energy_db > energy_db.max() - threshold_db, energy, torch.zeros_like(energy))
+
+    cumsum = torch.cat([voiced_energy.new_zeros(1), voiced_energy.cumsum(0)])
+    window_energy = cumsum[window:] - cumsum[:-window]
+    start = int(window_energy.argmax()) * frame
+    return wav[..., start : start + max_samples]
+
+
 class SpeakerEmbedding(nn.Module):
     def __init__(self, ckpt_path: str = "ResNet293_SimAM_ASP_base.pt", device: str = DEFAULT_DEVICE):
         super().__init__()
@@ -384,18 +420,29 @@ class SpeakerEmbedding(nn.Module):
         wav = self.prepare_input(wav, sample_rate).to(self.device, self.dtype)
         return self.model(wav).to(wav.device)
 
+    def forward_batch(self, wav: torch.Tensor) -> torch.Tensor:
+        """Embed a [batch, samples] tensor of equal-length mono clips already resampled to 16 kHz."""
+        assert wav.ndim == 2
+        return self.model(wav.to(self.device, self.dtype)).to(wav.device)
+
 
 class SpeakerEmbeddingLDA(nn.Module):
-    def __init__(self, device: str = DEFAULT_DEVICE):
+    def __init__(self, device: str = DEFAULT_DEVICE, model_dir: str | None = None):
+        """
+        Loads the ResNet293 speaker encoder and its LDA projection.
+
+        If `model_dir` is given, both checkpoints are read from that directory and the
+        Hugging Face Hub is never contacted.
+        """
         super().__init__()
-        spk_model_path = hf_hub_download(
-            repo_id="Zyphra/Zonos-v0.1-speaker-embedding",
-            filename="ResNet293_SimAM_ASP_base.pt",
-        )
-        lda_spk_model_path = hf_hub_download(
-            repo_id="Zyphra/Zonos-v0.1-speaker-embedding",
-            filename="ResNet293_SimAM_ASP_base_LDA-128.pt",
-        )
+        spk_filename = "ResNet293_SimAM_ASP_base.pt"
+        lda_filename = "ResNet293_SimAM_ASP_base_LDA-128.pt"
+        if model_dir is not None:
+            spk_model_path = os.path.join(model_dir, spk_filename)
+            lda_spk_model_path = os.path.join(model_dir, lda_filename)
+        else:
+            spk_model_path = hf_hub_download(repo_id="Zyphra/Zonos-v0.1-speaker-embedding", filename=spk_filename)
+            lda_spk_model_path = hf_hub_download(repo_id="Zyphra/Zonos-v0.1-speaker-embedding", filename=lda_filename)
 
         self.device = device
         with torch.device(device):
@@ -410,3 +457,7 @@ class SpeakerEmbeddingLDA(nn.Module):
     def forward(self, wav: torch.Tensor, sample_rate: int):
         emb = self.model(wav, sample_rate).to(torch.float32)
         return emb, self.lda(emb)
+
+    def forward_batch(self, wav: torch.Tensor):
+        emb = self.model.forward_batch(wav).to(torch.float32)
+        return emb, self.lda(emb)